@@ -1,17 +1,72 @@
-import streamlit as st
 import os
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+import streamlit as st
 import pandas as pd
 import plotly.express as px
-import re
-import tempfile
-from src.data import clean_data, label_data
-from src.utils import generate_embeddings, export_streamlit_data
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
+from src.data import (
+    PARQUET_AVAILABLE,
+    GscIndex,
+    build_gsc_index,
+    clean_data,
+    crawl_store_path,
+    evict_crawl_stores,
+    has_crawl_store,
+    label_data,
+    label_status_groups,
+    load_gsc,
+    load_inlinks,
+    load_crawl_store,
+    load_issue_reports,
+    load_issues_overview,
+    open_upload,
+    partition_issues,
+    save_crawl_store,
+    status_label,
+    store_limits,
+    summarize_status_groups
+)
+from src.utils import generate_embeddings, export_internal_links, export_streamlit_data
+from src.utils.cache import content_digest
+from src.utils.excel import MAX_SHEET_ROWS
+from src.utils.kmeans import project_2d, search_k
+from src.utils.profiling import Profiler, profiled
+from src.visualization.render import histogram, sample_positions, scatter_gl, top_n_bar
+from src.utils.url_clustering import (
+    SimilarUrlIndex,
+    build_url_features,
+    cluster_urls,
+    project_urls,
+    summarize_url_clusters
+)
 
 
 st.set_page_config(page_title="Screaming Frog Tech Audit Prioritizer", layout="wide")
 
+# Number of distinct inputs each pipeline stage keeps results for. Stages holding
+# crawl-sized frames (parsed uploads, merges, URL features, workbooks) keep only the
+# current and previous crawl; the per-issue stages are small and keep more
+CRAWL_CACHE_ENTRIES = 2
+STAGE_CACHE_ENTRIES = 8
+# Seconds a cached stage result is kept after it was computed
+STAGE_CACHE_TTL = 3600
+# Candidate numbers of clusters offered by the clustering slider
+MIN_CLUSTERS, MAX_CLUSTERS = 2, 15
+MAX_URL_CLUSTERS = 50
+# Points drawn in the URL cluster scatter plot; the clustering itself uses every URL
+URL_PLOT_POINTS = 20_000
+# Bars per percentile chart; the other issues of the group are drawn as one "Others" bar
+TOP_ISSUES = 25
+# Rough throughput of the on-demand sections (units per second, measured on a synthetic
+# 100k URL crawl), used to estimate their cost before the user runs them
+SECTION_RATES = {
+    'issue_clustering': (20, 'issues'),
+    'url_clustering': (3_000, 'URLs'),
+    'internal_links': (30, 'MB of all_inlinks.csv'),
+    'internal_links_export': (7_000, 'links'),
+    'export': (40_000, 'URL rows')
+}
+
 
 def show_intro_content():
     """Display introduction and explanation of the app"""
@@ -26,38 +81,15 @@ def show_intro_content():
     """)
 
 
-def analyze_internal_links(all_inlinks_df, gsc_df):
-    """Process internal links data and return analyzed dataframe"""
-    # Process status groups
-    gsc_df = gsc_df[gsc_df['Clicks'] > 0]
-
-    all_inlinks_df['status_group'] = all_inlinks_df['Status Code'].apply(lambda x: str(x)[0])
-    all_inlinks_df['status_group'] = all_inlinks_df['status_group'].astype(int)
-    all_inlinks_df['status_group'] = all_inlinks_df['status_group'].apply(label_status)
-
-    return all_inlinks_df
-
-
-def label_status(status):
-    """Label status codes into groups"""
-    if status == 0:
-        return 'Cancelled: 0'
-    if status == 2:
-        return 'Successful'
-    elif status == 3:
-        return 'Redirect'
-    elif status == 4:
-        return 'Client Error'
-    elif status == 5:
-        return 'Server Error'
-    else:
-        return 'other'
-
-
-def plot_status_distribution(all_inlinks):
-    """Create pie chart of status code distribution"""
+def plot_status_distribution(status_counts):
+    """Create pie chart of status code distribution from per-status-class link counts"""
+    status_dist = pd.DataFrame({
+        'status_group': [status_label(status) for status in status_counts.index],
+        'count': status_counts.to_numpy()
+    })
     fig = px.pie(
-        all_inlinks,
+        status_dist,
+        values='count',
         names='status_group',
         title='Distribution of Internal Links by Status Code Group',
         color='status_group',
@@ -85,11 +117,11 @@ def analyze_status_groups(all_inlinks, gsc_data):
         if col not in all_inlinks.columns:
             raise ValueError(f"Missing required column '{col}' in all_inlinks data")
 
+    gsc_columns = ['Address', *gsc_data.metrics] if isinstance(gsc_data, GscIndex) else gsc_data.columns
     for col in required_columns['gsc_data']:
-        if col not in gsc_data.columns:
+        if col not in gsc_columns:
             raise ValueError(f"Missing required column '{col}' in GSC data")
 
-    """Analyze each status group and return figures and summaries"""
     plotly_color = px.colors.qualitative.Plotly
     color_map = {
         'Cancelled: 0': plotly_color[9],
@@ -99,37 +131,18 @@ def analyze_status_groups(all_inlinks, gsc_data):
         'Server Error': plotly_color[4]
     }
 
-    recommendations = {
-        'Cancelled: 0': 'Review the page to ensure that the URL is correct and the page is not blocked by robots.txt.',
-        'Redirect': 'Update the internal redirect to the new, target/final URL.',
-        'Client Error': 'Update the broken link to be a valid, canonical, 200 status URL.',
-        'Server Error': 'Review the server logs to identify the cause of the server error and resolve the issue.'
-    }
-
-    results = []
-    unique_non_200 = [x for x in all_inlinks['status_group'].unique() if x != 'Successful']
-
-    for status in unique_non_200:
-        status_data = all_inlinks[all_inlinks['status_group'] == status]
-        inlinks_merge = pd.merge(
-            status_data,
-            gsc_data,
-            left_on='Destination',
-            right_on='Address',
-            how='left',
-            suffixes=('_inlinks', '_gsc')
-        )
+    results = summarize_status_groups(all_inlinks, gsc_data)
 
-        inlinks_merge['Clicks'] = inlinks_merge['Clicks'].fillna(0)
-        inlinks_unique = inlinks_merge.drop_duplicates(subset='Destination')
-        inlinks_unique_traffic = inlinks_unique[inlinks_unique['Clicks'] > 0]
+    for result in results:
+        status = result['status']
 
-        # Create histogram
-        fig = px.histogram(
-            inlinks_unique.sort_values('Status Code_inlinks'),
+        # Create histogram; links are counted per status code here, not in the browser
+        fig = histogram(
+            result['unique_data'],
             x='Status Code_inlinks',
-            title=f'Distribution of Unique Internal Links by Status ({status})',
             color='status_group',
+            discrete=True,
+            title=f'Distribution of Unique Internal Links by Status ({status})',
             width=900,
             height=500,
             color_discrete_map=color_map
@@ -142,54 +155,18 @@ def analyze_status_groups(all_inlinks, gsc_data):
             xaxis=dict(
                 type='category',
                 tickmode='array',
-                tickvals=status_data['Status Code'].unique()
+                tickvals=result['status_codes']
             )
         )
 
-        results.append({
-            'status': status,
-            'data': inlinks_merge,
-            'unique_data': inlinks_unique,
-            'with_traffic': len(inlinks_unique_traffic),
-            'without_traffic': len(inlinks_unique) - len(inlinks_unique_traffic),
-            'recommendation': recommendations[status],
-            'figure': fig
-        })
+        result['figure'] = fig
 
     return results
 
 
-def export_internal_links(results, temp_dir):
-    """Export internal links analysis to Excel"""
-    excel_path = os.path.join(temp_dir, 'internal_links_summary.xlsx')
-
-    with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-        for result in results:
-            status = result['status']
-            worksheet_name_all = f'internal_{re.sub(r"[^\w]", "_", status)}'
-            worksheet_name_unique = f'unique_internal_{re.sub(r"[^\w]", "_", status)}'
-
-            result['data'].to_excel(writer, sheet_name=worksheet_name_all, index=False)
-            result['unique_data'].to_excel(writer, sheet_name=worksheet_name_unique, index=False)
-
-    with open(excel_path, 'rb') as f:
-        return f.read()
-
-def save_uploaded_files(uploaded_files, temp_dir):
-    """Save uploaded files to temporary directory and return their paths"""
-    paths = []
-    for file in uploaded_files:
-        if file is not None:
-            file_path = os.path.join(temp_dir, file.name)
-            with open(file_path, "wb") as f:
-                f.write(file.getvalue())
-            paths.append(file_path)
-    return paths
-
-
 def plot_impact_distribution(issues_group):
     """Create impact score distribution plot"""
-    fig = px.histogram(
+    fig = histogram(
         issues_group,
         x='Impact_Score',
         color='Impact_Score_Quadrant',
@@ -204,30 +181,32 @@ def plot_impact_distribution(issues_group):
 
 
 def plot_top_percentiles(df, perc_n):
-    """Plot both top and bottom percentile groups of impact scores"""
+    """Plot both top and bottom percentile groups of impact scores, TOP_ISSUES bars each"""
     threshold = df['Impact_Score'].quantile(perc_n)
 
     # Split data into top and bottom groups
-    top_issues = df[df['Impact_Score'] >= threshold].sort_values('Impact_Score', ascending=True)
-    bottom_issues = df[df['Impact_Score'] < threshold].sort_values('Impact_Score', ascending=True)
+    top_issues = df[df['Impact_Score'] >= threshold]
+    bottom_issues = df[df['Impact_Score'] < threshold]
 
-    # Create figure for top issues
-    fig_top = px.bar(
+    # Create figure for top issues; the remaining issues share one bar with their mean score
+    fig_top = top_n_bar(
         top_issues,
-        x='Impact_Score',
-        y='Issue Name',
+        'Impact_Score',
+        'Issue Name',
+        n=TOP_ISSUES,
+        agg='mean',
         title=f'Top {int((1 - perc_n) * 100)}% Issues by Impact Score',
-        orientation='h',
         color_discrete_sequence=['#1f77b4']  # Blue for high impact issues
     )
 
     # Create figure for bottom issues
-    fig_bottom = px.bar(
+    fig_bottom = top_n_bar(
         bottom_issues,
-        x='Impact_Score',
-        y='Issue Name',
+        'Impact_Score',
+        'Issue Name',
+        n=TOP_ISSUES,
+        agg='mean',
         title=f'Bottom {int(perc_n * 100)}% Issues by Impact Score',
-        orientation='h',
         color_discrete_sequence=['#ff7f0e']  # Orange for low impact issues
     )
 
@@ -240,43 +219,249 @@ def plot_top_percentiles(df, perc_n):
     return fig_top, fig_bottom
 
 
-def perform_clustering(issues_group, n_clusters=10):
-    """Perform clustering analysis and return figures"""
+def upload_digest(uploaded_file):
+    """Return the content digest of an uploaded file, hashed once per upload"""
+    digests = st.session_state.setdefault('upload_digests', {})
+    file_id = getattr(uploaded_file, 'file_id', None) or f'{uploaded_file.name}:{uploaded_file.size}'
+    if file_id not in digests:
+        with uploaded_file.getbuffer() as buffer:
+            digests[file_id] = content_digest(uploaded_file.name, buffer)
+    return digests[file_id]
+
+
+@profiled(rows=lambda result: len(result[2]))
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def parse_stage(parse_key, use_store, _issues_overview, _search_console, _issues_reports):
+    """Parse the uploaded issue exports, or reopen them from the Parquet store; cached by the digest of the uploads"""
+    store_path = crawl_store_path(parse_key)
+    names = ['issues_report', 'gsc_df', 'issues_df']
+    if use_store and has_crawl_store(store_path, names):
+        frames = load_crawl_store(store_path, names)
+        return frames['issues_report'], frames['gsc_df'], frames['issues_df'], []
+
+    # Parsed straight from the upload buffers; only uploads above the spill threshold touch the disk
+    with ExitStack() as stack:
+        issues_report = load_issues_overview(stack.enter_context(open_upload(_issues_overview)))
+        gsc_df = load_gsc(stack.enter_context(open_upload(_search_console)))
+        issues_df, load_errors = load_issue_reports(
+            [(upload.name, stack.enter_context(open_upload(upload))) for upload in _issues_reports])
+
+    if use_store and not issues_df.empty:
+        save_crawl_store(store_path, {'issues_report': issues_report, 'gsc_df': gsc_df, 'issues_df': issues_df})
+        evict_crawl_stores(keep=store_path)
+    return issues_report, gsc_df, issues_df, load_errors
+
+
+@profiled()
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def gsc_index_stage(parse_key, _gsc_df):
+    """Index the GSC metrics by URL once; shared by the issues and internal links tabs"""
+    return build_gsc_index(_gsc_df)
+
+
+@profiled(rows=lambda result: len(result[1]))
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def aggregate_stage(parse_key, _issues_df, _gsc_index, _issues_report):
+    """Merge issues with GSC data and aggregate per issue; cached per parsed input"""
+    return clean_data(_issues_df, _gsc_index, _issues_report)
+
+
+@profiled()
+@st.cache_resource(show_spinner=False, max_entries=STAGE_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def score_stage(parse_key, _issues_group):
+    """Label aggregated issues with impact scores; cached per parsed input"""
+    return label_data(_issues_group.copy())
+
+
+@profiled(rows=lambda partitions: len(partitions.data))
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def partition_stage(parse_key, _issues_df):
+    """Partition URL-level issues by issue once for exports and drill-downs"""
+    return partition_issues(_issues_df)
+
+
+@profiled(rows=lambda result: result.shape[0])
+@st.cache_resource(show_spinner=False, max_entries=STAGE_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def embed_stage(embed_key, _issues_list):
+    """Embed issue names, keeping the TF-IDF fallback sparse; cached by the digest of the names"""
+    return generate_embeddings(_issues_list, sparse=True)
+
+
+@profiled(rows=lambda result: len(result[1]))
+@st.cache_resource(show_spinner=False, max_entries=STAGE_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def cluster_stage(embed_key, _issues_embeddings):
+    """Fit KMeans for every candidate number of clusters and project the embeddings to 2D, once per embedding"""
+    k_search = search_k(_issues_embeddings, k_values=range(MIN_CLUSTERS, MAX_CLUSTERS + 1))
+    return k_search, project_2d(_issues_embeddings)
+
+
+@profiled(rows=lambda result: len(result[0]))
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def url_features_stage(parse_key, _issues_df):
+    """Build sparse URL features and their 2D projection; cached per parsed input"""
+    features = build_url_features(_issues_df)
+    return features, project_urls(features)
+
+
+@profiled(rows=lambda result: len(result[0].labels_))
+@st.cache_resource(show_spinner=False, max_entries=4 * CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def url_cluster_stage(parse_key, n_clusters, _features):
+    """Cluster URLs with MiniBatchKMeans and index them for similar-URL lookups; cached per input and k"""
+    model = cluster_urls(_features, n_clusters)
+    return model, SimilarUrlIndex(_features, model), summarize_url_clusters(_features, model.labels_)
+
+
+@profiled(rows=lambda result: result[1])
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def export_stage(parse_key, perc_n, _issues_group, _issues_df, _partitions):
+    """Build the Excel export for a percentile threshold; cached per input and threshold"""
+    return export_streamlit_data(_issues_group, _issues_df, perc_n, partitions=_partitions)
+
+
+@profiled(rows=lambda result: len(result[0]))
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def inlinks_stage(inlinks_key, use_store, _all_inlinks):
+    """Parse the uploaded all_inlinks export, or reopen it from the Parquet store; cached by its digest"""
+    store_path = crawl_store_path(inlinks_key)
+    names = ['all_inlinks', 'status_counts']
+    if use_store and has_crawl_store(store_path, names):
+        frames = load_crawl_store(store_path, names)
+        return frames['all_inlinks'], frames['status_counts'].set_index('status_class')['count']
+
+    with open_upload(_all_inlinks) as source:
+        all_inlinks_df, status_counts = load_inlinks(source)
+
+    if use_store:
+        save_crawl_store(store_path, {
+            'all_inlinks': all_inlinks_df,
+            'status_counts': status_counts.rename('count').reset_index()
+        })
+        evict_crawl_stores(keep=store_path)
+    return all_inlinks_df, status_counts
+
+
+@profiled(rows=None)
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def status_groups_stage(links_key, _all_inlinks_df, _gsc_index):
+    """Analyze internal links by status group; cached per inlinks and GSC input"""
+    processed_inlinks = label_status_groups(_all_inlinks_df)
+    return analyze_status_groups(processed_inlinks, _gsc_index)
+
+
+@profiled(rows=None)
+@st.cache_resource(show_spinner=False, max_entries=CRAWL_CACHE_ENTRIES, ttl=STAGE_CACHE_TTL)
+def links_export_stage(links_key, _results):
+    """Build the internal links report workbook and its split sheets; cached per inlinks and GSC input"""
+    return export_internal_links(_results)
+
+
+def show_split_sheets(split_sheets):
+    """Warn about sheets that exceeded Excel's row limit and continue on further sheets"""
+    for sheet_names in split_sheets.values():
+        st.warning(f"Sheet '{sheet_names[0]}' exceeds Excel's row limit of {MAX_SHEET_ROWS:,} rows; "
+                   f"its remaining rows are on {', '.join(sheet_names[1:])}.")
+
+
+def format_duration(seconds):
+    """Format an estimated duration for display"""
+    if seconds < 1:
+        return "under a second"
+    if seconds < 90:
+        return f"~{seconds:.0f}s"
+    return f"~{seconds / 60:.0f} min"
+
+
+def lazy_section(section, size, run_key, label):
+    """
+    Show the cost of an on-demand section and a toggle to compute it.
+
+    Nothing in the section runs until the toggle is switched on. The toggle is
+    keyed by ``run_key``, so new inputs start switched off again; once computed,
+    the section is served from the stage caches and its first run time is shown
+    instead of the estimate.
+
+    Parameters
+    ----------
+    section : str
+        Key of the section in ``SECTION_RATES``
+    size : int
+        Size of the section's input, in the unit of its rate
+    run_key : str
+        Digest of the section's inputs
+    label : str
+        Label of the toggle
+
+    Returns
+    -------
+    bool
+        Whether the section should be computed
+    """
+    elapsed = st.session_state.get('section_timings', {}).get((section, run_key))
+    if elapsed is None:
+        rate, unit = SECTION_RATES[section]
+        st.caption(f"Estimated cost: {format_duration(size / rate)} for {size:,.0f} {unit}.")
+    else:
+        st.caption(f"Computed in {elapsed:.1f}s; cached for these inputs.")
+    return st.toggle(label, key=f'lazy_{section}_{run_key}')
+
+
+@contextmanager
+def timed_section(section, run_key):
+    """Record the time of the first run of a lazy section (later runs hit the stage caches)"""
+    start = time.perf_counter()
+    yield
+    timings = st.session_state.setdefault('section_timings', {})
+    timings.setdefault((section, run_key), time.perf_counter() - start)
+
+
+def perform_clustering(issues_group):
+    """Perform clustering analysis, let the user pick the number of clusters and return the figure"""
     try:
         issues_list = issues_group['Issue Name'].tolist()
-        
+        embed_key = content_digest(issues_list)
+
         # Generate embeddings - this now has a fallback to TF-IDF if transformer fails
         with st.status("Generating embeddings for clustering..."):
-            issues_embeddings = generate_embeddings(issues_list)
-        
-        # Perform KMeans clustering
+            issues_embeddings = embed_stage(embed_key, issues_list)
+
+        # Fit KMeans once for every candidate number of clusters
         with st.status("Performing clustering analysis..."):
-            kmeans = KMeans(n_clusters=n_clusters, random_state=0, n_init='auto').fit(issues_embeddings)
-            kmeans_labels = kmeans.labels_
-
-            # Perform PCA
-            pca_model = PCA(n_components=2)
-            pca_model.fit(issues_embeddings)
-            new_values = pca_model.transform(issues_embeddings)
-
-            # Create cluster plot
-            cluster_df = pd.DataFrame({
-                'PCA1': new_values[:, 0],
-                'PCA2': new_values[:, 1],
-                'Cluster': kmeans_labels,
-                'Issue': issues_group['Issue Name']
-            })
-
-            cluster_fig = px.scatter(
-                cluster_df,
-                x='PCA1',
-                y='PCA2',
-                color='Cluster',
-                hover_data=['Issue'],
-                title='Issue Clusters Visualization'
-            )
+            k_search, new_values = cluster_stage(embed_key, issues_embeddings)
+
+        # Picking another number of clusters reuses the fitted models instead of refitting
+        k_values = k_search.k_values
+        if len(k_values) > 1:
+            n_clusters = st.slider("Select number of clusters", k_values[0], k_values[-1], k_search.suggested_k)
+        else:
+            n_clusters = k_values[0]
+        if k_search.suggestion_method == 'silhouette':
+            st.caption(f"Suggested number of clusters: {k_search.suggested_k} (best silhouette score)")
+        elif k_search.inconclusive:
+            st.caption(f"Suggested number of clusters: {k_search.suggested_k} (elbow of the inertia curve). "
+                       f"The silhouette score is best at k={k_search.silhouette_k}, on the edge of the searched "
+                       f"range, so it does not settle on a number of clusters.")
+        else:
+            st.caption(f"Suggested number of clusters: {k_search.suggested_k} (elbow of the inertia curve)")
+        kmeans_labels = k_search.labels(n_clusters)
+
+        # Create cluster plot
+        cluster_df = pd.DataFrame({
+            'PCA1': new_values[:, 0],
+            'PCA2': new_values[:, 1],
+            'Cluster': kmeans_labels,
+            'Issue': issues_list
+        })
 
-            cluster_fig.update_traces(marker=dict(size=20))
+        cluster_fig = scatter_gl(
+            cluster_df,
+            x='PCA1',
+            y='PCA2',
+            color='Cluster',
+            hover_data=['Issue'],
+            title='Issue Clusters Visualization'
+        )
+
+        cluster_fig.update_traces(marker=dict(size=20))
             
         return cluster_fig
         
@@ -286,7 +471,85 @@ def perform_clustering(issues_group, n_clusters=10):
         return None
 
 
+def perform_url_clustering(parse_key, issues_df):
+    """Cluster the affected URLs by issue set, path and traffic, and offer a similar-URL lookup"""
+    try:
+        with st.status("Building URL features..."):
+            features, projection = url_features_stage(parse_key, issues_df)
+
+        n_clusters = st.slider("Select number of URL clusters", MIN_CLUSTERS, MAX_URL_CLUSTERS, 10)
+        with st.status("Clustering URLs..."):
+            model, similar_index, summary = url_cluster_stage(parse_key, n_clusters, features)
+
+        # Plot a sample of the URLs; the clusters are fitted on all of them
+        plotted = sample_positions(len(features), URL_PLOT_POINTS)
+        cluster_df = pd.DataFrame({
+            'PCA1': projection[plotted, 0],
+            'PCA2': projection[plotted, 1],
+            'Cluster': model.labels_[plotted].astype(str),
+            'Address': features.urls[plotted]
+        })
+        cluster_fig = scatter_gl(
+            cluster_df,
+            x='PCA1',
+            y='PCA2',
+            max_points=None,
+            color='Cluster',
+            hover_data=['Address'],
+            title=f'URL Clusters Visualization ({len(plotted):,} of {len(features):,} URLs shown)'
+        )
+        st.plotly_chart(cluster_fig, use_container_width=True)
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+
+        # Similar URLs from the approximate nearest-neighbour index
+        url = st.text_input("Find URLs similar to", placeholder=features.urls[0])
+        if url:
+            if url in similar_index:
+                st.dataframe(similar_index.similar(url), use_container_width=True, hide_index=True)
+            else:
+                st.warning("That URL is not affected by any of the uploaded issues.")
+
+    except Exception as e:
+        st.error(f"Error during URL clustering: {str(e)}")
+
+
+def render_performance_panel(profiler):
+    """Show the time, memory and rows of each stage that ran in this script run"""
+    st.header("⏱️ Performance")
+    stages = profiler.to_frame()
+    if stages.empty:
+        st.info("No pipeline stages ran yet. Upload the crawl files to profile them.")
+        return
+
+    report = profiler.report()
+    st.caption(f"Process peak RSS: {report['max_rss_mb']} MB. Stages served from the cache take almost "
+               "no time and list no sub-stages.")
+    stages['rows'] = stages['rows'].astype('Int64')
+    stages['stage'] = ['\u2003' * depth + name for depth, name in zip(stages['depth'], stages['stage'])]
+    st.dataframe(stages.drop(columns=['path', 'depth']), use_container_width=True, hide_index=True)
+    st.download_button(
+        label="📥 Download performance report (JSON)",
+        data=profiler.to_json(),
+        file_name="performance_report.json",
+        mime="application/json"
+    )
+
+
 def main():
+    st.sidebar.header("⏱️ Performance")
+    show_performance = st.sidebar.checkbox("Show performance panel", value=False)
+    trace_memory = st.sidebar.checkbox("Trace Python allocations (slower)", value=False,
+                                       disabled=not show_performance)
+
+    profiler = Profiler(trace_memory=trace_memory) if show_performance else None
+    with profiler.activate() if profiler else nullcontext():
+        render_dashboard()
+
+    if profiler is not None:
+        render_performance_panel(profiler)
+
+
+def render_dashboard():
     show_intro_content()
     # File uploaders
     st.header("Upload Data Files")
@@ -325,181 +588,194 @@ def main():
                 4. Click "All Issues", or select specific Issue Type
             """)
 
+    # Opt-in: the store keeps copies of client crawl data on disk across sessions
+    max_bytes, max_age = store_limits()
+    store_help = (f"Parsed uploads are copied to {os.path.dirname(crawl_store_path('x'))} and removed, least "
+                  f"recently used first, beyond {max_bytes / 2 ** 20 if max_bytes else float('inf'):g} MB in "
+                  f"total or {max_age / 86400 if max_age else float('inf'):g} days.")
+    use_store = st.checkbox(
+        "Keep parsed crawls on disk (Parquet) so they reopen in seconds",
+        value=False,
+        disabled=not PARQUET_AVAILABLE,
+        help=store_help if PARQUET_AVAILABLE else "Install pyarrow to enable the Parquet store."
+    )
+
     if all([all_inlinks, issues_overview, search_console]) and issues_reports:
+        parse_key = content_digest(
+            upload_digest(issues_overview),
+            upload_digest(search_console),
+            [upload_digest(upload) for upload in issues_reports]
+        )
         # Create main tabs
         tab_issues, tab_internal_links = st.tabs(["📊 Technical Issues Analysis", "🔗 Internal Links Analysis"])
 
         with tab_issues:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Create issues_reports directory
-                issues_dir = os.path.join(temp_dir, 'issues_reports')
-                os.makedirs(issues_dir)
-
-                # Save uploaded files
-                save_uploaded_files([all_inlinks, issues_overview, search_console], temp_dir)
-                save_uploaded_files(issues_reports, issues_dir)
-
-                try:
-                    # Load and process data
-                    issues_report = pd.read_csv(os.path.join(temp_dir, issues_overview.name))
-                    gsc_df = pd.read_csv(os.path.join(temp_dir, search_console.name))
-
-                    # Process issue files
-                    issues = []
-                    for issue in os.listdir(issues_dir):
-                        # Skip macOS hidden metadata files
-                        if issue.startswith('._'):
-                         
-                            print(f"Skipping macOS metadata file: {issue}")
-                            continue
-                            
-                        try:
-                            issue_path = os.path.join(issues_dir, issue)
-                            # Try with explicit encoding or detect encoding
-                            try:
-                                issue_df = pd.read_csv(issue_path)
-                            except UnicodeDecodeError:
-                                print(f"Encoding issue detected with file: {issue}. Trying with Latin-1 encoding.")
-                                issue_df = pd.read_csv(issue_path, encoding='latin-1')
-                            
-                            issue_name = issue.split('.')[0]
-                            issue_df['issue'] = issue_name
-                            issues.append(issue_df)
-                        except Exception as e:
-                            st.error(f"Error processing file {issue}: {str(e)}")
-                            continue
-
-                    if not issues:
-                        st.error("No valid issue files could be processed.")
-                        return
-                        
-                    issues_df = pd.concat(issues)
-                    issues_df = issues_df.dropna(subset=['Address'])
-
-                    # Clean and label data
-                    issues_group, issues_df = clean_data(issues_df, gsc_df, issues_report)
-                    issues_group = label_data(issues_group)
-
-                    # Create visualizations
-                    st.header("Analysis Results")
-
-                    # Impact Distribution
-                    st.subheader("Impact Score Distribution")
-                    impact_fig = plot_impact_distribution(issues_group)
-                    st.plotly_chart(impact_fig, use_container_width=True)
-
-                    # Top Percentiles
-                    st.subheader("Impact Score Analysis by Percentile")
-                    perc_n = st.slider("Select percentile threshold", 0.0, 1.0, 0.75)
-                    fig_top, fig_bottom = plot_top_percentiles(issues_group, perc_n)
-
-                    # Display top issues chart
-                    st.plotly_chart(fig_top, use_container_width=True)
-
-                    # Display bottom issues chart
-                    st.plotly_chart(fig_bottom, use_container_width=True)
-
-                    # Clustering
-                    st.subheader("Clustering Analysis")
-                    n_clusters = st.slider("Select number of clusters", 2, 15, 10)
-                    cluster_fig = perform_clustering(issues_group, n_clusters)
-                    
-                    if cluster_fig is not None:
-                        st.plotly_chart(cluster_fig, use_container_width=True)
-                    else:
-                        st.warning("Clustering could not be performed. Please check your internet connection or try again later.")
-
-                    # Export Section
-                    st.subheader("Export Results")
-                    threshold_value = issues_group['Impact_Score'].quantile(perc_n)
-                    filtered_count = len(issues_group[issues_group['Impact_Score'] >= threshold_value])
-
-                    st.info(
-                        f"Current threshold will export {filtered_count} issues (top {(1 - perc_n):.1%} by Impact Score)")
-
-                    if st.button("Generate Excel Export"):
-                        with st.spinner("Generating Excel file..."):
-                            excel_data, exported_count = export_streamlit_data(
-                                issues_group,
-                                issues_df,
-                                temp_dir,
-                                perc_n
-                            )
-                            if excel_data is not None:
-                                st.download_button(
-                                    label=f"📥 Download Prioritized Audit ({exported_count} issues)",
-                                    data=excel_data,
-                                    file_name=f"issues_analysis_results_{int((1 - perc_n) * 100)}percentile.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                                )
-                                st.success(f"Excel file generated successfully with {exported_count} issues!")
-
-                except Exception as e:
-                    st.error(f"An error occurred during processing: {str(e)}")
+            render_issues_tab(parse_key, use_store, issues_overview, search_console, issues_reports)
 
         with tab_internal_links:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                try:
-                    # Save files first
-                    all_inlinks_path = os.path.join(temp_dir, all_inlinks.name)
-                    search_console_path = os.path.join(temp_dir, search_console.name)
-
-                    # Save the files
-                    with open(all_inlinks_path, "wb") as f:
-                        f.write(all_inlinks.getvalue())
-                    with open(search_console_path, "wb") as f:
-                        f.write(search_console.getvalue())
-
-                    st.write("Debug: Attempting to read files")
-                    try:
-                        all_inlinks_df = pd.read_csv(all_inlinks_path)
-                    except Exception as e:
-                        st.error(f"Error reading all_inlinks.csv: {str(e)}")
-                        return
-
-                    processed_inlinks = analyze_internal_links(all_inlinks_df, gsc_df)
-
-                    # Overall distribution
-                    st.header("Internal Links Analysis")
-                    st.subheader("Status Code Distribution")
-                    status_dist_fig = plot_status_distribution(processed_inlinks)
-                    st.plotly_chart(status_dist_fig, use_container_width=True)
-
-                    # Detailed analysis by status
-                    st.subheader("Detailed Status Analysis")
-                    results = analyze_status_groups(processed_inlinks, pd.read_csv(search_console))
-
-                    # Create tabs for each status group
-                    status_tabs = st.tabs([result['status'] for result in results])
-
-                    for tab, result in zip(status_tabs, results):
-                        with tab:
-                            col1, col2 = st.columns([2, 1])
-
-                            with col1:
-                                st.plotly_chart(result['figure'], use_container_width=True)
-
-                            with col2:
-                                st.metric("URLs with Traffic", result['with_traffic'])
-                                st.metric("URLs without Traffic", result['without_traffic'])
-                                st.metric("Total Affected Traffic", int(result['data']['Clicks'].sum()))
-                                st.info(f"**Recommendation:**\n\n{result['recommendation']}")
-                                
-
-                    # Export button for internal links analysis
-                    st.subheader("Export Internal Links Analysis")
-                    if st.button("Generate Internal Links Report"):
-                        excel_data = export_internal_links(results, temp_dir)
-                        st.download_button(
-                            label="📥 Download Internal Links Report",
-                            data=excel_data,
-                            file_name="internal_links_analysis.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
-                        st.success("Internal links report generated successfully!")
-
-                except Exception as e:
-                    st.error(f"An error occurred during internal links analysis: {str(e)}")
+            render_internal_links_tab(parse_key, use_store, all_inlinks, issues_overview, search_console,
+                                      issues_reports)
+
+
+def render_issues_tab(parse_key, use_store, issues_overview, search_console, issues_reports):
+    """Render the technical issues analysis; a failure here is reported without stopping the other tab"""
+    try:
+        # Load and process data (each stage is cached by the content of its inputs)
+        issues_report, gsc_df, issues_df, load_errors = parse_stage(
+            parse_key, use_store, issues_overview, search_console, issues_reports)
+        for issue, error in load_errors:
+            st.error(f"Error processing file {issue}: {error}")
+
+        if issues_df.empty:
+            st.error("No valid issue files could be processed.")
+            return
+
+        # Clean and label data
+        gsc_index = gsc_index_stage(parse_key, gsc_df)
+        issues_group, issues_df = aggregate_stage(parse_key, issues_df, gsc_index, issues_report)
+        issues_group = score_stage(parse_key, issues_group)
+
+        # Create visualizations
+        st.header("Analysis Results")
+
+        # Impact Distribution
+        st.subheader("Impact Score Distribution")
+        impact_fig = plot_impact_distribution(issues_group)
+        st.plotly_chart(impact_fig, use_container_width=True)
+
+        # Top Percentiles
+        st.subheader("Impact Score Analysis by Percentile")
+        perc_n = st.slider("Select percentile threshold", 0.0, 1.0, 0.75)
+        fig_top, fig_bottom = plot_top_percentiles(issues_group, perc_n)
+
+        # Display top issues chart
+        st.plotly_chart(fig_top, use_container_width=True)
+
+        # Display bottom issues chart
+        st.plotly_chart(fig_bottom, use_container_width=True)
+
+        # Drill-down into the URLs affected by a single issue
+        with st.expander("🔎 Affected URLs by issue"):
+            issue_names = dict(zip(issues_group['Issue Name'], issues_group['issue']))
+            selected_issue = st.selectbox("Select issue", list(issue_names), index=None,
+                                          placeholder="Choose an issue")
+            if selected_issue is not None:
+                issue_urls = partition_stage(parse_key, issues_df).get(issue_names[selected_issue])
+                st.caption(f"{len(issue_urls):,} affected URLs, sorted by clicks")
+                st.dataframe(issue_urls.head(1000), use_container_width=True, hide_index=True)
+
+        # Clustering, computed on demand
+        st.subheader("Clustering Analysis")
+        cluster_mode = st.radio("Cluster", ["Issues", "Affected URLs"], horizontal=True)
+        if cluster_mode == "Affected URLs":
+            n_urls = len(issues_df['Address'].cat.categories)
+            if lazy_section('url_clustering', n_urls, parse_key, "Cluster affected URLs"):
+                with timed_section('url_clustering', parse_key):
+                    perform_url_clustering(parse_key, issues_df)
+        elif lazy_section('issue_clustering', len(issues_group), parse_key, "Cluster issues"):
+            with timed_section('issue_clustering', parse_key):
+                cluster_fig = perform_clustering(issues_group)
+
+            if cluster_fig is not None:
+                st.plotly_chart(cluster_fig, use_container_width=True)
+            else:
+                st.warning("Clustering could not be performed. Please check your internet connection or try again later.")
+
+        # Export Section
+        st.subheader("Export Results")
+        threshold_value = issues_group['Impact_Score'].quantile(perc_n)
+        exported = issues_group[issues_group['Impact_Score'] >= threshold_value]
+        filtered_count = len(exported)
+
+        st.info(
+            f"Current threshold will export {filtered_count} issues (top {(1 - perc_n):.1%} by Impact Score)")
+
+        export_key = content_digest(parse_key, perc_n)
+        if lazy_section('export', exported['Address'].sum(), export_key, "Prepare Excel export"):
+            try:
+                with st.spinner("Generating Excel file..."), timed_section('export', export_key):
+                    partitions = partition_stage(parse_key, issues_df)
+                    excel_data, exported_count, split_sheets = export_stage(
+                        parse_key, perc_n, issues_group, issues_df, partitions)
+            except Exception as e:
+                st.error(f"Error during export: {str(e)}")
+                excel_data = None
+            if excel_data is not None:
+                show_split_sheets(split_sheets)
+                st.download_button(
+                    label=f"📥 Download Prioritized Audit ({exported_count} issues)",
+                    data=excel_data,
+                    file_name=f"issues_analysis_results_{int((1 - perc_n) * 100)}percentile.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+                st.success(f"Excel file generated successfully with {exported_count} issues!")
+
+    except Exception as e:
+        st.error(f"An error occurred during processing: {str(e)}")
+
+
+def render_internal_links_tab(parse_key, use_store, all_inlinks, issues_overview, search_console, issues_reports):
+    """Render the internal links analysis, computed only once requested"""
+    try:
+        # Streamlit runs every tab body, so the analysis waits until it is requested
+        st.header("Internal Links Analysis")
+        inlinks_key = upload_digest(all_inlinks)
+        links_key = content_digest(inlinks_key, parse_key)
+        if not lazy_section('internal_links', all_inlinks.size / 2 ** 20, links_key, "Analyze internal links"):
+            return
+
+        with timed_section('internal_links', links_key):
+            # Served from the stage caches when the issues tab already parsed the uploads
+            _, gsc_df, _, _ = parse_stage(parse_key, use_store, issues_overview, search_console, issues_reports)
+            gsc_index = gsc_index_stage(parse_key, gsc_df)
+            try:
+                all_inlinks_df, status_counts = inlinks_stage(inlinks_key, use_store, all_inlinks)
+            except Exception as e:
+                st.error(f"Error reading all_inlinks.csv: {str(e)}")
+                return
+            results = status_groups_stage(links_key, all_inlinks_df, gsc_index)
+
+        # Overall distribution
+        st.subheader("Status Code Distribution")
+        status_dist_fig = plot_status_distribution(status_counts)
+        st.plotly_chart(status_dist_fig, use_container_width=True)
+
+        # Detailed analysis by status
+        st.subheader("Detailed Status Analysis")
+
+        # Create tabs for each status group
+        status_tabs = st.tabs([result['status'] for result in results])
+
+        for tab, result in zip(status_tabs, results):
+            with tab:
+                col1, col2 = st.columns([2, 1])
+
+                with col1:
+                    st.plotly_chart(result['figure'], use_container_width=True)
+
+                with col2:
+                    st.metric("URLs with Traffic", result['with_traffic'])
+                    st.metric("URLs without Traffic", result['without_traffic'])
+                    st.metric("Total Affected Traffic", int(result['data']['Clicks'].sum()))
+                    st.info(f"**Recommendation:**\n\n{result['recommendation']}")
+
+        # Export of the internal links analysis, built on demand
+        st.subheader("Export Internal Links Analysis")
+        n_links = sum(len(result['data']) for result in results)
+        if lazy_section('internal_links_export', n_links, links_key, "Prepare internal links report"):
+            with st.spinner("Generating Excel file..."), timed_section('internal_links_export', links_key):
+                excel_data, split_sheets = links_export_stage(links_key, results)
+            show_split_sheets(split_sheets)
+            st.download_button(
+                label="📥 Download Internal Links Report",
+                data=excel_data,
+                file_name="internal_links_analysis.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+            st.success("Internal links report generated successfully!")
+
+    except Exception as e:
+        st.error(f"An error occurred during internal links analysis: {str(e)}")
 
 
 if __name__ == "__main__":
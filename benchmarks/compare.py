@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    """Return the results of a benchmark run keyed by (scale, benchmark)"""
+    with open(path, encoding='utf-8') as f:
+        run = json.load(f)
+    return run['environment'], {(result['scale'], result['benchmark']): result for result in run['results']}
+
+
+def compare(base_path, head_path, threshold=0.10, min_delta=0.01, metric='min_seconds'):
+    """
+    Compare two benchmark runs written by ``benchmarks.run``.
+
+    Parameters
+    ----------
+    base_path : str
+        Results of the baseline commit
+    head_path : str
+        Results of the commit under test
+    threshold : float, optional
+        Relative slowdown above which a stage counts as a regression
+    min_delta : float, optional
+        Slowdowns of fewer seconds than this are treated as timing noise
+    metric : str, optional
+        'min_seconds' or 'median_seconds'
+
+    Returns
+    -------
+    rows : list
+        ``(scale, benchmark, base, head, ratio)`` for stages present in both runs
+    regressions : list
+        The rows whose ratio exceeds ``1 + threshold`` by more than ``min_delta`` seconds
+    """
+    _, base = load_results(base_path)
+    _, head = load_results(head_path)
+    rows = []
+    for key in base:
+        if key not in head:
+            continue
+        base_value, head_value = base[key][metric], head[key][metric]
+        ratio = head_value / base_value if base_value else float('inf')
+        rows.append((*key, base_value, head_value, ratio))
+    regressions = [row for row in rows if row[4] > 1 + threshold and row[3] - row[2] > min_delta]
+    return rows, regressions
+
+
+def main(argv=None):
+    """Print the comparison; returns 1 if any stage regressed"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compare',
+                                     description='Compare two benchmark result files.')
+    parser.add_argument('base', help='Results of the baseline commit')
+    parser.add_argument('head', help='Results of the commit under test')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown reported as a regression (default: 0.10)')
+    parser.add_argument('--min-delta', type=float, default=0.01,
+                        help='Ignore slowdowns smaller than this many seconds (default: 0.01)')
+    parser.add_argument('--metric', choices=['min_seconds', 'median_seconds'], default='min_seconds')
+    args = parser.parse_args(argv)
+
+    rows, regressions = compare(args.base, args.head, threshold=args.threshold, min_delta=args.min_delta,
+                                 metric=args.metric)
+    print(f"{'scale':>8} {'benchmark':<24} {'base (s)':>10} {'head (s)':>10} {'ratio':>7}")
+    for scale, benchmark, base_value, head_value, ratio in rows:
+        flag = '  REGRESSION' if (scale, benchmark, base_value, head_value, ratio) in regressions else ''
+        print(f"{scale:>8} {benchmark:<24} {base_value:>10.3f} {head_value:>10.3f} {ratio:>6.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from .synthetic import SCALES, generate_crawl
+from src.data import (
+    clean_data,
+    label_data,
+    label_status_groups,
+    load_gsc,
+    load_inlinks,
+    load_issues_dir,
+    load_issues_overview,
+    summarize_status_groups
+)
+from src.utils import export_streamlit_data, generate_embeddings
+from src.utils.cache import cache_dir
+from src.utils.profiling import Profiler, profile_stage
+
+BENCHMARKS = [
+    'load_inputs',
+    'clean_data',
+    'label_data',
+    'generate_embeddings',
+    'analyze_status_groups',
+    'export_streamlit_data'
+]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def parse_scale(scale):
+    """Return the URL count of a named scale ('10k', '1m', ...) or a plain integer"""
+    if scale.lower() in SCALES:
+        return SCALES[scale.lower()]
+    return int(scale.replace('_', ''))
+
+
+def prepare_crawl(data_dir, n_urls, seed=0, **kwargs):
+    """
+    Generate the synthetic crawl for a scale, reusing it if it was already generated.
+
+    Parameters
+    ----------
+    data_dir : str
+        Directory holding one generated crawl per set of parameters
+    n_urls : int
+        Number of crawled URLs
+    seed : int, optional
+        Random seed
+    **kwargs
+        Passed to :func:`~benchmarks.synthetic.generate_crawl`
+
+    Returns
+    -------
+    crawl_dir : str
+        The crawl folder
+    counts : dict
+        Row counts per export
+    """
+    params = {'n_urls': n_urls, 'seed': seed, **kwargs}
+    crawl_dir = os.path.join(data_dir, '_'.join(f'{key}-{value}' for key, value in sorted(params.items())))
+    manifest_path = os.path.join(crawl_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            return crawl_dir, json.load(f)['counts']
+
+    print(f"Generating synthetic crawl with {n_urls:,} URLs in {crawl_dir}...")
+    counts = generate_crawl(crawl_dir, n_urls, seed=seed, **kwargs)
+    # The manifest is written last, so an interrupted generation is redone
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'params': params, 'counts': counts}, f, indent=2)
+    return crawl_dir, counts
+
+
+def time_benchmark(name, func, repeat):
+    """
+    Call ``func`` ``repeat`` times and summarize its wall time and memory.
+
+    Parameters
+    ----------
+    name : str
+        Benchmark name
+    func : callable
+        Called without arguments; returns the number of rows it processed
+    repeat : int
+        Number of calls
+
+    Returns
+    -------
+    dict
+        Timings in seconds (all calls, min and median), row count and process peak RSS
+    """
+    profiler = Profiler()
+    with profiler.activate():
+        for _ in range(repeat):
+            with profile_stage(name) as stage:
+                stage['rows'] = func()
+    runs = [record for record in profiler.records if record['depth'] == 0]
+    seconds = [record['seconds'] for record in runs]
+    return {
+        'benchmark': name,
+        'rows': runs[-1]['rows'],
+        'repeat': repeat,
+        'seconds': seconds,
+        'min_seconds': min(seconds),
+        'median_seconds': round(statistics.median(seconds), 4),
+        'max_rss_mb': runs[-1]['max_rss_mb'],
+        'max_rss_growth_mb': round(sum(record['max_rss_growth_mb'] or 0 for record in runs), 1)
+    }
+
+
+def run_scale(crawl_dir, repeat=3, perc_n=0.75, benchmarks=BENCHMARKS):
+    """
+    Time the pipeline stages on one generated crawl.
+
+    Each stage is timed on the output of the previous one, which is computed
+    once outside the timings.
+
+    Parameters
+    ----------
+    crawl_dir : str
+        Crawl folder written by :func:`~benchmarks.synthetic.generate_crawl`
+    repeat : int, optional
+        Number of timed calls per stage
+    perc_n : float, optional
+        Percentile threshold passed to export_streamlit_data
+    benchmarks : list, optional
+        Names of the stages to time (see ``BENCHMARKS``)
+
+    Returns
+    -------
+    list
+        One result per timed stage, see :func:`time_benchmark`
+    """
+    inputs = {}
+
+    def load_inputs():
+        inputs['issues_report'] = load_issues_overview(os.path.join(crawl_dir, 'issues_overview_report.csv'))
+        inputs['gsc_df'] = load_gsc(os.path.join(crawl_dir, 'search_console_all.csv'))
+        inputs['issues_df'], _ = load_issues_dir(os.path.join(crawl_dir, 'issues_reports'))
+        inputs['all_inlinks'], _ = load_inlinks(os.path.join(crawl_dir, 'all_inlinks.csv'))
+        return len(inputs['issues_df']) + len(inputs['gsc_df']) + len(inputs['all_inlinks'])
+
+    def run_clean_data():
+        inputs['issues_group'], inputs['merged_df'] = clean_data(inputs['issues_df'], inputs['gsc_df'],
+                                                                 inputs['issues_report'])
+        return len(inputs['merged_df'])
+
+    def run_label_data():
+        inputs['scored_group'] = label_data(inputs['issues_group'].copy())
+        return len(inputs['scored_group'])
+
+    def run_generate_embeddings():
+        issue_names = inputs['scored_group']['Issue Name'].tolist()
+        return len(generate_embeddings(issue_names, use_cache=False, backend='tfidf'))
+
+    def run_analyze_status_groups():
+        results = summarize_status_groups(label_status_groups(inputs['all_inlinks']), inputs['gsc_df'])
+        return sum(len(result['data']) for result in results)
+
+    def run_export_streamlit_data():
+        excel_data, _, _ = export_streamlit_data(inputs['scored_group'], inputs['merged_df'], perc_n)
+        return len(excel_data)
+
+    stages = {
+        'load_inputs': load_inputs,
+        'clean_data': run_clean_data,
+        'label_data': run_label_data,
+        'generate_embeddings': run_generate_embeddings,
+        'analyze_status_groups': run_analyze_status_groups,
+        'export_streamlit_data': run_export_streamlit_data
+    }
+    results = []
+    for name, func in stages.items():
+        if name in benchmarks:
+            results.append(time_benchmark(name, func, repeat))
+            print(f"  {name}: {results[-1]['min_seconds']:.3f}s (min of {repeat})")
+        else:
+            func()  # later stages need its output
+    return results
+
+
+def environment():
+    """Describe the commit and machine the benchmarks ran on"""
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], capture_output=True, text=True, check=True,
+                                  cwd=os.path.dirname(__file__)).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    import numpy
+    import pandas
+    import sklearn
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': {'pandas': pandas.__version__, 'numpy': numpy.__version__, 'scikit-learn': sklearn.__version__}
+    }
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run',
+        description='Time the audit pipeline on synthetic Screaming Frog crawls and record the results as JSON.'
+    )
+    parser.add_argument('--scales', nargs='+', default=['10k', '100k'],
+                        help=f"Crawl sizes in URLs: {', '.join(SCALES)} or an integer (default: 10k 100k)")
+    parser.add_argument('--repeat', type=int, default=3, help='Timed calls per stage (default: 3)')
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=BENCHMARKS,
+                        help='Stages to time (default: all)')
+    parser.add_argument('--n-issues', type=int, default=40, help='Issue types per crawl (default: 40)')
+    parser.add_argument('--inlinks-per-url', type=int, default=5,
+                        help='Internal links per URL (default: 5)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the generated crawls')
+    parser.add_argument('--data-dir', default=None,
+                        help='Where generated crawls are kept between runs (default: the sf-audit cache)')
+    parser.add_argument('--output', default=None,
+                        help='Results file (default: benchmarks/results/<commit>.json)')
+    return parser
+
+
+def main(argv=None):
+    """Run the benchmarks and write the results; returns the process exit code"""
+    args = build_parser().parse_args(argv)
+    data_dir = args.data_dir or cache_dir('benchmarks')
+    env = environment()
+
+    results = []
+    for scale in args.scales:
+        n_urls = parse_scale(scale)
+        crawl_dir, counts = prepare_crawl(data_dir, n_urls, seed=args.seed, n_issues=args.n_issues,
+                                          inlinks_per_url=args.inlinks_per_url)
+        print(f"Scale {scale} ({n_urls:,} URLs, {counts['issues_reports']:,} issue rows, "
+              f"{counts['all_inlinks']:,} inlinks):")
+        for result in run_scale(crawl_dir, repeat=args.repeat, benchmarks=args.benchmarks):
+            results.append({'scale': scale, 'urls': n_urls, **result})
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{(env['commit'] or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': env, 'results': results}, f, indent=2)
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+
+# Named scales, in crawled URLs
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000
+}
+
+# Issue names as they appear in Screaming Frog's issues overview report
+ISSUE_NAMES = [
+    'Response Codes: Internal Client Error (4xx)',
+    'Response Codes: Internal Server Error (5xx)',
+    'Response Codes: Internal Redirection (3xx)',
+    'Security: Missing HSTS Header',
+    'Security: Missing Content-Security-Policy Header',
+    'Security: Missing X-Content-Type-Options Header',
+    'URL: Uppercase',
+    'URL: Parameters',
+    'URL: Over 115 Characters',
+    'Page Titles: Missing',
+    'Page Titles: Duplicate',
+    'Page Titles: Over 60 Characters',
+    'Page Titles: Below 30 Characters',
+    'Page Titles: Same as H1',
+    'Meta Description: Missing',
+    'Meta Description: Duplicate',
+    'Meta Description: Over 155 Characters',
+    'Meta Description: Below 70 Characters',
+    'H1: Missing',
+    'H1: Duplicate',
+    'H1: Multiple',
+    'H2: Missing',
+    'H2: Non-Sequential',
+    'Content: Low Content Pages',
+    'Content: Near Duplicates',
+    'Content: Readability Difficult',
+    'Images: Missing Alt Text',
+    'Images: Over 100 KB',
+    'Images: Missing Size Attributes',
+    'Canonicals: Missing',
+    'Canonicals: Canonicalised',
+    'Canonicals: Non-Indexable Canonical',
+    'Directives: Noindex',
+    'Directives: Nofollow',
+    'Hreflang: Missing Return Links',
+    'Pagination: Non-Indexable',
+    'Structured Data: Validation Errors',
+    'Links: Pages With High External Outlinks',
+    'Links: Internal Nofollow Outlinks',
+    'Links: Pages Without Internal Outlinks'
+]
+ISSUE_TYPES = ['Issue', 'Warning', 'Opportunity']
+ISSUE_PRIORITIES = ['High', 'Medium', 'Low']
+
+SECTIONS = np.array(['blog', 'products', 'category', 'support', 'news', 'docs', 'about', 'events'])
+# Status codes of crawled URLs and how often they occur
+STATUS_CODES = np.array([200, 301, 302, 404, 410, 500, 503, 0])
+STATUS_WEIGHTS = np.array([0.86, 0.05, 0.01, 0.04, 0.005, 0.01, 0.005, 0.02])
+STATUS_TEXT = {200: 'OK', 301: 'Moved Permanently', 302: 'Found', 404: 'Not Found', 410: 'Gone',
+               500: 'Internal Server Error', 503: 'Service Unavailable', 0: 'Connection Timeout'}
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def normalize_issue_name(issue_name):
+    """Return the file name stem Screaming Frog gives an issue's bulk export"""
+    name = re.sub(r'[^\w\s]', '', issue_name.lower())
+    return re.sub(r'\s+', '_', name)
+
+
+def make_urls(ids, host='https://www.example.com'):
+    """Build deterministic crawl URLs for an array of URL ids"""
+    ids = np.asarray(ids)
+    prefixes = np.array([f'{host}/{section}/page-' for section in SECTIONS], dtype=object)
+    return prefixes[ids % len(SECTIONS)] + ids.astype(str).astype(object) + '/'
+
+
+def _write_csv(df, path, first_chunk):
+    df.to_csv(path, mode='w' if first_chunk else 'a', header=first_chunk, index=False)
+
+
+def generate_crawl(directory, n_urls, n_issues=len(ISSUE_NAMES), inlinks_per_url=5, gsc_coverage=0.6,
+                   seed=0, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Write a synthetic Screaming Frog crawl folder.
+
+    The folder has the layout the app and ``src.cli`` expect:
+    issues_overview_report.csv, search_console_all.csv, all_inlinks.csv and one
+    CSV per issue under issues_reports/. Rows are generated and written in
+    chunks, so memory use stays bounded at any scale. Clicks follow a heavy
+    tailed distribution and each issue affects between 0.05% and 10% of URLs,
+    roughly like a real site.
+
+    Parameters
+    ----------
+    directory : str
+        Output folder, created if needed
+    n_urls : int
+        Number of crawled URLs
+    n_issues : int, optional
+        Number of issue types (at most ``len(ISSUE_NAMES)``)
+    inlinks_per_url : int, optional
+        Average number of internal links pointing at each URL
+    gsc_coverage : float, optional
+        Share of URLs with Search Console data
+    seed : int, optional
+        Random seed; the same arguments always produce the same files
+    chunksize : int, optional
+        Number of URLs generated at a time
+
+    Returns
+    -------
+    dict
+        Row counts per export
+    """
+    rng = np.random.default_rng(seed)
+    issues_dir = os.path.join(directory, 'issues_reports')
+    os.makedirs(issues_dir, exist_ok=True)
+
+    issue_names = ISSUE_NAMES[:n_issues]
+    issue_files = [os.path.join(issues_dir, f'{normalize_issue_name(name)}.csv') for name in issue_names]
+    issue_fractions = np.exp(rng.uniform(np.log(0.0005), np.log(0.10), len(issue_names)))
+    issue_counts = np.zeros(len(issue_names), dtype=np.int64)
+    url_status = rng.choice(STATUS_CODES, size=n_urls, p=STATUS_WEIGHTS).astype(np.int16)
+
+    gsc_path = os.path.join(directory, 'search_console_all.csv')
+    inlinks_path = os.path.join(directory, 'all_inlinks.csv')
+    gsc_rows = 0
+    inlinks_rows = 0
+
+    for start in range(0, n_urls, chunksize):
+        first_chunk = start == 0
+        ids = np.arange(start, min(start + chunksize, n_urls))
+        urls = make_urls(ids)
+        status = url_status[ids]
+
+        # Search Console metrics for a share of the URLs, with heavy-tailed clicks
+        has_gsc = rng.random(len(ids)) < gsc_coverage
+        n_gsc = int(has_gsc.sum())
+        impressions = np.floor(rng.pareto(1.2, n_gsc) * 50).astype(np.int64)
+        clicks = np.minimum(impressions, np.floor(impressions * rng.beta(1, 20, n_gsc))).astype(np.int64)
+        _write_csv(pd.DataFrame({
+            'Address': urls[has_gsc],
+            'Status Code': status[has_gsc],
+            'Indexability': np.where(status[has_gsc] == 200, 'Indexable', 'Non-Indexable'),
+            'Clicks': clicks,
+            'Impressions': impressions,
+            'CTR': np.divide(clicks, impressions, out=np.zeros(n_gsc), where=impressions > 0),
+            'Position': np.round(rng.gamma(2.0, 8.0, n_gsc) + 1, 2)
+        }), gsc_path, first_chunk)
+        gsc_rows += n_gsc
+
+        # One export per issue, each affecting its share of the URLs
+        for i, path in enumerate(issue_files):
+            affected = rng.random(len(ids)) < issue_fractions[i]
+            _write_csv(pd.DataFrame({
+                'Address': urls[affected],
+                'Content Type': 'text/html; charset=utf-8',
+                'Status Code': status[affected],
+                'Indexability': np.where(status[affected] == 200, 'Indexable', 'Non-Indexable')
+            }), path, first_chunk)
+            issue_counts[i] += int(affected.sum())
+
+        # Internal links pointing at the URLs of the chunk
+        n_links = len(ids) * inlinks_per_url
+        destinations = rng.choice(ids, n_links)
+        link_status = url_status[destinations]
+        _write_csv(pd.DataFrame({
+            'Type': 'Hyperlink',
+            'Source': make_urls(rng.integers(0, n_urls, n_links)),
+            'Destination': make_urls(destinations),
+            'Anchor': 'Read more',
+            'Status Code': link_status,
+            'Status': pd.Series(link_status).map(STATUS_TEXT).to_numpy(),
+            'Follow': True
+        }), inlinks_path, first_chunk)
+        inlinks_rows += n_links
+
+    pd.DataFrame({
+        'Issue Name': issue_names,
+        'Issue Type': [ISSUE_TYPES[i % len(ISSUE_TYPES)] for i in range(len(issue_names))],
+        'Issue Priority': [ISSUE_PRIORITIES[i % len(ISSUE_PRIORITIES)] for i in range(len(issue_names))],
+        'URLs': issue_counts,
+        '% of Total': np.round(issue_counts / n_urls * 100, 2)
+    }).to_csv(os.path.join(directory, 'issues_overview_report.csv'), index=False)
+
+    return {
+        'urls': n_urls,
+        'search_console_all': gsc_rows,
+        'issues_reports': int(issue_counts.sum()),
+        'all_inlinks': inlinks_rows
+    }
@@ -1,11 +1,12 @@
 # src/__init__.py
-from .data import clean_data, calculate_impact_score, label_data
+from .data import clean_data, calculate_impact_score, calculate_impact_scores, label_data
 from .visualization import plot_elbow, clusters_2D, plot_top_percentiles
 from .utils import export_data, generate_embeddings, export_streamlit_data
 
 __all__ = [
     'clean_data',
     'calculate_impact_score',
+    'calculate_impact_scores',
     'label_data',
     'plot_elbow',
     'clusters_2D',
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import sys
+from .pipeline import ISSUES_REPORTS_DIR, run_batch
+
+
+def find_crawl_dirs(crawl_root):
+    """Return the sub-folders of ``crawl_root`` that look like Screaming Frog crawl folders"""
+    return sorted(
+        os.path.join(crawl_root, name)
+        for name in os.listdir(crawl_root)
+        if os.path.isdir(os.path.join(crawl_root, name, ISSUES_REPORTS_DIR))
+    )
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(
+        prog='sf-audit',
+        description='Prioritize Screaming Frog technical audit issues without the Streamlit app.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Run the audit for one or more crawl folders')
+    crawls = run.add_mutually_exclusive_group(required=True)
+    crawls.add_argument('--crawl-dir', action='append', dest='crawl_dirs', metavar='DIR',
+                        help='Crawl folder with issues_overview_report.csv, search_console_all.csv, '
+                             'issues_reports/ and optionally all_inlinks.csv (repeatable)')
+    crawls.add_argument('--crawl-root', metavar='DIR',
+                        help='Folder whose sub-folders are crawl folders')
+    run.add_argument('--output-dir', default='export', metavar='DIR',
+                     help='Results go to DIR/<crawl folder name> (default: export)')
+    run.add_argument('--percentile', type=float, default=0.75,
+                     help='Percentile threshold for the prioritized export (default: 0.75)')
+    run.add_argument('--workers', type=int, default=None,
+                     help='Number of crawls processed concurrently (default: CPU count)')
+    run.add_argument('--read-workers', type=int, default=None,
+                     help='Threads reading the issue exports of each crawl')
+    run.add_argument('--snapshot-dir', metavar='DIR',
+                     help='Keep a baseline snapshot per crawl in DIR and report changes against it')
+    run.add_argument('--with-crawl-data', action='store_true',
+                     help="Also export each issue's crawl columns (uses more memory)")
+    run.add_argument('--trace-memory', action='store_true',
+                     help='Trace Python allocations per stage in timings.json (slower)')
+    return parser
+
+
+def main(argv=None):
+    """Entry point of the ``sf-audit`` command; returns the process exit code"""
+    args = build_parser().parse_args(argv)
+
+    crawl_dirs = args.crawl_dirs or find_crawl_dirs(args.crawl_root)
+    if not crawl_dirs:
+        print(f"No crawl folders found in {args.crawl_root}", file=sys.stderr)
+        return 1
+
+    reports = run_batch(crawl_dirs,
+                        args.output_dir,
+                        max_workers=args.workers,
+                        snapshot_root=args.snapshot_dir,
+                        perc_n=args.percentile,
+                        with_crawl_data=args.with_crawl_data,
+                        read_workers=args.read_workers,
+                        trace_memory=args.trace_memory)
+
+    failed = [report for report in reports if 'error' in report]
+    for report in reports:
+        if 'error' in report:
+            print(f"FAILED {report['crawl_dir']}: {report['error']}", file=sys.stderr)
+        else:
+            print(f"{report['crawl_dir']}: {report['issues']} issues, {report['total_seconds']:.1f}s, "
+                  f"peak RSS {report['max_rss_mb']} MB -> {report['output_dir']}")
+            for sheet_name in report['split_sheets']:
+                print(f"WARNING {report['crawl_dir']}: sheet '{sheet_name}' exceeds Excel's row limit "
+                      "and continues on numbered sheets", file=sys.stderr)
+    print(json.dumps({'crawls': len(reports), 'failed': len(failed)}))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,87 @@
 # src/data/__init__.py
-from .cleaning import clean_data
-from .scoring import calculate_impact_score, label_data
+from .cleaning import aggregate_issues, attach_issue_overview, clean_data, merge_gsc_metrics
+from .crawl_index import CrawlIndex, build_crawl_index
+from .gsc_index import GscIndex, build_gsc_index
+from .links import label_status_groups, status_label, summarize_status_groups
+from .loading import (
+    detect_encoding,
+    load_gsc,
+    load_inlinks,
+    list_issue_files,
+    issues_from_frames,
+    load_issue_reports,
+    load_issues_dir,
+    read_issue_reports,
+    read_issues_dir,
+    load_issues_overview,
+    read_csv_chunks,
+    read_csv_streaming
+)
+from .schema import SCHEMAS, apply_schema, concat_frames
+from .uploads import BufferReader, open_upload, spill_to_disk
+from .urls import UrlInterner, canonicalize_url
+from .snapshot import incremental_audit, load_snapshot, save_snapshot
+from .store import (
+    CATEGORY_COLUMNS,
+    PARQUET_AVAILABLE,
+    crawl_store_path,
+    evict_crawl_stores,
+    has_crawl_store,
+    load_crawl_store,
+    save_crawl_store,
+    store_limits,
+    to_categories
+)
+from .partitions import IssuePartitions, partition_issues
+from .scoring import calculate_impact_score, calculate_impact_scores, label_data
 
 __all__ = [
     'clean_data',
+    'merge_gsc_metrics',
+    'aggregate_issues',
+    'attach_issue_overview',
     'calculate_impact_score',
-    'label_data'
+    'calculate_impact_scores',
+    'label_data',
+    'label_status_groups',
+    'status_label',
+    'summarize_status_groups',
+    'CrawlIndex',
+    'build_crawl_index',
+    'GscIndex',
+    'build_gsc_index',
+    'detect_encoding',
+    'load_gsc',
+    'load_inlinks',
+    'list_issue_files',
+    'issues_from_frames',
+    'load_issue_reports',
+    'load_issues_dir',
+    'read_issue_reports',
+    'read_issues_dir',
+    'load_issues_overview',
+    'read_csv_chunks',
+    'read_csv_streaming',
+    'SCHEMAS',
+    'apply_schema',
+    'concat_frames',
+    'BufferReader',
+    'open_upload',
+    'spill_to_disk',
+    'UrlInterner',
+    'canonicalize_url',
+    'IssuePartitions',
+    'partition_issues',
+    'incremental_audit',
+    'load_snapshot',
+    'save_snapshot',
+    'CATEGORY_COLUMNS',
+    'PARQUET_AVAILABLE',
+    'crawl_store_path',
+    'evict_crawl_stores',
+    'has_crawl_store',
+    'load_crawl_store',
+    'save_crawl_store',
+    'store_limits',
+    'to_categories'
 ]
\ No newline at end of file
@@ -1,3 +1,10 @@
+import pandas as pd
+from .gsc_index import GscIndex
+from .schema import apply_schema
+from ..utils.profiling import profiled
+
+
+@profiled(rows=lambda result: len(result[1]))
 def clean_data(issues_df, gsc_df, issues_report):
 
     """
@@ -7,8 +14,8 @@ def clean_data(issues_df, gsc_df, issues_report):
     ----------
     issues_df : pandas.DataFrame
         DataFrame containing issues data
-    gsc_df : pandas.DataFrame
-        DataFrame containing GSC data
+    gsc_df : pandas.DataFrame or GscIndex
+        DataFrame containing GSC data, or its index
     issues_report : pandas.DataFrame
         DataFrame containing issues report data
 
@@ -17,35 +24,94 @@ def clean_data(issues_df, gsc_df, issues_report):
     issues_group : pandas.DataFrame
         DataFrame containing aggregated issues data
     """
-    issues_df = issues_df.merge(gsc_df,
-                                how='left',
-                                left_on='Address',
-                                right_on='Address',
-                                suffixes=('_issues', '_gsc'),
-                                indicator=True)[[
-                                        'Address',
-                                        'issue',
-                                        'Clicks_gsc',
-                                        'Impressions_gsc',
-                                        'CTR_gsc',
-                                        'Position_gsc']]
-
-    issues_group = issues_df.groupby('issue').agg({
+    issues_df = merge_gsc_metrics(issues_df, gsc_df)
+    issues_group = aggregate_issues(issues_df)
+    issues_group = attach_issue_overview(issues_group, issues_report)
+    return issues_group, issues_df
+
+
+@profiled()
+def merge_gsc_metrics(issues_df, gsc_df):
+    """
+    Merge URL-level issues data with GSC metrics.
+
+    Only the join key and metrics are carried into the merge. Each distinct
+    address is looked up in the GSC index once (via the categorical codes) and
+    the metrics are gathered as float64 arrays, so no merged object columns or
+    suffixed leftovers are built.
+
+    Parameters
+    ----------
+    issues_df : pandas.DataFrame
+        DataFrame containing issues data with 'Address' and 'issue' columns
+    gsc_df : pandas.DataFrame or GscIndex
+        DataFrame containing GSC data, or its index (built here if a DataFrame is given)
+
+    Returns
+    -------
+    pandas.DataFrame
+        Address, issue and the GSC metrics suffixed '_gsc', in the order of ``issues_df``
+    """
+    issues_df = apply_schema(issues_df[['Address', 'issue']], 'issues_df')
+    gsc_index = gsc_df if isinstance(gsc_df, GscIndex) else GscIndex.from_frame(gsc_df)
+
+    merged = {'Address': issues_df['Address'].array, 'issue': issues_df['issue'].array}
+    for col, values in gsc_index.lookup(issues_df['Address']).items():
+        merged[f'{col}_gsc'] = values
+    return pd.DataFrame(merged)
+
+
+@profiled()
+def aggregate_issues(issues_df):
+    """
+    Aggregate URL-level issues data per issue.
+
+    Parameters
+    ----------
+    issues_df : pandas.DataFrame
+        DataFrame returned by :func:`merge_gsc_metrics`
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per issue, sorted by clicks descending, with the URL count in 'Address'
+    """
+    issues_group = issues_df.groupby('issue', observed=True).agg({
         'Clicks_gsc': 'sum',
         'Impressions_gsc': 'sum',
         'CTR_gsc': 'mean',
         'Position_gsc': 'mean',
         'Address': 'count',
     }).sort_values('Clicks_gsc', ascending=False)
+    return issues_group.reset_index()
+
+
+@profiled()
+def attach_issue_overview(issues_group, issues_report):
+    """
+    Add issue names, types and priorities from the issues overview report.
+
+    Parameters
+    ----------
+    issues_group : pandas.DataFrame
+        DataFrame returned by :func:`aggregate_issues`
+    issues_report : pandas.DataFrame
+        DataFrame containing issues report data
 
-    issues_report['issue_normalized'] = (issues_report['Issue Name']
+    Returns
+    -------
+    pandas.DataFrame
+        Aggregated issues data with overview columns and click/URL percentile ranks
+    """
+    # Only the overview columns kept below are carried into the merge
+    issues_report = apply_schema(issues_report, 'issues_report')
+    issues_report = issues_report.assign(issue_normalized=issues_report['Issue Name']
                                          .str.lower()
                                          .str.replace(r'[^\w\s]', '', regex=True)  # Remove special characters
                                          .str.replace(r'\s+', '_', regex=True)  # Replace spaces with underscore
                                          )
 
     # merge issues_overview to issues_group
-    issues_group = issues_group.reset_index()
     issues_group = issues_group.merge(issues_report,
                                       how='left',
                                       left_on='issue',
@@ -58,5 +124,4 @@ def clean_data(issues_df, gsc_df, issues_report):
     issues_group = issues_group.dropna(subset='Issue Name')
     issues_group['pct_rank_clicks'] = issues_group['Clicks_gsc'].rank(pct=True)
     issues_group['pct_rank_urls'] = issues_group['Address'].rank(pct=True)
-    return issues_group, issues_df
-
+    return issues_group
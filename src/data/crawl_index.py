@@ -0,0 +1,104 @@
+from .loading import read_issues_dir
+from .schema import concat_frames
+
+
+class CrawlIndex:
+    """
+    Crawl columns of each issue export, indexed on Address.
+
+    Built once from the ingested issue files, so enriching an issue's URLs with
+    its crawl data is an index join rather than another read of the CSV.
+
+    Parameters
+    ----------
+    frames : dict
+        Crawl data per normalized issue name, indexed on Address
+    """
+
+    def __init__(self, frames):
+        self._frames = frames
+
+    @classmethod
+    def from_frames(cls, issue_frames):
+        """
+        Build the index from the per-file frames of the issue exports.
+
+        Each issue keeps its file's header as-is, including columns that are
+        empty for every URL (e.g. 'Meta Description 1' of a missing meta
+        description issue).
+
+        Parameters
+        ----------
+        issue_frames : list
+            ``(normalized issue name, DataFrame)`` pairs, as returned by
+            ``read_issue_reports(..., columns=None)``
+
+        Returns
+        -------
+        CrawlIndex
+            The index
+        """
+        grouped = {}
+        for issue, frame in issue_frames:
+            grouped.setdefault(issue, []).append(frame)
+        frames = {}
+        for issue, issue_dfs in grouped.items():
+            issue_df = concat_frames(issue_dfs) if len(issue_dfs) > 1 else issue_dfs[0]
+            frames[issue] = (issue_df.dropna(subset=['Address'])
+                             .drop_duplicates(subset='Address')
+                             .set_index('Address'))
+        return cls(frames)
+
+    @classmethod
+    def from_dir(cls, issues_dir, **kwargs):
+        """Build the index by reading every issue export in a directory once"""
+        issue_frames, _ = read_issues_dir(issues_dir, columns=None, **kwargs)
+        return cls.from_frames(issue_frames)
+
+    def __contains__(self, issue):
+        return issue in self._frames
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, issue):
+        """Return the crawl data of an issue indexed on Address, or None if unknown"""
+        return self._frames.get(issue)
+
+    def enrich(self, issue_data, issue):
+        """
+        Left-join an issue's crawl columns onto its URL-level rows.
+
+        Parameters
+        ----------
+        issue_data : pandas.DataFrame
+            Rows for the issue with an 'Address' column
+        issue : str
+            Normalized issue name
+
+        Returns
+        -------
+        pandas.DataFrame
+            ``issue_data`` with the crawl columns added (suffixed '_crawl' on clashes)
+        """
+        crawl_data = self._frames.get(issue)
+        if crawl_data is None:
+            return issue_data
+        return issue_data.join(crawl_data, on='Address', rsuffix='_crawl')
+
+
+def build_crawl_index(issue_frames):
+    """
+    Build a :class:`CrawlIndex` from issue exports parsed with all their columns.
+
+    Parameters
+    ----------
+    issue_frames : list
+        ``(normalized issue name, DataFrame)`` pairs, one per issue file
+
+    Returns
+    -------
+    CrawlIndex
+        The index
+    """
+    return CrawlIndex.from_frames(issue_frames)
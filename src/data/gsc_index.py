@@ -0,0 +1,142 @@
+import numpy as np
+from .urls import UrlInterner
+from ..utils.profiling import profiled
+
+GSC_METRICS = ['Clicks', 'Impressions', 'CTR', 'Position']
+
+
+class GscIndex:
+    """
+    GSC metrics of each URL, keyed on interned URL ids and held as contiguous float64 arrays.
+
+    Built once per Search Console upload and shared by every join against it
+    (URL-level issues, internal link destinations, exports). URLs are matched
+    on their canonical form through a :class:`~src.data.urls.UrlInterner`, so
+    each join resolves distinct URLs to integer ids once and the rest is
+    integer indexing.
+
+    Parameters
+    ----------
+    interner : UrlInterner
+        Interner the GSC URLs were interned with
+    rows : numpy.ndarray
+        GSC row of each URL id, -1 for ids without GSC data
+    metrics : dict
+        float64 array per metric, one value per GSC row
+    addresses : numpy.ndarray, optional
+        URL of each GSC row as exported
+    """
+
+    def __init__(self, interner, rows, metrics, addresses=None):
+        self.interner = interner
+        self.rows = rows
+        self.metrics = metrics
+        # One trailing NaN per column, so unmatched positions (-1) gather NaN
+        self._padded = {col: np.append(values, np.nan) for col, values in metrics.items()}
+        if addresses is not None:
+            self._padded['Address'] = np.append(addresses, np.nan)
+
+    @classmethod
+    def from_frame(cls, gsc_df, interner=None):
+        """
+        Build the index from the search_console_all export.
+
+        Parameters
+        ----------
+        gsc_df : pandas.DataFrame
+            GSC data with an 'Address' column and the metric columns; when several
+            rows share a canonical URL the first one is used
+        interner : UrlInterner, optional
+            Interner to intern the GSC URLs with; a canonicalizing one is created if None.
+            It is frozen once the GSC URLs are interned, so the index (typically cached
+            and shared between sessions) only ever reads it
+
+        Returns
+        -------
+        GscIndex
+            The index
+        """
+        interner = interner if interner is not None else UrlInterner()
+        ids = interner.intern(gsc_df['Address'])
+        interner.freeze()
+        rows = np.full(len(interner), -1, dtype=np.int64)
+        unique_ids, first_rows = np.unique(ids, return_index=True)
+        valid = unique_ids >= 0
+        rows[unique_ids[valid]] = first_rows[valid]
+        metrics = {
+            col: np.ascontiguousarray(gsc_df[col].to_numpy(dtype=np.float64, na_value=np.nan))
+            for col in GSC_METRICS if col in gsc_df.columns
+        }
+        return cls(interner, rows, metrics, addresses=gsc_df['Address'].to_numpy(dtype=object))
+
+    def __len__(self):
+        return int((self.rows >= 0).sum())
+
+    def __contains__(self, url):
+        return bool(self.positions([url])[0] >= 0)
+
+    def positions(self, urls):
+        """
+        Return the GSC row of each URL, -1 where it has no GSC data.
+
+        Each distinct string is resolved once through the interner (see
+        :meth:`UrlInterner.intern`) without adding it: URLs missing from the
+        GSC export are not interned and get -1.
+
+        Parameters
+        ----------
+        urls : array-like
+            URLs to look up (Series, Categorical, Index or array)
+
+        Returns
+        -------
+        numpy.ndarray
+            int64 rows aligned with ``urls``
+        """
+        ids = self.interner.intern(urls, add=False)
+        # Ids interned after the index was built (by a shared interner) have no GSC row
+        known = (ids >= 0) & (ids < len(self.rows))
+        return np.where(known, self.rows[np.where(known, ids, 0)], -1)
+
+    def lookup(self, urls, columns=None):
+        """
+        Return the GSC metrics of each URL as arrays aligned with ``urls``.
+
+        Parameters
+        ----------
+        urls : array-like
+            URLs to look up
+        columns : list, optional
+            Metrics to return, optionally with 'Address' (the matched GSC URL as
+            exported); all metrics if None
+
+        Returns
+        -------
+        dict
+            Array per column, NaN for URLs without GSC data
+        """
+        return self.gather(self.positions(urls), columns)
+
+    def gather(self, positions, columns=None):
+        """Return the columns at rows returned by :meth:`positions` (NaN at -1)"""
+        return {col: self._padded[col][positions] for col in (columns or self.metrics)}
+
+
+@profiled()
+def build_gsc_index(gsc_df, interner=None):
+    """
+    Build a :class:`GscIndex` from the search_console_all export.
+
+    Parameters
+    ----------
+    gsc_df : pandas.DataFrame
+        GSC data with Address, Clicks, Impressions, CTR and Position columns
+    interner : UrlInterner, optional
+        Interner to intern the GSC URLs with; frozen once they are interned
+
+    Returns
+    -------
+    GscIndex
+        The index
+    """
+    return GscIndex.from_frame(gsc_df, interner=interner)
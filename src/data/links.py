@@ -0,0 +1,111 @@
+import pandas as pd
+from .gsc_index import GscIndex
+from ..utils.profiling import profiled
+
+# Labels by status class (first digit of the HTTP status code)
+STATUS_LABELS = {
+    0: 'Cancelled: 0',
+    2: 'Successful',
+    3: 'Redirect',
+    4: 'Client Error',
+    5: 'Server Error'
+}
+STATUS_GROUPS = list(STATUS_LABELS.values()) + ['other']
+
+RECOMMENDATIONS = {
+    'Cancelled: 0': 'Review the page to ensure that the URL is correct and the page is not blocked by robots.txt.',
+    'Redirect': 'Update the internal redirect to the new, target/final URL.',
+    'Client Error': 'Update the broken link to be a valid, canonical, 200 status URL.',
+    'Server Error': 'Review the server logs to identify the cause of the server error and resolve the issue.',
+    'other': 'Review the links to confirm the destination URLs respond as expected.'
+}
+
+
+def status_label(status_class):
+    """Label a status class (first digit of the status code)"""
+    return STATUS_LABELS.get(status_class, 'other')
+
+
+@profiled()
+def label_status_groups(all_inlinks):
+    """
+    Add a categorical 'status_group' column to the internal links data.
+
+    Parameters
+    ----------
+    all_inlinks : pandas.DataFrame
+        Internal links data with a 'Status Code' column
+
+    Returns
+    -------
+    pandas.DataFrame
+        Copy of ``all_inlinks`` with the 'status_group' column
+    """
+    status_code = pd.to_numeric(all_inlinks['Status Code'], errors='coerce').fillna(0).astype('int64')
+    status_group = (status_code // 100).map(STATUS_LABELS).fillna('other')
+
+    all_inlinks = all_inlinks.copy()
+    all_inlinks['status_group'] = pd.Categorical(status_group, categories=STATUS_GROUPS)
+    return all_inlinks
+
+
+@profiled(rows=None)
+def summarize_status_groups(all_inlinks, gsc_data):
+    """
+    Summarize non-successful internal links per status group in a single pass.
+
+    The link destinations are looked up in the GSC index once and the links are
+    then partitioned by status group, instead of filtering and merging once per group.
+
+    Parameters
+    ----------
+    all_inlinks : pandas.DataFrame
+        Internal links data with 'Status Code', 'Destination' and 'status_group' columns
+    gsc_data : pandas.DataFrame or GscIndex
+        GSC data with 'Address' and 'Clicks' columns, or its index
+
+    Returns
+    -------
+    list
+        One dict per non-successful status group, in order of first appearance, with
+        the merged link data ('data'), one row per destination ('unique_data'),
+        destination counts with and without traffic, the status codes present
+        and a recommendation. The link data keeps the column names of the former
+        merge: the link's status code is 'Status Code_inlinks', followed by the
+        matched GSC 'Address' and metrics.
+    """
+    non_200 = all_inlinks[all_inlinks['status_group'] != 'Successful']
+
+    gsc_index = gsc_data if isinstance(gsc_data, GscIndex) else GscIndex.from_frame(gsc_data)
+
+    # Same columns as a left merge on Destination == Address, matched on interned URL ids
+    positions = gsc_index.positions(non_200['Destination'])
+    inlinks_merge = non_200.reset_index(drop=True)
+    for col, values in gsc_index.gather(positions, ['Address', *gsc_index.metrics]).items():
+        inlinks_merge[col] = values
+    inlinks_merge['Clicks'] = inlinks_merge['Clicks'].fillna(0)
+    # The GSC export also has a 'Status Code', hence the suffix of the link's one
+    inlinks_merge = inlinks_merge.rename(columns={'Status Code': 'Status Code_inlinks'})
+
+    inlinks_unique = inlinks_merge.drop_duplicates(subset=['status_group', 'Destination'])
+    unique_by_status = inlinks_unique.groupby('status_group', observed=True, sort=False)
+    destinations = unique_by_status.size()
+    with_traffic = (inlinks_unique['Clicks'] > 0).groupby(inlinks_unique['status_group'], observed=True).sum()
+
+    merged_by_status = dict(tuple(inlinks_merge.groupby('status_group', observed=True, sort=False)))
+    unique_data_by_status = dict(tuple(unique_by_status))
+
+    results = []
+    for status in pd.unique(non_200['status_group']):
+        status_data = merged_by_status[status]
+        results.append({
+            'status': status,
+            'data': status_data,
+            'unique_data': unique_data_by_status[status],
+            'with_traffic': int(with_traffic[status]),
+            'without_traffic': int(destinations[status] - with_traffic[status]),
+            'status_codes': status_data['Status Code_inlinks'].unique(),
+            'recommendation': RECOMMENDATIONS[status]
+        })
+
+    return results
@@ -0,0 +1,436 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from .schema import apply_schema, concat_frames, schema_columns
+from ..utils.profiling import profiled
+
+# Columns the pipeline actually uses from each Screaming Frog export
+ISSUE_COLUMNS = ['Address']
+GSC_COLUMNS = schema_columns('gsc_df')
+REPORT_COLUMNS = schema_columns('issues_report')
+INLINKS_COLUMNS = schema_columns('all_inlinks')
+
+DEFAULT_CHUNKSIZE = 100_000
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+
+def detect_encoding(source, sample_size=ENCODING_SAMPLE_SIZE):
+    """
+    Detect the encoding of a CSV export from a small sample of its bytes.
+
+    Parameters
+    ----------
+    source : str or file-like
+        Path to the file, or a binary file-like object (its position is restored)
+    sample_size : int, optional
+        Number of bytes to inspect
+
+    Returns
+    -------
+    str
+        'utf-8-sig', 'utf-8' or 'latin-1'
+    """
+    if hasattr(source, 'read'):
+        position = source.tell()
+        sample = source.read(sample_size)
+        source.seek(position)
+    else:
+        with open(source, 'rb') as f:
+            sample = f.read(sample_size)
+
+    if isinstance(sample, str):
+        return 'utf-8'
+    if sample.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the end of the sample is still valid UTF-8
+        if e.start < len(sample) - 3:
+            return 'latin-1'
+    return 'utf-8'
+
+
+def read_csv_chunks(source, columns=None, chunksize=DEFAULT_CHUNKSIZE, encoding=None):
+    """
+    Iterate over a CSV export in bounded chunks, reading only the requested columns.
+
+    Parameters
+    ----------
+    source : str or file-like
+        Path to the file or a binary file-like object
+    columns : list, optional
+        Columns to keep; columns missing from the file are ignored. All columns are read if None.
+    chunksize : int, optional
+        Number of rows per chunk
+    encoding : str, optional
+        File encoding; detected from a sample if None
+
+    Yields
+    ------
+    pandas.DataFrame
+        Chunks of the CSV restricted to ``columns``
+
+    Raises
+    ------
+    UnicodeDecodeError
+        If the file is not valid in ``encoding``, e.g. latin-1 bytes beyond the
+        sample the encoding was detected from
+    """
+    if encoding is None:
+        encoding = detect_encoding(source)
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda col: col in wanted
+
+    reader = pd.read_csv(source,
+                         usecols=usecols,
+                         chunksize=chunksize,
+                         encoding=encoding,
+                         low_memory=False)
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def read_csv_streaming(source, columns=None, chunksize=DEFAULT_CHUNKSIZE, encoding=None, transform=None,
+                       schema=None):
+    """
+    Read a CSV export chunk by chunk and concatenate the (optionally transformed) chunks.
+
+    With a ``schema``, each chunk is cast to the input's declared dtypes as it is
+    read, so the full file is never held with object strings and int64/float64
+    columns; categorical columns stay categorical across chunks.
+
+    Parameters
+    ----------
+    source : str or file-like
+        Path to the file or a binary file-like object
+    columns : list, optional
+        Columns to keep
+    chunksize : int, optional
+        Number of rows per chunk
+    encoding : str, optional
+        File encoding; detected from a sample if None, and the file is re-read as
+        latin-1 if it turns out not to be valid UTF-8 past the sample
+    transform : callable, optional
+        Applied to each chunk before it is kept, e.g. to filter rows
+    schema : str, optional
+        Key of the input in :data:`~src.data.schema.SCHEMAS`; its declared
+        columns are read if ``columns`` is None
+
+    Returns
+    -------
+    pandas.DataFrame
+        The concatenated chunks
+    """
+    if schema is not None and columns is None:
+        columns = schema_columns(schema)
+
+    def read_chunks(encoding):
+        chunks = []
+        for chunk in read_csv_chunks(source, columns=columns, chunksize=chunksize, encoding=encoding):
+            if transform is not None:
+                chunk = transform(chunk)
+            if schema is not None:
+                chunk = apply_schema(chunk, schema, prune=False)
+            chunks.append(chunk)
+        return chunks
+
+    start = source.tell() if hasattr(source, 'read') else None
+    try:
+        chunks = read_chunks(encoding)
+    except UnicodeDecodeError:
+        if encoding is not None:
+            raise
+        # Non-UTF-8 bytes past the detection sample: read the whole file again as latin-1
+        if start is not None:
+            source.seek(start)
+        chunks = read_chunks('latin-1')
+
+    if not chunks:
+        return pd.DataFrame(columns=columns or [])
+    return concat_frames(chunks)
+
+
+def issue_name_from_filename(filename):
+    """Return the normalized issue name of a Screaming Frog issue export file"""
+    return os.path.basename(filename).split('.')[0]
+
+
+def _read_issue_file(source, columns, chunksize):
+    """Read one issue file, returning ``(DataFrame, None)`` or ``(None, error message)``"""
+    try:
+        return read_csv_streaming(source, columns=columns, chunksize=chunksize), None
+    except Exception as e:
+        return None, str(e)
+
+
+def list_issue_files(issues_dir):
+    """Return the paths of the issue CSV files in a directory, skipping macOS metadata files"""
+    return [
+        os.path.join(issues_dir, filename)
+        for filename in sorted(os.listdir(issues_dir))
+        if filename.lower().endswith('.csv') and not filename.startswith('._')
+    ]
+
+
+def read_issue_reports(sources, columns=ISSUE_COLUMNS, chunksize=DEFAULT_CHUNKSIZE, max_workers=None,
+                       executor='thread'):
+    """
+    Parse Screaming Frog "All Issues" bulk-export files, one DataFrame per file.
+
+    Files are parsed concurrently by a worker pool. Each frame keeps its file's
+    own header, so per-issue crawl columns are never padded with the columns of
+    other issues. A file that cannot be read is reported in ``errors`` without
+    stopping the batch.
+
+    Parameters
+    ----------
+    sources : list
+        Paths to the issue CSV files, or ``(filename, file-like)`` pairs
+    columns : list, optional
+        Columns to keep from each issue file; all columns are kept if None
+    chunksize : int, optional
+        Number of rows per chunk
+    max_workers : int, optional
+        Size of the worker pool; 1 reads the files sequentially
+    executor : str, optional
+        'thread' or 'process'; a process pool can only be used with file paths
+
+    Returns
+    -------
+    issue_frames : list
+        ``(normalized issue name, DataFrame)`` pairs in the order of ``sources``
+    errors : list
+        ``(filename, error message)`` pairs for files that could not be read
+    """
+    filenames = []
+    readable = []
+    for source in sources:
+        if isinstance(source, tuple):
+            filename, source = source
+        else:
+            filename = os.path.basename(source)
+
+        # Skip macOS hidden metadata files
+        if filename.startswith('._'):
+            continue
+        filenames.append(filename)
+        readable.append(source)
+
+    if max_workers == 1 or len(readable) <= 1:
+        results = [_read_issue_file(source, columns, chunksize) for source in readable]
+    else:
+        pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        with pool_class(max_workers=max_workers) as pool:
+            results = list(pool.map(_read_issue_file, readable,
+                                    [columns] * len(readable), [chunksize] * len(readable)))
+
+    issue_frames = []
+    errors = []
+    for filename, (issue_df, error) in zip(filenames, results):
+        if error is not None:
+            errors.append((filename, error))
+            continue
+        issue_frames.append((issue_name_from_filename(filename), issue_df))
+    return issue_frames, errors
+
+
+def issues_from_frames(issue_frames, columns=None):
+    """
+    Concatenate per-file issue frames into a single URL-level DataFrame.
+
+    The 'issue' column is built as a categorical from per-file codes, so the issue
+    name is never repeated as a string per row, and 'Address' is categorical too
+    since a URL appears in every issue it has.
+
+    Parameters
+    ----------
+    issue_frames : list
+        ``(normalized issue name, DataFrame)`` pairs returned by :func:`read_issue_reports`
+    columns : list, optional
+        Columns to keep from each frame (when present); the union of all columns if None
+
+    Returns
+    -------
+    pandas.DataFrame
+        Concatenated issues data with a categorical 'issue' column
+    """
+    if not issue_frames:
+        return pd.DataFrame(columns=(columns or ISSUE_COLUMNS) + ['issue'])
+
+    issue_names = [issue for issue, _ in issue_frames]
+    frames = [frame for _, frame in issue_frames]
+    if columns is not None:
+        frames = [frame[[col for col in columns if col in frame.columns]] for frame in frames]
+    issues_df = concat_frames(frames)
+    categories = pd.unique(pd.Series(issue_names))
+    file_codes = pd.Index(categories).get_indexer(issue_names)
+    codes = np.repeat(file_codes, [len(frame) for frame in frames])
+    issues_df['issue'] = pd.Categorical.from_codes(codes, categories=categories)
+
+    return apply_schema(issues_df.dropna(subset=['Address']), 'issues_df', prune=False)
+
+
+@profiled(rows=lambda result: len(result[0]))
+def load_issue_reports(sources, columns=ISSUE_COLUMNS, chunksize=DEFAULT_CHUNKSIZE, max_workers=None,
+                       executor='thread'):
+    """
+    Load Screaming Frog "All Issues" bulk-export files into a single URL-level DataFrame.
+
+    The files are parsed by :func:`read_issue_reports` and concatenated once
+    at the end by :func:`issues_from_frames`.
+
+    Parameters
+    ----------
+    sources : list
+        Paths to the issue CSV files, or ``(filename, file-like)`` pairs
+    columns : list, optional
+        Columns to keep from each issue file; the union of all columns is kept if None
+    chunksize : int, optional
+        Number of rows per chunk
+    max_workers : int, optional
+        Size of the worker pool; 1 reads the files sequentially
+    executor : str, optional
+        'thread' or 'process'; a process pool can only be used with file paths
+
+    Returns
+    -------
+    issues_df : pandas.DataFrame
+        Concatenated issues data with a categorical 'issue' column
+    errors : list
+        ``(filename, error message)`` pairs for files that could not be read
+    """
+    issue_frames, errors = read_issue_reports(sources, columns=columns, chunksize=chunksize,
+                                              max_workers=max_workers, executor=executor)
+    return issues_from_frames(issue_frames, columns=columns), errors
+
+
+def read_issues_dir(issues_dir, **kwargs):
+    """
+    Parse every issue CSV in a directory, one frame per file (see :func:`read_issue_reports`).
+
+    Parameters
+    ----------
+    issues_dir : str
+        Directory of Screaming Frog issue exports
+    **kwargs
+        Passed to :func:`read_issue_reports`
+
+    Returns
+    -------
+    issue_frames : list
+        ``(normalized issue name, DataFrame)`` pairs
+    errors : list
+        ``(filename, error message)`` pairs for files that could not be read
+    """
+    return read_issue_reports(list_issue_files(issues_dir), **kwargs)
+
+
+def load_issues_dir(issues_dir, **kwargs):
+    """
+    Load every issue CSV in a directory (see :func:`load_issue_reports`).
+
+    Parameters
+    ----------
+    issues_dir : str
+        Directory of Screaming Frog issue exports
+    **kwargs
+        Passed to :func:`load_issue_reports`
+
+    Returns
+    -------
+    issues_df : pandas.DataFrame
+        Concatenated issues data with a categorical 'issue' column
+    errors : list
+        ``(filename, error message)`` pairs for files that could not be read
+    """
+    return load_issue_reports(list_issue_files(issues_dir), **kwargs)
+
+
+@profiled()
+def load_gsc(source, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Load the Screaming Frog search_console_all export, keeping only the metric columns.
+
+    Parameters
+    ----------
+    source : str or file-like
+        Path to the file or a binary file-like object
+    chunksize : int, optional
+        Number of rows per chunk
+
+    Returns
+    -------
+    pandas.DataFrame
+        GSC data with Address, Clicks, Impressions, CTR and Position columns
+    """
+    return read_csv_streaming(source, chunksize=chunksize, schema='gsc_df')
+
+
+@profiled()
+def load_issues_overview(source, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Load the Screaming Frog issues_overview_report export, keeping only the columns the audit uses.
+
+    Parameters
+    ----------
+    source : str or file-like
+        Path to the file or a binary file-like object
+    chunksize : int, optional
+        Number of rows per chunk
+
+    Returns
+    -------
+    pandas.DataFrame
+        Issue names, types, priorities, URL counts and share of crawled URLs
+    """
+    return read_csv_streaming(source, chunksize=chunksize, schema='issues_report')
+
+
+@profiled(rows=lambda result: len(result[0]))
+def load_inlinks(source, chunksize=DEFAULT_CHUNKSIZE, keep_successful=False):
+    """
+    Stream the all_inlinks export, counting links per status group as it goes.
+
+    Only non-successful (non-2xx) links are kept by default, since the successful
+    ones are only needed for the status distribution and are the bulk of the file.
+
+    Parameters
+    ----------
+    source : str or file-like
+        Path to the file or a binary file-like object
+    chunksize : int, optional
+        Number of rows per chunk
+    keep_successful : bool, optional
+        Keep 2xx links in the returned DataFrame
+
+    Returns
+    -------
+    inlinks_df : pandas.DataFrame
+        Internal links restricted to ``INLINKS_COLUMNS``
+    status_counts : pandas.Series
+        Number of links per status class (first digit of the status code)
+    """
+    status_counts = []
+
+    def _aggregate(chunk):
+        status_code = pd.to_numeric(chunk['Status Code'], errors='coerce').fillna(0).astype('int64')
+        status_class = status_code // 100
+        status_counts.append(status_class.value_counts())
+        if keep_successful:
+            return chunk
+        return chunk[status_class != 2]
+
+    inlinks_df = read_csv_streaming(source, chunksize=chunksize, transform=_aggregate, schema='all_inlinks')
+
+    if status_counts:
+        status_counts = pd.concat(status_counts).groupby(level=0).sum().sort_index()
+    else:
+        status_counts = pd.Series(dtype='int64')
+    status_counts.index.name = 'status_class'
+    return inlinks_df, status_counts
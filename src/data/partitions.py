@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from ..utils.profiling import profiled
+
+
+class IssuePartitions:
+    """
+    URL-level issues data partitioned by issue.
+
+    The data is sorted once by issue and, within each issue, by ``sort_by``
+    descending, and the start/end offset of each issue is recorded. Looking up an
+    issue is then a slice instead of a filter over the whole table.
+
+    Parameters
+    ----------
+    issues_df : pandas.DataFrame
+        URL-level issues data with an 'issue' column
+    sort_by : str, optional
+        Column to sort rows by (descending, missing values last) within each issue
+    """
+
+    def __init__(self, issues_df, sort_by='Clicks_gsc'):
+        codes, issues = pd.factorize(issues_df['issue'])
+        keys = [codes]
+        if sort_by is not None and sort_by in issues_df.columns:
+            # np.lexsort sorts by the last key first; NaN sorts last
+            keys.insert(0, -issues_df[sort_by].to_numpy(dtype=np.float64))
+        order = np.lexsort(keys)
+
+        self.sort_by = sort_by
+        self.data = issues_df.iloc[order]
+        sorted_codes = codes[order]
+        sizes = np.bincount(sorted_codes[sorted_codes >= 0], minlength=len(issues))
+        ends = np.cumsum(sizes)
+        # Rows with a missing issue (code -1) sort first and are skipped
+        offset = int((codes < 0).sum())
+        self._offsets = {
+            issue: (offset + int(end - size), offset + int(end))
+            for issue, size, end in zip(issues, sizes, ends)
+        }
+
+    def __contains__(self, issue):
+        return issue in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def size(self, issue):
+        """Return the number of rows for an issue"""
+        start, end = self._offsets.get(issue, (0, 0))
+        return end - start
+
+    def get(self, issue):
+        """
+        Return the rows of an issue, sorted by ``sort_by`` descending.
+
+        Parameters
+        ----------
+        issue : str
+            Normalized issue name
+
+        Returns
+        -------
+        pandas.DataFrame
+            Rows for the issue (empty if the issue is unknown)
+        """
+        start, end = self._offsets.get(issue, (0, 0))
+        return self.data.iloc[start:end]
+
+
+@profiled(rows=lambda partitions: len(partitions.data))
+def partition_issues(issues_df, sort_by='Clicks_gsc'):
+    """
+    Partition URL-level issues data by issue once, for reuse by exports and drill-downs.
+
+    Parameters
+    ----------
+    issues_df : pandas.DataFrame
+        URL-level issues data with an 'issue' column
+    sort_by : str, optional
+        Column to sort rows by (descending) within each issue
+
+    Returns
+    -------
+    IssuePartitions
+        The partitioned data
+    """
+    return IssuePartitions(issues_df, sort_by=sort_by)
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Columns each input is held with and their dtypes. Strings repeated across
+# rows are categoricals and 'integer' columns are downcast to the smallest
+# integer type holding their values. Metrics stay float64: they are summed per
+# issue and exported, where float32 loses integer precision past 2**24 and
+# turns decimals such as 48.02 into 48.02000045776367.
+SCHEMAS = {
+    'issues_df': {
+        'Address': 'category',
+        'issue': 'category'
+    },
+    'gsc_df': {
+        'Address': 'object',
+        'Clicks': 'integer',
+        'Impressions': 'integer',
+        'CTR': 'float64',
+        'Position': 'float64'
+    },
+    'issues_report': {
+        'Issue Name': 'object',
+        'Issue Type': 'category',
+        'Issue Priority': 'category',
+        'URLs': 'integer',
+        '% of Total': 'float64'
+    },
+    'all_inlinks': {
+        'Type': 'category',
+        'Source': 'category',
+        'Destination': 'category',
+        'Anchor': 'category',
+        'Status Code': 'integer'
+    },
+    # URL-level issues merged with GSC metrics (see merge_gsc_metrics)
+    'merged_issues': {
+        'Address': 'category',
+        'issue': 'category',
+        'Clicks_gsc': 'float64',
+        'Impressions_gsc': 'float64',
+        'CTR_gsc': 'float64',
+        'Position_gsc': 'float64'
+    }
+}
+
+
+def schema_columns(name):
+    """Return the columns declared for an input"""
+    return list(SCHEMAS[name])
+
+
+def category_columns(name):
+    """Return the columns an input holds as categoricals"""
+    return [col for col, dtype in SCHEMAS[name].items() if dtype == 'category']
+
+
+def _cast(series, dtype):
+    """Cast a column to a schema dtype"""
+    if dtype == 'category':
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    if dtype == 'object':
+        return series
+    values = pd.to_numeric(series, errors='coerce')
+    if dtype == 'integer':
+        # Missing values cannot be held by a plain integer column
+        if values.isna().any():
+            return values.astype(np.float64)
+        return pd.to_numeric(values, downcast='integer')
+    return values.astype(dtype)
+
+
+def apply_schema(df, name, prune=True):
+    """
+    Cast an input to its declared dtypes, dropping undeclared columns.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input data (or a chunk of it)
+    name : str
+        Key of the input in ``SCHEMAS``
+    prune : bool, optional
+        Drop the columns not declared for the input
+
+    Returns
+    -------
+    pandas.DataFrame
+        The input restricted to (and cast to) its schema; declared columns
+        missing from ``df`` are ignored
+    """
+    schema = SCHEMAS[name]
+    if prune:
+        df = df[[col for col in schema if col in df.columns]]
+    cast = {col: _cast(df[col], dtype) for col, dtype in schema.items() if col in df.columns}
+    return df.assign(**cast) if cast else df
+
+
+def concat_frames(frames):
+    """
+    Concatenate frames, keeping the union of their columns and categoricals categorical.
+
+    ``pandas.concat`` falls back to object for categoricals whose categories
+    differ between frames; columns that are categorical in every frame are
+    combined with ``union_categoricals`` instead. Columns missing from some
+    frames are kept and hold missing values there.
+
+    Parameters
+    ----------
+    frames : list
+        DataFrames to concatenate
+
+    Returns
+    -------
+    pandas.DataFrame
+        The concatenated frames with a fresh index, columns in order of first appearance
+    """
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    order = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    columns = {}
+    for col in order:
+        if all(col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            columns[col] = union_categoricals([frame[col] for frame in frames])
+    df = pd.concat([frame.drop(columns=list(columns)) for frame in frames], ignore_index=True)
+    for col, values in columns.items():
+        df[col] = values
+    return df[order]
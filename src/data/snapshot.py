@@ -0,0 +1,156 @@
+import os
+import numpy as np
+import pandas as pd
+from .cleaning import clean_data
+from .scoring import label_data
+from .store import has_crawl_store, load_crawl_store, save_crawl_store
+
+SNAPSHOT_FRAMES = ['issues_group']
+# Per-issue aggregates compared with the baseline: an issue changed when any of them differs
+AGGREGATE_COLUMNS = ['Address', 'Clicks_gsc', 'Impressions_gsc', 'CTR_gsc', 'Position_gsc']
+
+
+def save_snapshot(directory, audit):
+    """
+    Save the scored issues of an audit run as the baseline for the next run.
+
+    Parameters
+    ----------
+    directory : str
+        Snapshot directory
+    audit : dict
+        Result of :func:`incremental_audit` (or a dict with its 'issues_group')
+
+    Returns
+    -------
+    str
+        The snapshot directory
+    """
+    return save_crawl_store(directory, {'issues_group': audit['issues_group']})
+
+
+def load_snapshot(directory):
+    """
+    Load a baseline saved with :func:`save_snapshot`.
+
+    Parameters
+    ----------
+    directory : str
+        Snapshot directory
+
+    Returns
+    -------
+    dict or None
+        The baseline frames, or None if there is no snapshot in ``directory``
+    """
+    if not os.path.isdir(directory) or not has_crawl_store(directory, SNAPSHOT_FRAMES):
+        return None
+    return load_crawl_store(directory, SNAPSHOT_FRAMES)
+
+
+def changed_issues(issues_group, baseline_group):
+    """
+    Return the issues of both runs whose aggregates differ.
+
+    Parameters
+    ----------
+    issues_group : pandas.DataFrame
+        Scored issues of the current run
+    baseline_group : pandas.DataFrame
+        Scored issues of the baseline run
+
+    Returns
+    -------
+    set
+        Issues whose URL count or GSC aggregates changed
+    """
+    after = issues_group.astype({'issue': str}).set_index('issue')[AGGREGATE_COLUMNS]
+    before = baseline_group.astype({'issue': str}).set_index('issue')[AGGREGATE_COLUMNS]
+    common = after.index.intersection(before.index)
+    after, before = after.loc[common].to_numpy(np.float64), before.loc[common].to_numpy(np.float64)
+    # Missing metrics (issues without any GSC data) compare equal
+    differs = ~((after == before) | (np.isnan(after) & np.isnan(before)))
+    return set(common[differs.any(axis=1)])
+
+
+def compare_issue_groups(issues_group, baseline_group):
+    """
+    List new, resolved and changed issues between two scored runs.
+
+    Parameters
+    ----------
+    issues_group : pandas.DataFrame
+        Scored issues of the current run
+    baseline_group : pandas.DataFrame
+        Scored issues of the baseline run
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per issue with its 'Status' (new, resolved, changed or unchanged),
+        URL counts and Impact Scores before and after
+    """
+    changed = changed_issues(issues_group, baseline_group)
+    columns = ['issue', 'Issue Name', 'Address', 'Clicks_gsc', 'Impact_Score', 'Impact_Score_Quadrant']
+    before = baseline_group[columns].astype({'issue': str})
+    after = issues_group[columns].astype({'issue': str})
+    changes = before.merge(after,
+                           how='outer',
+                           on='issue',
+                           suffixes=('_before', '_after'),
+                           indicator=True)
+    changes['Issue Name'] = changes['Issue Name_after'].fillna(changes['Issue Name_before'])
+    changes['Status'] = np.select(
+        [changes['_merge'] == 'right_only',
+         changes['_merge'] == 'left_only',
+         changes['issue'].isin(changed)],
+        ['new', 'resolved', 'changed'],
+        default='unchanged'
+    )
+    changes['Impact_Score_change'] = changes['Impact_Score_after'].fillna(0) - changes['Impact_Score_before'].fillna(0)
+    changes = changes.rename(columns={'Address_before': 'URLs_before', 'Address_after': 'URLs_after'})
+
+    return changes[[
+        'Issue Name', 'issue', 'Status', 'URLs_before', 'URLs_after', 'Clicks_gsc_before', 'Clicks_gsc_after',
+        'Impact_Score_before', 'Impact_Score_after', 'Impact_Score_change',
+        'Impact_Score_Quadrant_before', 'Impact_Score_Quadrant_after'
+    ]].sort_values('Impact_Score_change', key=abs, ascending=False, ignore_index=True)
+
+
+def incremental_audit(issues_df, gsc_df, issues_report, snapshot=None):
+    """
+    Run clean_data and label_data and diff the scored issues against a baseline.
+
+    Every issue is re-aggregated: a single groupby is cheaper than finding the
+    issues whose URL-level rows changed (hashing the URLs alone costs more).
+    Changed issues are those whose aggregates differ from the baseline.
+
+    Parameters
+    ----------
+    issues_df : pandas.DataFrame
+        URL-level issues data of the new crawl
+    gsc_df : pandas.DataFrame or GscIndex
+        GSC data of the new crawl
+    issues_report : pandas.DataFrame
+        Issues overview report of the new crawl
+    snapshot : dict, optional
+        Baseline loaded with :func:`load_snapshot`; nothing is diffed if None
+
+    Returns
+    -------
+    dict
+        'issues_group' and 'issues_df' as returned by clean_data/label_data, and
+        'changes' (see :func:`compare_issue_groups`, None without a snapshot)
+    """
+    issues_group, issues_df = clean_data(issues_df, gsc_df, issues_report)
+    issues_group = label_data(issues_group)
+
+    changes = None
+    if snapshot is not None:
+        changes = compare_issue_groups(issues_group, snapshot['issues_group'])
+
+    return {
+        'issues_group': issues_group,
+        'issues_df': issues_df,
+        'changes': changes
+    }
@@ -0,0 +1,176 @@
+import os
+import shutil
+import time
+import pandas as pd
+from .schema import category_columns
+from ..utils.cache import cache_dir
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+STORE_MAX_MB_ENV = 'SF_AUDIT_STORE_MB'
+STORE_MAX_DAYS_ENV = 'SF_AUDIT_STORE_DAYS'
+# Stored crawls are evicted, least recently used first, beyond this total size or age
+DEFAULT_STORE_MAX_MB = 2048
+DEFAULT_STORE_MAX_DAYS = 7
+
+# Repeated string columns stored as categoricals (dictionary-encoded in Parquet)
+CATEGORY_COLUMNS = {
+    'issues_df': category_columns('issues_df'),
+    'issues_report': category_columns('issues_report'),
+    'all_inlinks': category_columns('all_inlinks') + ['status_group']
+}
+
+
+def crawl_store_path(key):
+    """Return the store directory for a crawl identified by a content digest"""
+    return os.path.join(cache_dir('crawls'), key)
+
+
+def store_limits():
+    """Return the total size in bytes and the age in seconds beyond which stored crawls are evicted (None: no limit)"""
+    max_mb = os.environ.get(STORE_MAX_MB_ENV)
+    max_days = os.environ.get(STORE_MAX_DAYS_ENV)
+    max_mb = float(max_mb) if max_mb else DEFAULT_STORE_MAX_MB
+    max_days = float(max_days) if max_days else DEFAULT_STORE_MAX_DAYS
+    return (int(max_mb * 1024 * 1024) if max_mb > 0 else None,
+            max_days * 24 * 3600 if max_days > 0 else None)
+
+
+def _store_size(directory):
+    """Return the size in bytes of the files of a store"""
+    with os.scandir(directory) as entries:
+        return sum(entry.stat().st_size for entry in entries if entry.is_file())
+
+
+def evict_crawl_stores(keep=None, max_bytes=None, max_age=None, root=None):
+    """
+    Remove stored crawls beyond a total size or age, least recently used first.
+
+    A store's last use is the modification time of its directory, which
+    :func:`save_crawl_store` and :func:`load_crawl_store` update.
+
+    Parameters
+    ----------
+    keep : str, optional
+        Store directory never removed (e.g. the one just written)
+    max_bytes : int, optional
+        Total size the stores may use (0: no limit); defaults to :func:`store_limits`
+    max_age : float, optional
+        Seconds since their last use after which stores are removed (0: no limit);
+        defaults to :func:`store_limits`
+    root : str, optional
+        Directory holding the stores; the 'crawls' cache directory by default
+
+    Returns
+    -------
+    list
+        The removed store directories
+    """
+    default_bytes, default_age = store_limits()
+    max_bytes = (default_bytes if max_bytes is None else max_bytes) or None
+    max_age = (default_age if max_age is None else max_age) or None
+    root = root or cache_dir('crawls')
+    keep = os.path.abspath(keep) if keep else None
+
+    stores = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir() and os.path.abspath(entry.path) != keep:
+                stores.append((entry.stat().st_mtime, _store_size(entry.path), entry.path))
+    stores.sort()
+    total = sum(size for _, size, _ in stores) + (_store_size(keep) if keep and os.path.isdir(keep) else 0)
+
+    removed = []
+    now = time.time()
+    for last_used, size, path in stores:
+        expired = max_age is not None and now - last_used > max_age
+        over_size = max_bytes is not None and total > max_bytes
+        if not (expired or over_size):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed.append(path)
+    return removed
+
+
+def has_crawl_store(directory, names):
+    """Check whether a store contains all the given frames"""
+    return all(os.path.exists(os.path.join(directory, f'{name}.parquet')) for name in names)
+
+
+def to_categories(df, columns):
+    """
+    Convert repeated string columns to the category dtype.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame to convert
+    columns : list
+        Columns to convert; columns missing from ``df`` are ignored
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with the converted columns
+    """
+    columns = [col for col in columns if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if not columns:
+        return df
+    return df.astype({col: 'category' for col in columns})
+
+
+def save_crawl_store(directory, frames):
+    """
+    Write parsed crawl data to a columnar Parquet store.
+
+    Parameters
+    ----------
+    directory : str
+        Store directory
+    frames : dict
+        DataFrames keyed by name (e.g. 'issues_df', 'gsc_df', 'issues_report', 'all_inlinks')
+
+    Returns
+    -------
+    str
+        The store directory
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, df in frames.items():
+        df = to_categories(df, CATEGORY_COLUMNS.get(name, []))
+        path = os.path.join(directory, f'{name}.parquet')
+        # Write next to the target first so an interrupted run never leaves a partial file
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        df.to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, path)
+    os.utime(directory)
+    return directory
+
+
+def load_crawl_store(directory, names):
+    """
+    Load parsed crawl data from a Parquet store, memory-mapping the files.
+
+    Parameters
+    ----------
+    directory : str
+        Store directory
+    names : list
+        Names of the frames to load
+
+    Returns
+    -------
+    dict
+        DataFrames keyed by name; categorical columns are restored as categoricals
+    """
+    # Marks the store as recently used for evict_crawl_stores
+    os.utime(directory)
+    return {
+        name: pd.read_parquet(os.path.join(directory, f'{name}.parquet'), engine='pyarrow', memory_map=True)
+        for name in names
+    }
@@ -0,0 +1,153 @@
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from ..utils.cache import cache_dir
+
+SPILL_THRESHOLD_ENV = 'SF_AUDIT_SPILL_MB'
+# Uploads larger than this many MB are parsed from a temporary file instead of memory
+DEFAULT_SPILL_THRESHOLD_MB = 1024
+SPILL_BLOCK_SIZE = 16 * 1024 * 1024
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+def spill_threshold():
+    """Return the upload size in bytes above which uploads are spilled to disk, or None to never spill"""
+    value = os.environ.get(SPILL_THRESHOLD_ENV)
+    megabytes = float(value) if value else DEFAULT_SPILL_THRESHOLD_MB
+    if megabytes <= 0:
+        return None
+    return int(megabytes * 1024 * 1024)
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only binary file over an in-memory buffer.
+
+    Reads copy only the requested block out of the buffer, and each reader has
+    its own position, so several stages can parse the same upload without
+    duplicating it or rewinding each other.
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        The content, e.g. the memoryview of an upload
+    name : str, optional
+        Name reported to the parsers
+    """
+
+    def __init__(self, buffer, name=None):
+        super().__init__()
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        end = min(self._position + len(b), len(self._view))
+        n = end - self._position
+        b[:n] = self._view[self._position:end]
+        self._position = end
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def spill_to_disk(buffer, name=None, directory=None):
+    """
+    Write a buffer to a temporary file block by block.
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        Content to write
+    name : str, optional
+        Original file name, used as the suffix of the temporary file
+    directory : str, optional
+        Where the file is written; defaults to the 'uploads' cache directory
+
+    Returns
+    -------
+    str
+        Path of the temporary file; the caller removes it
+    """
+    view = memoryview(buffer).cast('B')
+    suffix = f"-{os.path.basename(name)}" if name else ''
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=directory or cache_dir('uploads'))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for start in range(0, len(view), SPILL_BLOCK_SIZE):
+                f.write(view[start:start + SPILL_BLOCK_SIZE])
+    except BaseException:
+        os.remove(path)
+        raise
+    finally:
+        view.release()
+    return path
+
+
+@contextmanager
+def open_upload(upload, threshold=None):
+    """
+    Open an uploaded file for parsing without copying its content.
+
+    Small uploads are read straight from their in-memory buffer; uploads above
+    ``threshold`` bytes are spilled to a temporary file (removed on exit) and
+    parsed from its path. Objects without a buffer (e.g. open files) are
+    rewound and returned as they are.
+
+    Parameters
+    ----------
+    upload : file-like
+        A Streamlit ``UploadedFile``, ``io.BytesIO`` or any binary file object
+    threshold : int, optional
+        Size in bytes above which the upload is spilled; defaults to :func:`spill_threshold`
+
+    Yields
+    ------
+    file-like or str
+        A binary reader over the upload, or the path of its spilled copy
+    """
+    if not hasattr(upload, 'getbuffer'):
+        upload.seek(0)
+        yield upload
+        return
+
+    if threshold is None:
+        threshold = spill_threshold()
+    name = getattr(upload, 'name', None)
+    with upload.getbuffer() as buffer:
+        if threshold is not None and buffer.nbytes > threshold:
+            path = spill_to_disk(buffer, name)
+            reader = None
+        else:
+            path = None
+            reader = io.BufferedReader(BufferReader(buffer, name), buffer_size=READ_BUFFER_SIZE)
+        try:
+            yield path if path is not None else reader
+        finally:
+            if reader is not None:
+                reader.close()
+            if path is not None:
+                os.remove(path)
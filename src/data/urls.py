@@ -0,0 +1,231 @@
+import threading
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Query parameters that only track the visit and never change the page
+TRACKING_PARAMETERS = frozenset([
+    'gclid', 'gbraid', 'wbraid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'twclid', 'ttclid', 'li_fat_id',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'igshid', 'srsltid'
+])
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+# Most crawled URLs have this shape: lowercase http(s) scheme and host without a
+# port, no empty path segment, no query, fragment or whitespace. Their canonical
+# form only drops the trailing slash (RE2 syntax, used by pyarrow).
+SIMPLE_URL = r'^https?://[a-z0-9.-]+/(?:[^/?#\s]+/)*[^/?#\s]*$'
+
+
+def _is_tracking(parameter):
+    """Check whether a query parameter (``name`` or ``name=value``) is a tracking parameter"""
+    name = parameter.split('=', 1)[0].lower()
+    return name in TRACKING_PARAMETERS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url):
+    """
+    Return the canonical form of a URL used as a join key.
+
+    The scheme and host are lowercased, default ports, fragments, tracking
+    parameters and trailing slashes are dropped (the root path stays '/').
+    The path and the remaining query are kept as they are, since both are
+    case-sensitive.
+
+    Parameters
+    ----------
+    url : str
+        URL to canonicalize; anything else (e.g. NaN) is returned unchanged
+
+    Returns
+    -------
+    str
+        The canonical URL
+    """
+    if not isinstance(url, str):
+        return url
+    # Plain string slicing rather than urlsplit: this runs once per distinct URL of a crawl
+    url = url.strip()
+    if '#' in url:
+        url = url.split('#', 1)[0]
+
+    prefix = ''
+    authority = url.find('://')
+    if authority > 0 and url.find('/', 0, authority) == -1 and url.find('?', 0, authority) == -1:
+        host_end = url.find('/', authority + 3)
+        query_start = url.find('?', authority + 3)
+        if host_end == -1 or -1 < query_start < host_end:
+            host_end = len(url) if query_start == -1 else query_start
+        prefix = url[:host_end].lower()
+        if ':' in prefix[authority + 3:]:
+            port = DEFAULT_PORTS.get(prefix[:authority])
+            if port and prefix.endswith(port):
+                prefix = prefix[:-len(port)]
+        url = url[host_end:]
+
+    if '?' in url:
+        path, _, query = url.partition('?')
+        query = '&'.join(parameter for parameter in query.split('&') if parameter and not _is_tracking(parameter))
+    else:
+        path, query = url, ''
+    stripped = path.rstrip('/')
+    if not stripped and (prefix or path):
+        stripped = '/'
+    return f'{prefix}{stripped}?{query}' if query else prefix + stripped
+
+
+def canonicalize_urls(urls):
+    """
+    Canonicalize many URLs (see :func:`canonicalize_url`).
+
+    With pyarrow installed, URLs of the common simple shape are canonicalized
+    by vectorized string kernels and only the others one by one.
+
+    Parameters
+    ----------
+    urls : array-like
+        URLs to canonicalize; values that are not strings are kept as they are
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array of canonical URLs aligned with ``urls``
+    """
+    urls = np.asarray(urls, dtype=object)
+    if not ARROW_AVAILABLE:
+        return np.array([canonicalize_url(url) for url in urls], dtype=object)
+
+    canonical = urls.copy()
+    is_str = np.fromiter((type(url) is str for url in urls), dtype=bool, count=len(urls))
+    strings = urls[is_str]
+    if not len(strings):
+        return canonical
+    simple = pc.match_substring_regex(pa.array(strings, type=pa.string()), pattern=SIMPLE_URL)
+    simple = simple.to_numpy(zero_copy_only=False)
+    values = np.empty(len(strings), dtype=object)
+    if simple.any():
+        simple_urls = pa.array(strings[simple], type=pa.string())
+        # A simple URL has at most one trailing slash; the root 'scheme://host/' keeps it
+        trailing = pc.and_(pc.ends_with(simple_urls, '/'), pc.greater(pc.count_substring(simple_urls, '/'), 3))
+        trimmed = pc.if_else(trailing, pc.utf8_slice_codeunits(simple_urls, 0, -1), simple_urls)
+        values[simple] = trimmed.to_numpy(zero_copy_only=False)
+    values[~simple] = [canonicalize_url(url) for url in strings[~simple]]
+    canonical[is_str] = values
+    return canonical
+
+
+class UrlInterner:
+    """
+    Map URLs to integer ids, one id per canonical URL.
+
+    Each distinct URL string of a frame is canonicalized and hashed once; joins
+    between frames interned with the same interner then compare integer ids.
+    Safe to share between threads. Once :meth:`freeze` is called the interner
+    is read-only: lookups neither assign ids nor record the strings they see,
+    so a frozen interner can be cached and shared between sessions as is.
+
+    Parameters
+    ----------
+    canonical : bool, optional
+        Intern the canonical form of each URL (see :func:`canonicalize_url`)
+        rather than the URL as exported
+    """
+
+    def __init__(self, canonical=True):
+        self.canonical = canonical
+        self.frozen = False
+        self._lock = threading.Lock()
+        self._keys = pd.Index([], dtype=object)
+        # URL strings as seen and their ids, so a string repeated across frames is canonicalized once
+        self._raw = pd.Index([], dtype=object)
+        self._raw_ids = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def freeze(self):
+        """Make the interner read-only; returns the interner"""
+        with self._lock:
+            self.frozen = True
+        return self
+
+    def url(self, url_id):
+        """Return the (canonical) URL of an id"""
+        return self._keys[url_id]
+
+    def _unique_ids(self, urls, add):
+        """Return the id of each of ``urls`` (distinct values), -1 for unknown URLs if not ``add``"""
+        with self._lock:
+            positions = self._raw.get_indexer(urls)
+            raw_ids = self._raw_ids
+        ids = np.append(raw_ids, -1)[positions]
+        unseen = np.flatnonzero(ids < 0)
+        if not len(unseen):
+            return ids
+
+        raw = urls[unseen]
+        keys = canonicalize_urls(raw) if self.canonical else raw
+        if self.frozen:
+            # The keys and raw strings are never replaced once frozen, so no lock is needed
+            ids[unseen] = self._keys.get_indexer(keys)
+            return ids
+        with self._lock:
+            key_ids = self._keys.get_indexer(keys)
+            # Frozen by another thread since the check above: resolve without recording
+            if not self.frozen:
+                new = key_ids < 0
+                if add and new.any():
+                    new_keys = pd.unique(keys[new])
+                    new_keys = new_keys[pd.notna(new_keys)]
+                    # Appending rebuilds the hash table once per interned batch, not per URL
+                    self._keys = self._keys.append(pd.Index(new_keys, dtype=object))
+                    key_ids[new] = self._keys.get_indexer(keys[new])
+                # Another thread may have recorded some of these strings meanwhile; the index must stay unique
+                known = (key_ids >= 0) & (self._raw.get_indexer(raw) < 0)
+                self._raw = self._raw.append(pd.Index(raw[known], dtype=object))
+                self._raw_ids = np.append(self._raw_ids, key_ids[known])
+        ids[unseen] = key_ids
+        return ids
+
+    def intern(self, urls, add=True):
+        """
+        Return the id of each URL.
+
+        Distinct values are resolved once (categorical input per category), so
+        the cost grows with the number of distinct URLs rather than rows.
+
+        Parameters
+        ----------
+        urls : array-like
+            URLs (Series, Categorical, Index or array)
+        add : bool, optional
+            Assign ids to URLs not seen before; otherwise they get -1
+
+        Raises
+        ------
+        RuntimeError
+            If ``add`` is true and the interner is frozen
+
+        Returns
+        -------
+        numpy.ndarray
+            int64 ids aligned with ``urls``; -1 for missing values
+        """
+        if add and self.frozen:
+            raise RuntimeError("Cannot add URLs to a frozen UrlInterner; intern with add=False")
+        values = urls.array if isinstance(urls, pd.Series) else urls
+        if isinstance(values, pd.Categorical):
+            codes, uniques = values.codes, values.categories
+        else:
+            if not isinstance(values, (np.ndarray, pd.Index, pd.api.extensions.ExtensionArray)):
+                values = np.asarray(values, dtype=object)
+            codes, uniques = pd.factorize(values)
+        ids = np.append(self._unique_ids(np.asarray(uniques, dtype=object), add), -1)
+        # Missing values (code -1) land on the trailing -1
+        return ids[codes]
@@ -0,0 +1,238 @@
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from .data import (
+    build_crawl_index,
+    build_gsc_index,
+    clean_data,
+    incremental_audit,
+    issues_from_frames,
+    label_data,
+    label_status_groups,
+    load_gsc,
+    load_inlinks,
+    load_issues_overview,
+    load_snapshot,
+    partition_issues,
+    read_issues_dir,
+    save_snapshot,
+    summarize_status_groups
+)
+from .utils import export_data, export_internal_links, export_streamlit_data
+from .utils.profiling import Profiler, profile_stage
+
+# File names of a Screaming Frog crawl folder, as exported
+ISSUES_OVERVIEW_FILE = 'issues_overview_report.csv'
+SEARCH_CONSOLE_FILE = 'search_console_all.csv'
+ALL_INLINKS_FILE = 'all_inlinks.csv'
+ISSUES_REPORTS_DIR = 'issues_reports'
+
+
+def find_crawl_files(crawl_dir):
+    """
+    Locate the exports of a Screaming Frog crawl folder.
+
+    Parameters
+    ----------
+    crawl_dir : str
+        Folder containing issues_overview_report.csv, search_console_all.csv,
+        an issues_reports/ directory and optionally all_inlinks.csv
+
+    Returns
+    -------
+    dict
+        Paths keyed by 'issues_overview', 'search_console', 'issues_reports' and
+        'all_inlinks' (None when the crawl has no inlinks export)
+
+    Raises
+    ------
+    FileNotFoundError
+        If a required export is missing
+    """
+    files = {
+        'issues_overview': os.path.join(crawl_dir, ISSUES_OVERVIEW_FILE),
+        'search_console': os.path.join(crawl_dir, SEARCH_CONSOLE_FILE),
+        'issues_reports': os.path.join(crawl_dir, ISSUES_REPORTS_DIR),
+        'all_inlinks': os.path.join(crawl_dir, ALL_INLINKS_FILE)
+    }
+    for name in ['issues_overview', 'search_console', 'issues_reports']:
+        if not os.path.exists(files[name]):
+            raise FileNotFoundError(f"Missing {os.path.basename(files[name])} in {crawl_dir}")
+    if not os.path.exists(files['all_inlinks']):
+        files['all_inlinks'] = None
+    return files
+
+
+def run_audit(crawl_dir, output_dir, perc_n=0.75, snapshot_dir=None, with_crawl_data=False, read_workers=None,
+              trace_memory=False):
+    """
+    Run the full audit for one crawl folder without Streamlit.
+
+    Writes the prioritized audit workbook, the scored issues as CSV, the internal
+    links report (when all_inlinks.csv is present), the changes against the
+    baseline snapshot (when one exists) and a timing report to ``output_dir``.
+
+    Parameters
+    ----------
+    crawl_dir : str
+        Screaming Frog crawl folder (see :func:`find_crawl_files`)
+    output_dir : str
+        Directory the results are written to
+    perc_n : float, optional
+        Percentile threshold for the prioritized audit export
+    snapshot_dir : str, optional
+        Baseline snapshot directory; the crawl is diffed against it if present and
+        the snapshot is then replaced by this run
+    with_crawl_data : bool, optional
+        Also write the per-priority workbook enriched with each issue's crawl columns
+    read_workers : int, optional
+        Size of the thread pool reading the issue exports
+    trace_memory : bool, optional
+        Also trace Python allocations per stage (see :class:`~src.utils.profiling.Profiler`)
+
+    Returns
+    -------
+    dict
+        The timing and memory report that is also written to ``timings.json``
+    """
+    profiler = Profiler(trace_memory=trace_memory)
+    with profiler.activate():
+        report = _run_audit_stages(crawl_dir, output_dir, perc_n, snapshot_dir, with_crawl_data, read_workers)
+    report = profiler.report(**report)
+    with open(os.path.join(output_dir, 'timings.json'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=str)
+    return report
+
+
+def _run_audit_stages(crawl_dir, output_dir, perc_n, snapshot_dir, with_crawl_data, read_workers):
+    """Run the stages of :func:`run_audit` under the active profiler and return the report metadata"""
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    files = find_crawl_files(crawl_dir)
+
+    with profile_stage('parse') as stage:
+        issues_report = load_issues_overview(files['issues_overview'])
+        gsc_index = build_gsc_index(load_gsc(files['search_console']))
+        # Only Address is concatenated; the crawl columns stay in their per-file frames
+        issue_frames, load_errors = read_issues_dir(files['issues_reports'],
+                                                    columns=None if with_crawl_data else ['Address'],
+                                                    max_workers=read_workers)
+        issues_df = issues_from_frames(issue_frames, columns=['Address'])
+        stage['rows'] = len(issues_df)
+    if issues_df.empty:
+        raise ValueError(f"No valid issue files could be processed in {files['issues_reports']}")
+
+    crawl_index = None
+    if with_crawl_data:
+        with profile_stage('crawl_index') as stage:
+            crawl_index = build_crawl_index(issue_frames)
+            stage['rows'] = len(crawl_index)
+    del issue_frames
+
+    snapshot = load_snapshot(snapshot_dir) if snapshot_dir else None
+    with profile_stage('clean_and_label') as stage:
+        changes = None
+        if snapshot is not None:
+            audit = incremental_audit(issues_df, gsc_index, issues_report, snapshot)
+            issues_group, issues_df, changes = audit['issues_group'], audit['issues_df'], audit['changes']
+        else:
+            issues_group, issues_df = clean_data(issues_df, gsc_index, issues_report)
+            issues_group = label_data(issues_group)
+        stage['rows'] = len(issues_group)
+
+    with profile_stage('export') as stage:
+        partitions = partition_issues(issues_df)
+        excel_data, exported_count, split_sheets = export_streamlit_data(issues_group, issues_df, perc_n,
+                                                                         partitions=partitions)
+        with open(os.path.join(output_dir, 'issues_analysis_results.xlsx'), 'wb') as f:
+            f.write(excel_data)
+        issues_group.to_csv(os.path.join(output_dir, 'issues_group.csv'), index=False)
+        if crawl_index is not None:
+            export_data(issues_group, issues_df, output_dir, partitions=partitions, crawl_index=crawl_index,
+                        show=False)
+        stage['rows'] = exported_count
+
+    if changes is not None:
+        changes.to_csv(os.path.join(output_dir, 'issue_changes.csv'), index=False)
+    if snapshot_dir:
+        with profile_stage('snapshot'):
+            save_snapshot(snapshot_dir, {'issues_group': issues_group})
+
+    if files['all_inlinks'] is not None:
+        with profile_stage('internal_links') as stage:
+            all_inlinks, _ = load_inlinks(files['all_inlinks'])
+            results = summarize_status_groups(label_status_groups(all_inlinks), gsc_index)
+            links_data, links_split_sheets = export_internal_links(results)
+            with open(os.path.join(output_dir, 'internal_links_analysis.xlsx'), 'wb') as f:
+                f.write(links_data)
+            split_sheets.update(links_split_sheets)
+            stage['rows'] = len(all_inlinks)
+
+    return {
+        'crawl_dir': os.path.abspath(crawl_dir),
+        'output_dir': os.path.abspath(output_dir),
+        'issues': len(issues_group),
+        'urls': len(issues_df),
+        'exported_issues': exported_count,
+        # Sheets over Excel's row limit, continued on further sheets
+        'split_sheets': [sheet_names[0] for sheet_names in split_sheets.values()],
+        'load_errors': [{'file': filename, 'error': error} for filename, error in load_errors],
+        'total_seconds': round(time.perf_counter() - started, 4)
+    }
+
+
+def _run_audit_safely(crawl_dir, output_dir, kwargs):
+    """Run one crawl, turning a failure into an error report so the batch continues"""
+    try:
+        return run_audit(crawl_dir, output_dir, **kwargs)
+    except Exception as e:
+        return {
+            'crawl_dir': os.path.abspath(crawl_dir),
+            'output_dir': os.path.abspath(output_dir),
+            'error': str(e),
+            'traceback': traceback.format_exc()
+        }
+
+
+def run_batch(crawl_dirs, output_root, max_workers=None, snapshot_root=None, **kwargs):
+    """
+    Run the audit for many crawl folders concurrently with a process pool.
+
+    Parameters
+    ----------
+    crawl_dirs : list
+        Crawl folders; each one's results go to ``output_root/<folder name>``
+    output_root : str
+        Root directory for the results
+    max_workers : int, optional
+        Number of worker processes
+    snapshot_root : str, optional
+        Root directory for baseline snapshots, kept per crawl as ``snapshot_root/<folder name>``
+    **kwargs
+        Passed to :func:`run_audit`
+
+    Returns
+    -------
+    list
+        One report per crawl, in the order of ``crawl_dirs``; failed crawls have an 'error' entry
+    """
+    jobs = []
+    for crawl_dir in crawl_dirs:
+        name = os.path.basename(os.path.normpath(crawl_dir))
+        crawl_kwargs = dict(kwargs)
+        if snapshot_root:
+            crawl_kwargs['snapshot_dir'] = os.path.join(snapshot_root, name)
+        jobs.append((crawl_dir, os.path.join(output_root, name), crawl_kwargs))
+
+    os.makedirs(output_root, exist_ok=True)
+    if max_workers == 1 or len(jobs) <= 1:
+        reports = [_run_audit_safely(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            reports = list(pool.map(_run_audit_safely, *zip(*jobs)))
+
+    with open(os.path.join(output_root, 'batch_report.json'), 'w', encoding='utf-8') as f:
+        json.dump(reports, f, indent=2, default=str)
+    return reports
@@ -1,9 +1,31 @@
 # src/utils/__init__.py
-from .export import export_data, export_streamlit_data
-from .embeddings import generate_embeddings
+from .export import export_data, export_internal_links, export_streamlit_data
+from .embeddings import generate_embeddings, encode_texts
+from .embedding_cache import EmbeddingCache
+from .excel import ExcelWorkbook
+from .kmeans import KSearchResult, search_k
+from .models import get_encoder, active_backend
+from .profiling import Profiler, profile_stage, profiled
+from .url_clustering import SimilarUrlIndex, UrlFeatures, build_url_features, cluster_urls, project_urls
 
 __all__ = [
     'export_data',
     'generate_embeddings',
-    'export_streamlit_data'
+    'encode_texts',
+    'export_streamlit_data',
+    'export_internal_links',
+    'EmbeddingCache',
+    'ExcelWorkbook',
+    'KSearchResult',
+    'search_k',
+    'get_encoder',
+    'active_backend',
+    'Profiler',
+    'profile_stage',
+    'profiled',
+    'SimilarUrlIndex',
+    'UrlFeatures',
+    'build_url_features',
+    'cluster_urls',
+    'project_urls'
 ]
\ No newline at end of file
@@ -0,0 +1,64 @@
+import hashlib
+import os
+
+CACHE_DIR_ENV = 'SF_AUDIT_CACHE_DIR'
+
+
+def cache_dir(*parts):
+    """
+    Return (and create) a directory under the application cache.
+
+    The cache root defaults to ``~/.cache/sf-audit`` and can be moved with the
+    ``SF_AUDIT_CACHE_DIR`` environment variable.
+
+    Parameters
+    ----------
+    *parts : str
+        Sub-directories below the cache root
+
+    Returns
+    -------
+    str
+        Path to the cache directory
+    """
+    root = os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser('~'), '.cache', 'sf-audit')
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def content_digest(*parts):
+    """
+    Return a stable hex digest of the given content.
+
+    Parameters
+    ----------
+    *parts : bytes, memoryview, str, int, float, None, list or tuple
+        Content to hash; lists and tuples are hashed element by element, so a
+        digest of digests can be used as the cache key of a downstream stage
+
+    Returns
+    -------
+    str
+        32-character hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    def _update(part):
+        if isinstance(part, (list, tuple)):
+            digest.update(b'[%d' % len(part))
+            for item in part:
+                _update(item)
+            digest.update(b']')
+            return
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            data = part
+        else:
+            data = repr(part).encode('utf-8')
+        # Length prefix keeps ('ab', 'c') and ('a', 'bc') apart
+        digest.update(b'%d:' % len(data))
+        digest.update(data)
+
+    for part in parts:
+        _update(part)
+    return digest.hexdigest()
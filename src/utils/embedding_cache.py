@@ -0,0 +1,126 @@
+import json
+import os
+import re
+import threading
+import numpy as np
+from .cache import cache_dir
+
+
+def normalize_text(text):
+    """Normalize an issue name for use as an embedding cache key"""
+    return re.sub(r'\s+', ' ', str(text)).strip()
+
+
+class EmbeddingCache:
+    """
+    On-disk store of embedding vectors for a single model.
+
+    Vectors are kept in a ``.npy`` file that is memory-mapped on load, next to a
+    JSON index mapping normalized text to its row in the array.
+
+    Parameters
+    ----------
+    model_name : str
+        Name of the model the vectors were produced with
+    directory : str, optional
+        Directory holding the cache files; defaults to the application cache
+    """
+
+    def __init__(self, model_name, directory=None):
+        self.model_name = model_name
+        self.directory = directory or cache_dir('embeddings')
+        slug = re.sub(r'[^\w.-]', '_', model_name)
+        self.vectors_path = os.path.join(self.directory, f'{slug}.npy')
+        self.index_path = os.path.join(self.directory, f'{slug}.json')
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._index = None
+
+    def _load(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        self._vectors = None
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                keys = json.load(f)
+            vectors = np.load(self.vectors_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return
+        # Only trust rows that have both a key and a vector
+        keys = keys[:len(vectors)]
+        self._index = {key: row for row, key in enumerate(keys)}
+        self._vectors = vectors
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._index)
+
+    def lookup(self, texts):
+        """
+        Look up cached vectors for a list of texts.
+
+        Parameters
+        ----------
+        texts : list
+            Texts to look up
+
+        Returns
+        -------
+        vectors : numpy.ndarray or None
+            Array with one row per text (rows of misses are zero), or None if nothing is cached
+        missing : list
+            Positions in ``texts`` that were not found in the cache
+        """
+        with self._lock:
+            self._load()
+            rows = [self._index.get(normalize_text(text)) for text in texts]
+            missing = [i for i, row in enumerate(rows) if row is None]
+            if self._vectors is None or len(missing) == len(texts):
+                return None, missing
+
+            vectors = np.zeros((len(texts), self._vectors.shape[1]), dtype=self._vectors.dtype)
+            hits = [i for i, row in enumerate(rows) if row is not None]
+            vectors[hits] = self._vectors[[rows[i] for i in hits]]
+            return vectors, missing
+
+    def add(self, texts, vectors):
+        """
+        Store vectors for texts that are not cached yet.
+
+        Parameters
+        ----------
+        texts : list
+            Texts the vectors were computed for
+        vectors : numpy.ndarray
+            Array with one row per text
+        """
+        with self._lock:
+            self._load()
+            vectors = np.asarray(vectors, dtype=np.float32)
+            new_rows = {}
+            for text, vector in zip(texts, vectors):
+                key = normalize_text(text)
+                if key not in self._index and key not in new_rows:
+                    new_rows[key] = vector
+            if not new_rows:
+                return
+
+            new_vectors = np.stack(list(new_rows.values()))
+            if self._vectors is not None:
+                new_vectors = np.concatenate([np.asarray(self._vectors), new_vectors])
+            keys = sorted(self._index, key=self._index.get) + list(new_rows)
+
+            # Write to temporary files first so readers never see a partial cache
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_vectors = f'{self.vectors_path}.{os.getpid()}.tmp.npy'
+            tmp_index = f'{self.index_path}.{os.getpid()}.tmp'
+            np.save(tmp_vectors, new_vectors)
+            with open(tmp_index, 'w', encoding='utf-8') as f:
+                json.dump(keys, f)
+            os.replace(tmp_vectors, self.vectors_path)
+            os.replace(tmp_index, self.index_path)
+
+            self._index = None
+            self._load()
@@ -1,10 +1,111 @@
 import numpy as np
 import os
 import logging
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
+from .profiling import profiled
+from .models import get_encoder, get_embedding_cache, get_vectorizer, resolve_model, set_active_backend
 
-def generate_embeddings(issues_list):
+DEFAULT_BATCH_SIZE = 64
+# Dimension of the default transformer's embeddings, matched by the TF-IDF fallback
+EMBEDDING_DIM = 384
+# Below this many texts the start-up cost of a process pool outweighs the gain
+PROCESS_POOL_MIN_TEXTS = 20_000
+
+
+def encode_texts(texts, model=None, batch_size=DEFAULT_BATCH_SIZE, num_threads=None, n_processes=None,
+                 local_model_path=None):
+    """
+    Encode a list of texts with the transformer model in batches.
+
+    Parameters
+    ----------
+    texts : list
+        Texts to encode
+    model : sentence_transformers.SentenceTransformer, optional
+        Encoder to use; the shared registry encoder if None
+    batch_size : int, optional
+        Number of texts per forward pass
+    num_threads : int, optional
+        Number of intra-op threads torch may use while encoding
+    n_processes : int, optional
+        Encode with a pool of this many worker processes when the list is large
+    local_model_path : str, optional
+        Directory containing a local copy of the transformer model
+
+    Returns
+    -------
+    numpy.ndarray
+        C-contiguous float32 array with one row per text
+    """
+    texts = list(texts)
+    if model is None:
+        model = get_encoder(local_path=local_model_path)
+
+    # torch's thread count is process-wide: it is restored once the texts are encoded
+    previous_threads = None
+    if num_threads:
+        import torch
+        previous_threads = torch.get_num_threads()
+        torch.set_num_threads(num_threads)
+
+    try:
+        if n_processes and n_processes > 1 and len(texts) >= PROCESS_POOL_MIN_TEXTS:
+            pool = model.start_multi_process_pool(target_devices=['cpu'] * n_processes)
+            try:
+                embeddings = model.encode_multi_process(texts, pool, batch_size=batch_size)
+            finally:
+                model.stop_multi_process_pool(pool)
+        else:
+            embeddings = model.encode(texts,
+                                      batch_size=batch_size,
+                                      convert_to_numpy=True,
+                                      show_progress_bar=False)
+    finally:
+        if previous_threads is not None:
+            torch.set_num_threads(previous_threads)
+
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+def tfidf_embeddings(texts, n_features=EMBEDDING_DIM, sparse=False):
+    """
+    Embed texts as TF-IDF vectors.
+
+    The vectorizer fitted on a corpus is reused from the model registry when the
+    same texts are embedded again.
+
+    Parameters
+    ----------
+    texts : list
+        Texts to embed
+    n_features : int, optional
+        Maximum vocabulary size and, for dense output, width of the returned array
+    sparse : bool, optional
+        Return the CSR matrix as is (one column per vocabulary term) instead of a
+        dense array padded to ``n_features`` columns
+
+    Returns
+    -------
+    numpy.ndarray or scipy.sparse.csr_matrix
+        float32 embeddings, one row per text
+    """
+    texts = list(texts)
+    tfidf_matrix = get_vectorizer(texts, n_features).transform(texts)  # Match embedding dimensions
+    if sparse:
+        return tfidf_matrix.astype(np.float32)
+
+    # Convert sparse matrix to dense array
+    tfidf_embeddings = tfidf_matrix.toarray().astype(np.float32)
+
+    # If dimensions don't match the expected size, pad with zeros
+    if tfidf_embeddings.shape[1] < n_features:
+        padding = np.zeros((tfidf_embeddings.shape[0], n_features - tfidf_embeddings.shape[1]), dtype=np.float32)
+        tfidf_embeddings = np.hstack((tfidf_embeddings, padding))
+    return tfidf_embeddings
+
+
+@profiled(rows=lambda result: result.shape[0])
+def generate_embeddings(issues_list, use_cache=True, local_model_path=None, batch_size=DEFAULT_BATCH_SIZE,
+                        num_threads=None, n_processes=None, backend='auto', sparse=False):
     """
     Generate embeddings for a list of issues using a pre-trained model.
     Falls back to TF-IDF if the transformer model is unavailable.
@@ -13,35 +114,71 @@ def generate_embeddings(issues_list):
     ----------
     issues_list : list
         List of issues to generate embeddings for
+    use_cache : bool, optional
+        Reuse transformer embeddings stored on disk by previous runs and only
+        encode issues that are not cached yet
+    local_model_path : str, optional
+        Directory containing a local copy of the transformer model, for offline use
+    batch_size : int, optional
+        Number of texts per forward pass of the transformer
+    num_threads : int, optional
+        Number of intra-op threads torch may use
+    n_processes : int, optional
+        Encode with a pool of worker processes when there are many texts to encode
+    backend : str, optional
+        'auto' tries the transformer and falls back to TF-IDF; 'tfidf' skips the
+        transformer, e.g. for offline runs and benchmarks
+    sparse : bool, optional
+        Return the TF-IDF fallback as an unpadded CSR matrix, which KMeans and
+        TruncatedSVD accept directly; transformer embeddings are always dense
 
     Returns
     -------
-    numpy.ndarray
-        Array of embeddings for the input issues
+    numpy.ndarray or scipy.sparse.csr_matrix
+        float32 array of embeddings for the input issues
     """
+    issues_list = list(issues_list)
+    if backend == 'tfidf':
+        set_active_backend('tfidf')
+        return tfidf_embeddings(issues_list, sparse=sparse)
+
+    model_source = resolve_model(local_path=local_model_path)
+    cache = get_embedding_cache(model_source) if use_cache else None
+    cached_embeddings, missing = (None, list(range(len(issues_list))))
+    if cache is not None:
+        cached_embeddings, missing = cache.lookup(issues_list)
+        if cached_embeddings is not None and not missing:
+            print(f"Loaded {len(issues_list)} transformer embeddings from cache.")
+            set_active_backend('transformer')
+            return cached_embeddings
+
     try:
         # Try to use the transformer model first
-        print("Attempting to load the transformer model...")
-        model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-        issues_embeddings = [model.encode(issue) for issue in issues_list]
-        issues_embeddings = np.array(issues_embeddings)
-        print("Successfully generated transformer embeddings.")
+        model = get_encoder(local_path=local_model_path)
+        missing_issues = [issues_list[i] for i in missing]
+        new_embeddings = encode_texts(missing_issues,
+                                      model=model,
+                                      batch_size=batch_size,
+                                      num_threads=num_threads,
+                                      n_processes=n_processes)
+
+        if cache is not None:
+            cache.add(missing_issues, new_embeddings)
+        if cached_embeddings is None:
+            issues_embeddings = new_embeddings
+        else:
+            issues_embeddings = cached_embeddings.astype(np.float32, copy=False)
+            issues_embeddings[missing] = new_embeddings
+        set_active_backend('transformer')
+        print(f"Successfully generated transformer embeddings ({len(missing)} encoded, "
+              f"{len(issues_list) - len(missing)} from cache).")
         return issues_embeddings
     except Exception as e:
         print(f"Error loading transformer model: {str(e)}")
         print("Falling back to TF-IDF vectorization...")
+        set_active_backend('tfidf')
         
         # Fallback to TF-IDF
-        vectorizer = TfidfVectorizer(max_features=384)  # Match embedding dimensions
-        tfidf_matrix = vectorizer.fit_transform(issues_list)
-        
-        # Convert sparse matrix to dense array
-        tfidf_embeddings = tfidf_matrix.toarray()
-        
-        # If dimensions don't match the expected size, pad with zeros
-        if tfidf_embeddings.shape[1] < 384:
-            padding = np.zeros((tfidf_embeddings.shape[0], 384 - tfidf_embeddings.shape[1]))
-            tfidf_embeddings = np.hstack((tfidf_embeddings, padding))
-        
-        print(f"Generated TF-IDF embeddings with shape: {tfidf_embeddings.shape}")
-        return tfidf_embeddings
\ No newline at end of file
+        issues_embeddings = tfidf_embeddings(issues_list, sparse=sparse)
+        print(f"Generated TF-IDF embeddings with shape: {issues_embeddings.shape}")
+        return issues_embeddings
\ No newline at end of file
@@ -0,0 +1,150 @@
+import logging
+import pandas as pd
+from .profiling import profile_stage
+
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Excel limits sheet names to 31 characters
+MAX_SHEET_NAME_LENGTH = 31
+# Rows per sheet, header included; xlsxwriter silently drops rows past this limit
+MAX_SHEET_ROWS = 1_048_576
+# Rows converted to Python objects at a time by the streaming writer
+WRITE_CHUNK_ROWS = 10_000
+
+
+def default_engine():
+    """Return the fastest available Excel engine"""
+    return 'xlsxwriter' if XLSXWRITER_AVAILABLE else 'openpyxl'
+
+
+class ExcelWorkbook:
+    """
+    Write DataFrames to an Excel workbook, one sheet at a time.
+
+    With the 'xlsxwriter' engine rows are streamed in ``constant_memory`` mode, so
+    memory use does not grow with the size of the sheets. pandas writes cells
+    column by column, which constant_memory mode cannot handle, so rows are
+    written here directly. The 'openpyxl' engine is used as a fallback when
+    xlsxwriter is not installed.
+
+    A DataFrame with more rows than a sheet holds is either continued on
+    '<sheet> (2)', '<sheet> (3)', ... sheets, recorded in ``split_sheets``, or
+    rejected, so an export is never silently truncated.
+
+    Parameters
+    ----------
+    target : str or file-like
+        Output path or binary buffer (e.g. ``io.BytesIO``)
+    engine : str, optional
+        'xlsxwriter' or 'openpyxl'; the fastest available engine if None
+    overflow : str, optional
+        'split' to continue oversized sheets on new sheets, 'raise' to raise ValueError
+    max_rows : int, optional
+        Rows per sheet, header included
+    """
+
+    def __init__(self, target, engine=None, overflow='split', max_rows=MAX_SHEET_ROWS):
+        if overflow not in ('split', 'raise'):
+            raise ValueError(f"Unsupported overflow '{overflow}'")
+        self.engine = engine or default_engine()
+        self.overflow = overflow
+        self.max_rows = max_rows
+        # Sheets continued on other sheets: first sheet name -> all sheet names holding its rows
+        self.split_sheets = {}
+        self._sheet_names = set()
+        if self.engine == 'xlsxwriter':
+            self._workbook = xlsxwriter.Workbook(target, {
+                'constant_memory': True,
+                # Keep URLs as plain strings, as pandas does (Excel caps hyperlinks per sheet)
+                'strings_to_urls': False,
+                'nan_inf_to_errors': True,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+            })
+            self._header_format = self._workbook.add_format({'bold': True})
+        elif self.engine == 'openpyxl':
+            self._writer = pd.ExcelWriter(target, engine='openpyxl')
+        else:
+            raise ValueError(f"Unsupported Excel engine '{self.engine}'")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _sheet_name(self, sheet_name):
+        """Truncate a sheet name to Excel's limit and make it unique within the workbook"""
+        name = sheet_name[:MAX_SHEET_NAME_LENGTH]
+        suffix = 1
+        while name.lower() in self._sheet_names:
+            suffix += 1
+            tag = f'_{suffix}'
+            name = sheet_name[:MAX_SHEET_NAME_LENGTH - len(tag)] + tag
+        self._sheet_names.add(name.lower())
+        return name
+
+    def write_sheet(self, df, sheet_name):
+        """
+        Write a DataFrame (without its index) to a new sheet.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Data to write
+        sheet_name : str
+            Sheet name; truncated to 31 characters and de-duplicated if needed
+
+        Returns
+        -------
+        str
+            The sheet name that was used (the first one if the rows were split)
+
+        Raises
+        ------
+        ValueError
+            If ``df`` does not fit on one sheet and ``overflow`` is 'raise'
+        """
+        rows_per_sheet = self.max_rows - 1
+        if len(df) > rows_per_sheet and self.overflow == 'raise':
+            raise ValueError(f"Sheet '{sheet_name}' has {len(df):,} rows; Excel sheets hold at most "
+                             f"{rows_per_sheet:,} rows below the header")
+
+        names = [self._sheet_name(sheet_name)]
+        for part in range(2, -(-len(df) // rows_per_sheet) + 1):
+            suffix = f' ({part})'
+            names.append(self._sheet_name(sheet_name[:MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix))
+        if len(names) > 1:
+            self.split_sheets[names[0]] = names
+            logger.warning("Sheet '%s' has %d rows and was split over %d sheets", names[0], len(df), len(names))
+
+        for part, name in enumerate(names):
+            rows = df.iloc[part * rows_per_sheet:(part + 1) * rows_per_sheet] if len(names) > 1 else df
+            with profile_stage(f'sheet:{name}', rows=len(rows)):
+                if self.engine == 'openpyxl':
+                    rows.to_excel(self._writer, sheet_name=name, index=False)
+                else:
+                    self._write_rows(rows, name)
+        return names[0]
+
+    def _write_rows(self, df, sheet_name):
+        """Write a DataFrame row by row, as constant_memory mode requires"""
+        worksheet = self._workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(col) for col in df.columns], self._header_format)
+        for start in range(0, len(df), WRITE_CHUNK_ROWS):
+            chunk = df.iloc[start:start + WRITE_CHUNK_ROWS].astype(object)
+            values = chunk.where(chunk.notna(), None).to_numpy()
+            for offset, row in enumerate(values, start=start + 1):
+                worksheet.write_row(offset, 0, row)
+
+    def close(self):
+        """Finish writing the workbook"""
+        if self.engine == 'openpyxl':
+            self._writer.close()
+        else:
+            self._workbook.close()
@@ -1,9 +1,16 @@
+import io
 import os
+import re
 import pandas as pd
 import plotly_express as px
-import streamlit as st
-
-def export_data(issues_group, issues_df, export_path, issues_path):
+from .excel import ExcelWorkbook
+from .profiling import profiled
+from ..data.crawl_index import CrawlIndex
+from ..data.partitions import partition_issues
+
+@profiled(rows=None)
+def export_data(issues_group, issues_df, export_path, issues_path=None, partitions=None, crawl_index=None,
+                show=True):
     """
     Export issues data to Excel with multiple sheets.
 
@@ -15,21 +22,32 @@ def export_data(issues_group, issues_df, export_path, issues_path):
         DataFrame containing issues data
     export_path : str
         Path to export directory
-    issues_path : str
-        Path to issues directory
+    issues_path : str, optional
+        Path to issues directory; only read (once) when ``crawl_index`` is not given
+    partitions : IssuePartitions, optional
+        ``issues_df`` already partitioned by issue; built once here if None
+    crawl_index : CrawlIndex, optional
+        Crawl columns per issue, built from the ingested issue exports
+    show : bool, optional
+        Display the priority plots and print the export path (set False when running headless)
 
     Returns
     -------
     str
-        Print message with path to the exported Excel file
+        Path to the exported Excel file
 
     """
     # ensure export directory exists
     os.makedirs(export_path, exist_ok=True)
 
+    if partitions is None:
+        partitions = partition_issues(issues_df)
+    if crawl_index is None and issues_path is not None:
+        crawl_index = CrawlIndex.from_dir(issues_path)
+
     excel_path = os.path.join(export_path, 'issues_with_traffic_pages.xlsx')
 
-    with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+    with ExcelWorkbook(excel_path) as workbook:
         priorities = ['High', 'Medium', 'Low', 'Backlog']
         plotly_colors = px.colors.qualitative.Plotly
         color_mapping = {priority: plotly_colors[i % len(plotly_colors)] for i, priority in enumerate(priorities)}
@@ -43,7 +61,7 @@ def export_data(issues_group, issues_df, export_path, issues_path):
 
             # Save priority summary
             worksheet_name = f'{priority}_Priority'
-            issues_sorted.to_excel(writer, sheet_name=worksheet_name, index=False)
+            workbook.write_sheet(issues_sorted, worksheet_name)
 
             # Create and display plots
             fig_impact = px.bar(issues_sorted,
@@ -57,32 +75,30 @@ def export_data(issues_group, issues_df, export_path, issues_path):
                 yaxis_title="Volume of URLs",
                 xaxis_title="Issues",
             )
-            fig_impact.show()
+            if show:
+                fig_impact.show()
 
             # Process individual issues
             for issue_name in issues_fig['issue'].unique():
-                # Filter and sort data
-                issue_data = issues_df[issues_df['issue'] == issue_name]
-                issue_data = issue_data.sort_values('Clicks_gsc', ascending=False)
+                # Rows for the issue, sorted by clicks
+                issue_data = partitions.get(issue_name)
 
-                # find relevant csv from issue_data using issue name
-                issue_csv_path = os.path.join(issues_path, f"{issue_name}.csv")
-                if os.path.exists(issue_csv_path):
-                    issue_csv_df = pd.read_csv(issue_csv_path)
-                    issue_data = issue_data.merge(issue_csv_df, how='left', on='Address', suffixes=('', '_crawl'))
-                else:
-                    pass
+                # add the issue's crawl columns
+                if crawl_index is not None:
+                    issue_data = crawl_index.enrich(issue_data, issue_name)
 
-                # Create valid worksheet name
-                issue_worksheet_name = f"{priority}_{issue_name}"[:31]
+                # Write to worksheet (names are truncated to Excel's 31 character limit)
+                workbook.write_sheet(issue_data, f"{priority}_{issue_name}")
 
-                # Write to worksheet
-                issue_data.to_excel(writer, sheet_name=issue_worksheet_name, index=False)
+    if show:
+        for sheet_names in workbook.split_sheets.values():
+            print(f"Sheet '{sheet_names[0]}' exceeds Excel's row limit and continues on {', '.join(sheet_names[1:])}")
+        print(f'Data exported to {excel_path}')
+    return excel_path
 
-    return print(f'Data exported to {excel_path}')
 
-
-def export_streamlit_data(issues_group, issues_df, temp_dir, perc_n):
+@profiled(rows=lambda result: result[1])
+def export_streamlit_data(issues_group, issues_df, perc_n, partitions=None):
     """
     Export issues data to Excel based on selected impact score threshold.
 
@@ -92,61 +108,90 @@ def export_streamlit_data(issues_group, issues_df, temp_dir, perc_n):
         DataFrame containing aggregated issues data
     issues_df : pandas.DataFrame
         DataFrame containing detailed issues data
-    temp_dir : str
-        Temporary directory path
     perc_n : float
         Percentile threshold for filtering issues
+    partitions : IssuePartitions, optional
+        ``issues_df`` already partitioned by issue; built once here if None
+
+    Returns
+    -------
+    tuple
+        Bytes of the Excel workbook, the number of exported issues and the sheets
+        split over several sheets (see ``ExcelWorkbook.split_sheets``)
+
+    Raises
+    ------
+    ValueError
+        If a sheet exceeds Excel's row limit and the workbook does not split it
     """
-    try:
-        # Calculate threshold based on percentile
-        threshold = issues_group['Impact_Score'].quantile(perc_n)
-
-        # Filter issues_group based on threshold
-        filtered_issues_group = issues_group[issues_group['Impact_Score'] >= threshold].copy()
-
-        # Create export file path in temp directory
-        excel_path = os.path.join(temp_dir, 'issues_analysis_results.xlsx')
-
-        # Export data to Excel
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-            # Export metadata sheet with analysis parameters
-            metadata = pd.DataFrame({
-                'Parameter': ['Percentile Threshold', 'Impact Score Threshold', 'Number of Issues'],
-                'Value': [f"{perc_n:.2%}", f"{threshold:.2f}", len(filtered_issues_group)]
-            })
-            metadata.to_excel(writer, sheet_name='Analysis_Parameters', index=False)
-
-            # Export filtered summary sheet with all issues
-            filtered_issues_group.to_excel(writer, sheet_name='All_Issues_Summary', index=False)
-
-            # Export sheets by priority
-            priorities = ['High', 'Medium', 'Low', 'Backlog']
-            for priority in priorities:
-                priority_issues = filtered_issues_group[
-                    filtered_issues_group['Impact_Score_Quadrant'] == priority
-                    ].sort_values('Impact_Score', ascending=False)
-
-                if not priority_issues.empty:
-                    # Create priority summary sheet
-                    sheet_name = f'{priority}_Priority'
-                    priority_issues.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                    # Create individual issue sheets
-                    for issue_name in priority_issues['issue'].unique():
-                        # Filter issues_df to only include URLs for filtered issues
-                        issue_data = issues_df[issues_df['issue'] == issue_name]
-                        issue_data = issue_data.sort_values('Clicks_gsc', ascending=False)
-
-                        # Create valid worksheet name (Excel has 31 character limit)
-                        issue_worksheet_name = f"{priority}_{issue_name}"[:31]
-                        issue_data.to_excel(writer, sheet_name=issue_worksheet_name, index=False)
-
-        # Read the exported file
-        with open(excel_path, 'rb') as f:
-            excel_data = f.read()
-
-        return excel_data, len(filtered_issues_group)
-
-    except Exception as e:
-        st.error(f"Error during export: {str(e)}")
-        return None, 0
\ No newline at end of file
+    if partitions is None:
+        partitions = partition_issues(issues_df)
+
+    # Calculate threshold based on percentile
+    threshold = issues_group['Impact_Score'].quantile(perc_n)
+
+    # Filter issues_group based on threshold
+    filtered_issues_group = issues_group[issues_group['Impact_Score'] >= threshold].copy()
+
+    # Export data to an in-memory Excel workbook
+    buffer = io.BytesIO()
+    with ExcelWorkbook(buffer) as workbook:
+        # Export metadata sheet with analysis parameters
+        metadata = pd.DataFrame({
+            'Parameter': ['Percentile Threshold', 'Impact Score Threshold', 'Number of Issues'],
+            'Value': [f"{perc_n:.2%}", f"{threshold:.2f}", len(filtered_issues_group)]
+        })
+        workbook.write_sheet(metadata, 'Analysis_Parameters')
+
+        # Export filtered summary sheet with all issues
+        workbook.write_sheet(filtered_issues_group, 'All_Issues_Summary')
+
+        # Export sheets by priority
+        priorities = ['High', 'Medium', 'Low', 'Backlog']
+        for priority in priorities:
+            priority_issues = filtered_issues_group[
+                filtered_issues_group['Impact_Score_Quadrant'] == priority
+                ].sort_values('Impact_Score', ascending=False)
+
+            if not priority_issues.empty:
+                # Create priority summary sheet
+                sheet_name = f'{priority}_Priority'
+                workbook.write_sheet(priority_issues, sheet_name)
+
+                # Create individual issue sheets
+                for issue_name in priority_issues['issue'].unique():
+                    # URLs for the issue, sorted by clicks
+                    issue_data = partitions.get(issue_name)
+
+                    # Worksheet names are truncated to Excel's 31 character limit
+                    workbook.write_sheet(issue_data, f"{priority}_{issue_name}")
+
+    return buffer.getvalue(), len(filtered_issues_group), workbook.split_sheets
+
+
+@profiled(rows=None)
+def export_internal_links(results):
+    """
+    Export internal links analysis to Excel.
+
+    Parameters
+    ----------
+    results : list
+        Status group summaries as returned by ``summarize_status_groups``
+
+    Returns
+    -------
+    excel_data : bytes
+        The Excel workbook with all and unique internal links per status group
+    split_sheets : dict
+        Sheets split over several sheets (see ``ExcelWorkbook.split_sheets``)
+    """
+    buffer = io.BytesIO()
+
+    with ExcelWorkbook(buffer) as workbook:
+        for result in results:
+            status = re.sub(r"[^\w]", "_", result['status'])
+            workbook.write_sheet(result['data'], f'internal_{status}')
+            workbook.write_sheet(result['unique_data'], f'unique_internal_{status}')
+
+    return buffer.getvalue(), workbook.split_sheets
\ No newline at end of file
@@ -0,0 +1,246 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import PCA, TruncatedSVD
+from sklearn.metrics import silhouette_score
+from .profiling import profiled
+
+DEFAULT_K_VALUES = range(2, 16)
+# From this many samples, MiniBatchKMeans is used instead of full KMeans
+MINIBATCH_MIN_SAMPLES = 20_000
+MINIBATCH_SIZE = 4096
+# Candidate k values are fitted in parallel processes from this much work (samples x candidates)
+PARALLEL_MIN_WORK = 200_000
+# The silhouette score is computed on a sample of at most this many points
+SILHOUETTE_SAMPLE_SIZE = 10_000
+
+
+def fit_kmeans(embeddings, k, minibatch=False, random_state=0):
+    """
+    Fit a single KMeans (or MiniBatchKMeans) model.
+
+    Parameters
+    ----------
+    embeddings : array-like
+        Data to cluster
+    k : int
+        Number of clusters
+    minibatch : bool, optional
+        Fit MiniBatchKMeans, which is much faster on large inputs
+    random_state : int, optional
+        Random seed
+
+    Returns
+    -------
+    sklearn.cluster.KMeans or sklearn.cluster.MiniBatchKMeans
+        The fitted model
+    """
+    if minibatch:
+        model = MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init='auto', batch_size=MINIBATCH_SIZE)
+    else:
+        model = KMeans(n_clusters=k, random_state=random_state, n_init='auto')
+    return model.fit(embeddings)
+
+
+class KSearchResult:
+    """
+    KMeans models fitted for several candidate numbers of clusters.
+
+    Parameters
+    ----------
+    models : dict
+        Fitted model per k
+    silhouettes : dict
+        Silhouette score per k, for the k values it is defined for
+    n_samples : int, optional
+        Number of clustered points, which bounds the k values worth searching
+    """
+
+    def __init__(self, models, silhouettes, n_samples=None):
+        self.models = models
+        self.silhouettes = silhouettes
+        self.n_samples = n_samples
+
+    def __contains__(self, k):
+        return k in self.models
+
+    def __len__(self):
+        return len(self.models)
+
+    @property
+    def k_values(self):
+        """Candidate k values, ascending"""
+        return sorted(self.models)
+
+    @property
+    def inertias(self):
+        """Inertia (within-cluster sum of squares) per k"""
+        return {k: float(self.models[k].inertia_) for k in self.k_values}
+
+    @property
+    def silhouette_k(self):
+        """The k with the best silhouette score (the smallest on ties), or None if none is defined"""
+        if not self.silhouettes:
+            return None
+        return max(self.silhouettes, key=lambda k: (self.silhouettes[k], -k))
+
+    @property
+    def inconclusive(self):
+        """
+        Whether the best silhouette score lies on a bound of the searched k values.
+
+        The score may keep improving beyond that bound (as it does on small TF-IDF
+        inputs), so the search does not locate its maximum. A bound that cannot be
+        extended (k=2, or one cluster less than there are points) is conclusive.
+        """
+        best = self.silhouette_k
+        if best is None:
+            return False
+        k_values = self.k_values
+        above = best == k_values[-1] and (self.n_samples is None or best < self.n_samples - 1)
+        below = best == k_values[0] and best > 2
+        return above or below
+
+    @property
+    def suggested_k(self):
+        """
+        The k with the best silhouette score, or the elbow of the inertia curve if
+        no silhouette score is defined or the best one is :attr:`inconclusive`.
+        """
+        if self.silhouette_k is None or self.inconclusive:
+            return self.elbow_k()
+        return self.silhouette_k
+
+    @property
+    def suggestion_method(self):
+        """How :attr:`suggested_k` was chosen: 'silhouette' or 'elbow'"""
+        return 'elbow' if self.silhouette_k is None or self.inconclusive else 'silhouette'
+
+    def elbow_k(self):
+        """Return the k at the elbow of the inertia curve (farthest point below the chord)"""
+        k_values = self.k_values
+        if len(k_values) < 3:
+            return k_values[0]
+        k = np.array(k_values, dtype=float)
+        inertia = np.array([self.inertias[value] for value in k_values])
+        k = (k - k[0]) / (k[-1] - k[0])
+        spread = inertia[0] - inertia[-1]
+        if spread <= 0:
+            return k_values[0]
+        inertia = (inertia - inertia[-1]) / spread
+        # The chord runs from (0, 1) to (1, 0); the elbow is the point farthest below it
+        return k_values[int(np.argmax(1 - k - inertia))]
+
+    def model(self, k):
+        """Return the fitted model for ``k``"""
+        if k not in self.models:
+            raise KeyError(f"No model fitted for k={k}; candidates are {self.k_values}")
+        return self.models[k]
+
+    def labels(self, k):
+        """Return the cluster label of each point for ``k``"""
+        return self.model(k).labels_
+
+    def scores(self):
+        """Return the inertia and silhouette score of each candidate k as a DataFrame"""
+        return pd.DataFrame({
+            'k': self.k_values,
+            'inertia': [self.inertias[k] for k in self.k_values],
+            'silhouette': [self.silhouettes.get(k, np.nan) for k in self.k_values]
+        })
+
+
+def _silhouette(embeddings, labels, sample_size, random_state):
+    """Return the silhouette score, or None where it is undefined"""
+    n_labels = len(np.unique(labels))
+    if n_labels < 2 or n_labels >= len(labels):
+        return None
+    sample_size = sample_size if len(labels) > sample_size else None
+    return float(silhouette_score(embeddings, labels, sample_size=sample_size, random_state=random_state))
+
+
+@profiled(rows=None)
+def search_k(embeddings, k_values=DEFAULT_K_VALUES, n_jobs=None, minibatch=None, random_state=0,
+             silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE):
+    """
+    Fit KMeans for every candidate number of clusters and score each fit.
+
+    Every fitted model is kept, so choosing another k afterwards is a lookup
+    rather than a refit. Each model is the one ``KMeans(n_clusters=k,
+    random_state=random_state, n_init='auto')`` fits, unless MiniBatchKMeans
+    is used for large inputs.
+
+    Parameters
+    ----------
+    embeddings : array-like
+        Data to cluster
+    k_values : iterable, optional
+        Candidate numbers of clusters; values above the number of samples are skipped
+    n_jobs : int, optional
+        Number of processes fitting candidates in parallel; by default the
+        candidates are fitted sequentially on small inputs and on all cores otherwise
+    minibatch : bool, optional
+        Use MiniBatchKMeans; by default only from ``MINIBATCH_MIN_SAMPLES`` samples
+    random_state : int, optional
+        Random seed
+    silhouette_sample_size : int, optional
+        Maximum number of points the silhouette score is computed on
+
+    Returns
+    -------
+    KSearchResult
+        The fitted models and their scores
+    """
+    n_samples = embeddings.shape[0]
+    k_values = sorted({int(k) for k in k_values if 1 <= k <= n_samples})
+    if not k_values:
+        raise ValueError(f"No candidate number of clusters fits {n_samples} samples")
+
+    if minibatch is None:
+        minibatch = n_samples >= MINIBATCH_MIN_SAMPLES
+    if n_jobs is None:
+        n_jobs = -1 if n_samples * len(k_values) >= PARALLEL_MIN_WORK else 1
+
+    if n_jobs == 1 or len(k_values) == 1:
+        fitted = [fit_kmeans(embeddings, k, minibatch, random_state) for k in k_values]
+    else:
+        fitted = Parallel(n_jobs=n_jobs)(
+            delayed(fit_kmeans)(embeddings, k, minibatch, random_state) for k in k_values
+        )
+
+    models = dict(zip(k_values, fitted))
+    silhouettes = {}
+    for k, model in models.items():
+        score = _silhouette(embeddings, model.labels_, silhouette_sample_size, random_state)
+        if score is not None:
+            silhouettes[k] = score
+    return KSearchResult(models, silhouettes, n_samples)
+
+
+@profiled()
+def project_2d(embeddings, random_state=0):
+    """
+    Project embeddings to two dimensions for plotting.
+
+    Sparse matrices are projected with TruncatedSVD, which works on CSR input
+    directly instead of densifying it for PCA; dense arrays use PCA as before.
+
+    Parameters
+    ----------
+    embeddings : array-like or scipy.sparse matrix
+        Embeddings, one row per point
+    random_state : int, optional
+        Random seed of the SVD solver
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape ``(n_samples, 2)``
+    """
+    if sparse.issparse(embeddings) and embeddings.shape[1] > 2:
+        return TruncatedSVD(n_components=2, random_state=random_state).fit_transform(embeddings)
+    if sparse.issparse(embeddings):
+        embeddings = embeddings.toarray()
+    return PCA(n_components=2).fit_transform(embeddings)
@@ -0,0 +1,151 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from sklearn.feature_extraction.text import TfidfVectorizer
+from .cache import content_digest
+from .embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+# Point this at a local copy of the model to run without network access
+MODEL_PATH_ENV = 'SF_AUDIT_MODEL_PATH'
+# Number of fitted TF-IDF vectorizers kept per process
+VECTORIZER_CACHE_ENTRIES = 16
+
+_lock = threading.Lock()
+_encoders = {}
+_failures = {}
+_embedding_caches = {}
+_vectorizers = OrderedDict()
+_active_backend = None
+
+
+def resolve_model(model_name=DEFAULT_MODEL, local_path=None):
+    """Return the name or local path the encoder should be loaded from"""
+    return local_path or os.environ.get(MODEL_PATH_ENV) or model_name
+
+
+def _load_encoder(source):
+    """Load a sentence-transformer from a model name or a local directory"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(source, local_files_only=os.path.isdir(source))
+
+
+def get_encoder(model_name=DEFAULT_MODEL, local_path=None):
+    """
+    Return the process-wide sentence-transformer for a model, loading it on first use.
+
+    The encoder is shared by every caller in the process (including all Streamlit
+    sessions of a worker). A failed load is remembered so later calls fall back
+    immediately instead of retrying a download on every rerun.
+
+    Parameters
+    ----------
+    model_name : str, optional
+        Hugging Face model name
+    local_path : str, optional
+        Directory containing a local copy of the model; overrides ``model_name``
+        and the ``SF_AUDIT_MODEL_PATH`` environment variable
+
+    Returns
+    -------
+    sentence_transformers.SentenceTransformer
+        The loaded encoder
+
+    Raises
+    ------
+    RuntimeError
+        If the model could not be loaded (now or on an earlier attempt)
+    """
+    source = resolve_model(model_name, local_path)
+    encoder = _encoders.get(source)
+    if encoder is not None:
+        return encoder
+
+    with _lock:
+        if source in _encoders:
+            return _encoders[source]
+        if source in _failures:
+            raise RuntimeError(_failures[source])
+
+        start = time.perf_counter()
+        try:
+            encoder = _load_encoder(source)
+        except Exception as e:
+            _failures[source] = f"Could not load model '{source}': {e}"
+            logger.warning("%s (after %.2fs)", _failures[source], time.perf_counter() - start)
+            raise RuntimeError(_failures[source]) from e
+
+        logger.info("Loaded sentence-transformer '%s' in %.2fs", source, time.perf_counter() - start)
+        _encoders[source] = encoder
+        return encoder
+
+
+def get_embedding_cache(model_name=DEFAULT_MODEL):
+    """Return the shared on-disk embedding cache for a model"""
+    with _lock:
+        if model_name not in _embedding_caches:
+            _embedding_caches[model_name] = EmbeddingCache(model_name)
+        return _embedding_caches[model_name]
+
+
+def get_vectorizer(texts, max_features):
+    """
+    Return a TF-IDF vectorizer fitted on a corpus, reusing the fit for a corpus seen before.
+
+    Fitted vectorizers are kept per process (least recently used first out), so
+    reruns on the same texts only transform them instead of refitting the vocabulary.
+
+    Parameters
+    ----------
+    texts : list
+        Corpus to fit on; the order of the texts does not matter
+    max_features : int
+        Maximum vocabulary size
+
+    Returns
+    -------
+    sklearn.feature_extraction.text.TfidfVectorizer
+        The fitted vectorizer
+    """
+    key = content_digest(max_features, sorted(texts))
+    with _lock:
+        vectorizer = _vectorizers.get(key)
+        if vectorizer is not None:
+            _vectorizers.move_to_end(key)
+            return vectorizer
+
+    vectorizer = TfidfVectorizer(max_features=max_features).fit(texts)
+    with _lock:
+        _vectorizers[key] = vectorizer
+        while len(_vectorizers) > VECTORIZER_CACHE_ENTRIES:
+            _vectorizers.popitem(last=False)
+    return vectorizer
+
+
+def set_active_backend(backend):
+    """Record which embedding backend ('transformer' or 'tfidf') is in use, logging changes"""
+    global _active_backend
+    with _lock:
+        if backend != _active_backend:
+            logger.info("Embedding backend: %s", backend)
+        _active_backend = backend
+
+
+def active_backend():
+    """Return the embedding backend used by the most recent embedding run, if any"""
+    return _active_backend
+
+
+def reset_registry():
+    """Drop loaded encoders and remembered failures, e.g. after the network comes back"""
+    global _active_backend
+    with _lock:
+        _encoders.clear()
+        _failures.clear()
+        _embedding_caches.clear()
+        _vectorizers.clear()
+        _active_backend = None
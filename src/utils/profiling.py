@@ -0,0 +1,235 @@
+import contextvars
+import functools
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+
+_active_profiler = contextvars.ContextVar('sf_audit_profiler', default=None)
+
+
+def max_rss_mb():
+    """Return the peak resident set size of the process in MB, or None if unavailable"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return max_rss / MB if sys.platform == 'darwin' else max_rss / 1024
+
+
+def current_rss_mb():
+    """Return the current resident set size of the process in MB, or None if unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * resource.getpagesize() / MB
+
+
+def _round(value, digits=3):
+    return None if value is None else round(value, digits)
+
+
+class Profiler:
+    """
+    Collect the wall time, memory and row count of each pipeline stage.
+
+    Stages are recorded by :func:`profile_stage` and :func:`profiled` while the
+    profiler is active, and may be nested; each record carries the path of its
+    enclosing stages. Memory is reported as the process peak RSS and, with
+    ``trace_memory``, as the Python allocations traced by ``tracemalloc`` within
+    the stage (slower, so off by default).
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        Trace Python allocations per stage with tracemalloc
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+        self._stack = []
+
+    @contextmanager
+    def activate(self):
+        """Make this the profiler that stages are recorded to for the enclosed block"""
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        token = _active_profiler.set(self)
+        try:
+            yield self
+        finally:
+            _active_profiler.reset(token)
+            if started_tracing:
+                tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Record a stage for the enclosed block.
+
+        Parameters
+        ----------
+        name : str
+            Stage name
+        rows : int, optional
+            Row count; can also be set inside the block with ``record['rows'] = ...``
+
+        Yields
+        ------
+        dict
+            The stage record
+        """
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        parent = self._stack[-1] if self._stack else None
+        record = {
+            'stage': name,
+            'path': f"{parent['record']['path']}/{name}" if parent else name,
+            'depth': len(self._stack),
+            'rows': rows,
+            'seconds': None,
+            'max_rss_mb': None,
+            'max_rss_growth_mb': None,
+        }
+        if tracing:
+            record['alloc_peak_mb'] = None
+            record['alloc_delta_mb'] = None
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent['peak'] = max(parent['peak'], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        frame = {'record': record, 'start_alloc': current, 'peak': current}
+        self.records.append(record)
+        self._stack.append(frame)
+
+        start_rss = max_rss_mb()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - start, 4)
+            end_rss = max_rss_mb()
+            record['max_rss_mb'] = _round(end_rss, 1)
+            if end_rss is not None:
+                record['max_rss_growth_mb'] = _round(end_rss - start_rss, 1)
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                frame['peak'] = max(frame['peak'], peak)
+                record['alloc_peak_mb'] = _round((frame['peak'] - frame['start_alloc']) / MB)
+                record['alloc_delta_mb'] = _round((current - frame['start_alloc']) / MB)
+                if parent is not None:
+                    parent['peak'] = max(parent['peak'], frame['peak'])
+                tracemalloc.reset_peak()
+            self._stack.pop()
+
+    def to_frame(self):
+        """Return the stage records as a DataFrame, in the order the stages started"""
+        return pd.DataFrame(self.records)
+
+    def report(self, **metadata):
+        """
+        Return the stage records with process-level memory figures.
+
+        Parameters
+        ----------
+        **metadata
+            Extra entries for the report, e.g. the crawl it describes
+
+        Returns
+        -------
+        dict
+            ``metadata`` plus 'stages', 'max_rss_mb' and 'rss_mb'
+        """
+        return {
+            **metadata,
+            'max_rss_mb': _round(max_rss_mb(), 1),
+            'rss_mb': _round(current_rss_mb(), 1),
+            'trace_memory': self.trace_memory,
+            'stages': self.records
+        }
+
+    def to_json(self, **metadata):
+        """Return :meth:`report` as a JSON string"""
+        return json.dumps(self.report(**metadata), indent=2, default=str)
+
+
+def active_profiler():
+    """Return the active :class:`Profiler`, or None"""
+    return _active_profiler.get()
+
+
+@contextmanager
+def profile_stage(name, rows=None):
+    """
+    Record the enclosed block as a stage of the active profiler; a no-op without one.
+
+    Parameters
+    ----------
+    name : str
+        Stage name
+    rows : int, optional
+        Row count; can also be set inside the block with ``record['rows'] = ...``
+
+    Yields
+    ------
+    dict
+        The stage record (a throwaway dict when no profiler is active)
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield {'rows': rows}
+        return
+    with profiler.stage(name, rows) as record:
+        yield record
+
+
+def profiled(name=None, rows=len):
+    """
+    Decorate a function so each call is recorded as a stage of the active profiler.
+
+    Parameters
+    ----------
+    name : str, optional
+        Stage name; defaults to the function name
+    rows : callable, optional
+        Computes the row count from the return value; None records no row count.
+        The default ``len`` only counts frames, arrays and other containers of
+        rows: bytes, strings and tuples (e.g. a workbook and its metadata) are
+        not counted, so pass an explicit function for those
+
+    Returns
+    -------
+    callable
+        The decorator
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active_profiler.get() is None:
+                return func(*args, **kwargs)
+            with profile_stage(stage_name) as record:
+                result = func(*args, **kwargs)
+                if rows is not None and not (rows is len and isinstance(result, (bytes, str, tuple))):
+                    try:
+                        record['rows'] = int(rows(result))
+                    except (TypeError, ValueError):
+                        pass
+                return result
+        return wrapper
+    return decorator
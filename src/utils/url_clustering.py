@@ -0,0 +1,353 @@
+import re
+from urllib.parse import urlsplit
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.preprocessing import normalize
+from .profiling import profiled
+
+# Width of the hashed path-segment block
+PATH_FEATURES = 2 ** 10
+# Path segments (from the left) that become features
+PATH_DEPTH = 3
+# Relative weight of each feature block before the rows are L2-normalized
+DEFAULT_WEIGHTS = {'issues': 1.0, 'path': 0.5, 'metrics': 0.5}
+METRIC_COLUMNS = ['Clicks_gsc', 'Impressions_gsc', 'CTR_gsc', 'Position_gsc']
+# Rows densified at a time by IncrementalPCA
+PCA_BATCH_SIZE = 5_000
+# The 2D projection is fitted on a random sample of at most this many URLs
+PCA_FIT_SAMPLES = 50_000
+KMEANS_BATCH_SIZE = 4_096
+
+_DIGITS = re.compile(r'\d+')
+
+
+def url_path_tokens(url, depth=PATH_DEPTH):
+    """
+    Describe a URL by its host, leading path segments, depth, extension and query.
+
+    Digits are collapsed so that e.g. /page-12/ and /page-345/ share a token.
+
+    Parameters
+    ----------
+    url : str
+        URL to describe
+    depth : int, optional
+        Number of leading path segments to keep
+
+    Returns
+    -------
+    list
+        Tokens such as 'host=www.example.com', 'seg0=blog' and 'depth=2'
+    """
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split('/') if segment]
+    tokens = [f'host={parts.netloc.lower()}', f'depth={min(len(segments), 10)}']
+    tokens.extend(f'seg{i}={_DIGITS.sub("0", segment.lower())}' for i, segment in enumerate(segments[:depth]))
+    if segments and '.' in segments[-1]:
+        tokens.append(f'ext={segments[-1].rsplit(".", 1)[1].lower()}')
+    if parts.query:
+        tokens.append('query')
+    return tokens
+
+
+def _metric_block(url_metrics):
+    """Scale GSC metrics to [0, 1]; URLs without GSC data get zeros and a flag"""
+    clicks = np.log1p(url_metrics['Clicks_gsc'].fillna(0).clip(lower=0).to_numpy(dtype=np.float64))
+    impressions = np.log1p(url_metrics['Impressions_gsc'].fillna(0).clip(lower=0).to_numpy(dtype=np.float64))
+    ctr = url_metrics['CTR_gsc'].fillna(0).clip(0, 1).to_numpy(dtype=np.float64)
+    position = url_metrics['Position_gsc'].to_numpy(dtype=np.float64)
+    has_gsc = ~np.isnan(position)
+    position = np.where(has_gsc, 1 - np.minimum(np.nan_to_num(position), 100) / 100, 0)
+    block = np.column_stack([
+        clicks / max(clicks.max(initial=0), 1),
+        impressions / max(impressions.max(initial=0), 1),
+        ctr,
+        position,
+        has_gsc
+    ])
+    return sparse.csr_matrix(block.astype(np.float32))
+
+
+class UrlFeatures:
+    """
+    Sparse feature matrix with one row per affected URL.
+
+    Parameters
+    ----------
+    matrix : scipy.sparse.csr_matrix
+        L2-normalized features: issue set, hashed path segments and GSC metrics
+    urls : pandas.Index
+        Address of each row
+    issue_matrix : scipy.sparse.csr_matrix
+        Binary URL x issue matrix
+    issues : pandas.Index
+        Issue of each column of ``issue_matrix``
+    metrics : pandas.DataFrame
+        GSC metrics of each URL, aligned with ``urls``
+    """
+
+    def __init__(self, matrix, urls, issue_matrix, issues, metrics):
+        self.matrix = matrix
+        self.urls = urls
+        self.issue_matrix = issue_matrix
+        self.issues = issues
+        self.metrics = metrics
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def issue_counts(self):
+        """Return the number of issues affecting each URL"""
+        return np.asarray(self.issue_matrix.sum(axis=1)).ravel()
+
+
+@profiled()
+def build_url_features(issues_df, weights=None, path_features=PATH_FEATURES):
+    """
+    Describe every affected URL by its issue set, path segments and GSC metrics.
+
+    Parameters
+    ----------
+    issues_df : pandas.DataFrame
+        URL-level issues data with 'Address', 'issue' and the '_gsc' metric
+        columns, as returned by clean_data
+    weights : dict, optional
+        Relative weight of the 'issues', 'path' and 'metrics' blocks
+    path_features : int, optional
+        Width of the hashed path-segment block
+
+    Returns
+    -------
+    UrlFeatures
+        The features, one row per unique URL
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    url_codes, urls = pd.factorize(issues_df['Address'])
+    issue_codes, issues = pd.factorize(issues_df['issue'])
+
+    issue_matrix = sparse.csr_matrix(
+        (np.ones(len(url_codes), dtype=np.float32), (url_codes, issue_codes)),
+        shape=(len(urls), len(issues))
+    )
+    issue_matrix.data[:] = 1  # duplicate rows of a URL and issue count once
+
+    hasher = FeatureHasher(n_features=path_features, input_type='string', alternate_sign=False,
+                           dtype=np.float32)
+    path_matrix = hasher.transform(url_path_tokens(url) for url in urls)
+
+    first_rows = np.unique(url_codes, return_index=True)[1]
+    metric_columns = [col for col in METRIC_COLUMNS if col in issues_df.columns]
+    metrics = (issues_df.iloc[first_rows][metric_columns]
+               .reindex(columns=METRIC_COLUMNS)
+               .reset_index(drop=True))
+
+    matrix = sparse.hstack([
+        normalize(issue_matrix) * weights['issues'],
+        normalize(path_matrix) * weights['path'],
+        _metric_block(metrics) * weights['metrics']
+    ], format='csr', dtype=np.float32)
+    return UrlFeatures(normalize(matrix), pd.Index(urls, name='Address'), issue_matrix,
+                       pd.Index(issues, name='issue'), metrics)
+
+
+@profiled(rows=lambda model: len(model.labels_))
+def cluster_urls(features, n_clusters, random_state=0, batch_size=KMEANS_BATCH_SIZE):
+    """
+    Cluster URL features with MiniBatchKMeans, which works on the sparse matrix in bounded memory.
+
+    Parameters
+    ----------
+    features : UrlFeatures
+        Features built by :func:`build_url_features`
+    n_clusters : int
+        Number of clusters (capped at the number of URLs)
+    random_state : int, optional
+        Random seed
+    batch_size : int, optional
+        Mini-batch size
+
+    Returns
+    -------
+    sklearn.cluster.MiniBatchKMeans
+        The fitted model; ``labels_`` holds the cluster of each URL
+    """
+    model = MiniBatchKMeans(n_clusters=min(n_clusters, len(features)),
+                            random_state=random_state,
+                            n_init='auto',
+                            batch_size=batch_size)
+    return model.fit(features.matrix)
+
+
+@profiled(rows=len)
+def project_urls(features, batch_size=PCA_BATCH_SIZE, fit_samples=PCA_FIT_SAMPLES, random_state=0):
+    """
+    Project URL features to 2D with IncrementalPCA, densifying one batch of rows at a time.
+
+    The projection is fitted on a random sample of the URLs, which is plenty for
+    a 2D view and keeps the cost of the per-batch SVDs independent of the crawl
+    size, and then applied to every URL.
+
+    Parameters
+    ----------
+    features : UrlFeatures
+        Features built by :func:`build_url_features`
+    batch_size : int, optional
+        Rows densified at a time
+    fit_samples : int, optional
+        Maximum number of URLs the projection is fitted on
+    random_state : int, optional
+        Random seed of the sample
+
+    Returns
+    -------
+    numpy.ndarray
+        float32 array of shape ``(n_urls, 2)``
+    """
+    matrix = features.matrix
+    n_rows = matrix.shape[0]
+    if n_rows < 2:
+        return np.zeros((n_rows, 2), dtype=np.float32)
+
+    sample = matrix
+    if n_rows > fit_samples:
+        rows = np.sort(np.random.default_rng(random_state).choice(n_rows, fit_samples, replace=False))
+        sample = matrix[rows]
+
+    # Every batch passed to partial_fit needs at least n_components rows
+    n_sample = sample.shape[0]
+    starts = list(range(0, n_sample, batch_size))
+    if len(starts) > 1 and n_sample - starts[-1] < 2:
+        starts.pop()
+
+    pca = IncrementalPCA(n_components=2)
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else n_sample
+        pca.partial_fit(sample[start:end].toarray())
+
+    # Same as pca.transform, but centred after the product so the sparse matrix is never densified
+    components = pca.components_.T.astype(np.float32)
+    projection = np.asarray(matrix @ components) - pca.mean_.astype(np.float32) @ components
+    return projection.astype(np.float32, copy=False)
+
+
+def summarize_url_clusters(features, labels, top_n=3):
+    """
+    Describe each URL cluster by its size, traffic and most common issues.
+
+    Parameters
+    ----------
+    features : UrlFeatures
+        Features built by :func:`build_url_features`
+    labels : array-like
+        Cluster of each URL
+    top_n : int, optional
+        Number of issues listed per cluster
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per cluster, largest first
+    """
+    labels = np.asarray(labels)
+    n_clusters = labels.max() + 1 if len(labels) else 0
+    membership = sparse.csr_matrix(
+        (np.ones(len(labels), dtype=np.float32), (labels, np.arange(len(labels)))),
+        shape=(n_clusters, len(labels))
+    )
+    issue_totals = (membership @ features.issue_matrix).toarray()
+    sizes = np.bincount(labels, minlength=n_clusters)
+    clicks = np.bincount(labels, weights=features.metrics['Clicks_gsc'].fillna(0).to_numpy(), minlength=n_clusters)
+
+    top_issues = []
+    for cluster_totals, size in zip(issue_totals, sizes):
+        order = np.argsort(-cluster_totals)[:top_n]
+        top_issues.append(', '.join(f"{features.issues[i]} ({cluster_totals[i] / max(size, 1):.0%})"
+                                    for i in order if cluster_totals[i] > 0))
+
+    summary = pd.DataFrame({
+        'Cluster': np.arange(n_clusters),
+        'URLs': sizes,
+        'Clicks': clicks.astype(np.int64),
+        'Avg issues per URL': np.round(issue_totals.sum(axis=1) / np.maximum(sizes, 1), 2),
+        'Top issues': top_issues
+    })
+    return summary.sort_values('URLs', ascending=False, ignore_index=True)
+
+
+class SimilarUrlIndex:
+    """
+    Approximate nearest-neighbour index over URL features.
+
+    An inverted-file index: the KMeans centroids act as a coarse quantizer,
+    and a query is compared exactly only against the URLs of its ``n_probe``
+    nearest clusters instead of every URL. Rows are L2-normalized, so the
+    dot product is the cosine similarity.
+
+    Parameters
+    ----------
+    features : UrlFeatures
+        Features built by :func:`build_url_features`
+    model : sklearn.cluster.KMeans or sklearn.cluster.MiniBatchKMeans
+        Model fitted on ``features.matrix``
+    """
+
+    def __init__(self, features, model):
+        self.features = features
+        self.centers = normalize(model.cluster_centers_).astype(np.float32)
+        labels = np.asarray(model.labels_)
+        self._order = np.argsort(labels, kind='stable')
+        self._offsets = np.searchsorted(labels[self._order], np.arange(len(self.centers) + 1))
+        self._positions = pd.Series(np.arange(len(features.urls)), index=features.urls)
+        self._issue_counts = features.issue_counts().astype(np.int64)
+
+    def __contains__(self, url):
+        return url in self._positions.index
+
+    def _members(self, cluster):
+        return self._order[self._offsets[cluster]:self._offsets[cluster + 1]]
+
+    def similar(self, url, n=10, n_probe=3):
+        """
+        Return the URLs most similar to an affected URL.
+
+        Parameters
+        ----------
+        url : str
+            Address of an affected URL
+        n : int, optional
+            Number of similar URLs to return
+        n_probe : int, optional
+            Number of nearest clusters searched; more is slower and more exact
+
+        Returns
+        -------
+        pandas.DataFrame
+            Address, cosine similarity, cluster and number of issues of each
+            similar URL, most similar first
+        """
+        if url not in self._positions.index:
+            raise KeyError(f"{url} is not among the affected URLs")
+        position = self._positions[url]
+        query = self.features.matrix[position]
+
+        center_scores = np.asarray(query @ self.centers.T).ravel()
+        clusters = np.argsort(-center_scores)[:n_probe]
+        members = [self._members(cluster) for cluster in clusters]
+        candidates = np.concatenate(members)
+        candidate_clusters = np.repeat(clusters, [len(urls) for urls in members])
+        keep = candidates != position
+        candidates, candidate_clusters = candidates[keep], candidate_clusters[keep]
+
+        scores = (self.features.matrix[candidates] @ query.T).toarray().ravel()
+        best = np.argsort(-scores, kind='stable')[:n]
+        neighbours = candidates[best]
+        return pd.DataFrame({
+            'Address': self.features.urls[neighbours],
+            'Similarity': np.round(scores[best], 4),
+            'Cluster': candidate_clusters[best],
+            'Issues': self._issue_counts[neighbours]
+        })
@@ -1,9 +1,14 @@
 # src/visualization/__init__.py
 from .clustering import plot_elbow, clusters_2D
 from .plotting import plot_top_percentiles
+from .render import histogram, scatter_gl, top_n, top_n_bar
 
 __all__ = [
     'plot_elbow',
     'clusters_2D',
-    'plot_top_percentiles'
+    'plot_top_percentiles',
+    'histogram',
+    'scatter_gl',
+    'top_n',
+    'top_n_bar'
 ]
\ No newline at end of file
@@ -1,10 +1,10 @@
 import matplotlib.pyplot as plt
 import mplcursors
 import numpy as np
-from sklearn.cluster import KMeans
+from ..utils.kmeans import search_k
 
 
-def plot_elbow(embeddings, max_clusters=15):
+def plot_elbow(embeddings, max_clusters=15, show=True, k_search=None):
     """
     Create elbow plot to determine optimal number of clusters
 
@@ -14,19 +14,20 @@ def plot_elbow(embeddings, max_clusters=15):
         The embedded data to cluster
     max_clusters : int, optional (default=15)
         Maximum number of clusters to try
+    show : bool, optional (default=True)
+        Display the plot and print the decreases; set False when running headless
+    k_search : KSearchResult, optional
+        Models already fitted by ``search_k``; fitted here (in parallel on large inputs) if None
 
     Returns:
     --------
-    None
-        Displays the elbow plot
+    list
+        Inertia for each number of clusters from 1 to max_clusters
     """
-    inertias = []
-    K = range(1, max_clusters + 1)
-
-    for k in K:
-        kmeans = KMeans(n_clusters=k, random_state=0, n_init='auto')
-        kmeans.fit(embeddings)
-        inertias.append(kmeans.inertia_)
+    if k_search is None:
+        k_search = search_k(embeddings, k_values=range(1, max_clusters + 1))
+    K = [k for k in k_search.k_values if k <= max_clusters]
+    inertias = [k_search.inertias[k] for k in K]
 
     # Create the elbow plot
     plt.figure(figsize=(8, 5))
@@ -41,15 +42,24 @@ def plot_elbow(embeddings, max_clusters=15):
     # Calculate the percentage decrease in inertia
     decreases = np.diff(inertias) / np.array(inertias)[:-1] * 100
 
+    plt.tight_layout()
+    if not show:
+        plt.close()
+        return inertias
+
     # Print the percentage decrease
     print("\nPercentage decrease in distortion:")
-    for k, decrease in enumerate(decreases, start=1):
+    for k, decrease in zip(K, decreases):
         print(f"From {k} to {k + 1} clusters: {abs(decrease):.1f}% decrease")
+    print(f"\nSuggested number of clusters: {k_search.suggested_k} ({k_search.suggestion_method})")
+    if k_search.inconclusive:
+        print(f"The silhouette score is best at k={k_search.silhouette_k}, on the edge of the searched range; "
+              f"the suggestion falls back to the elbow of the inertia curve.")
 
-    plt.tight_layout()
     plt.show()
+    return inertias
 
-def clusters_2D(x_values, y_values, labels, kmeans_labels):
+def clusters_2D(x_values, y_values, labels, kmeans_labels, show=True):
     """
     Create an interactive scatter plot of clusters with hoverable points
 
@@ -63,9 +73,16 @@ def clusters_2D(x_values, y_values, labels, kmeans_labels):
         DataFrame containing issue information
     kmeans_labels : array-like
         cluster labels from KMeans clustering
+    show : bool, optional (default=True)
+        Display the plot and print cluster statistics; set False when running headless
+
+    Returns:
+    --------
+    matplotlib.figure.Figure
+        The cluster plot
     """
     # Set up the plot with a white background for better visibility
-    plt.figure(figsize=(15, 10))
+    fig = plt.figure(figsize=(15, 10))
     plt.set_cmap('viridis')
 
     # Create scatter plot with different colors for each cluster
@@ -127,6 +144,9 @@ def clusters_2D(x_values, y_values, labels, kmeans_labels):
         )
 
     plt.tight_layout()
+    if not show:
+        return fig
+
     plt.show()
 
     # Print enhanced cluster statistics
@@ -145,4 +165,4 @@ def clusters_2D(x_values, y_values, labels, kmeans_labels):
             print(f"  Type: {issue['Issue Type']}")
             print(f"  Priority: {issue['Issue Priority']}")
 
-
+    return fig
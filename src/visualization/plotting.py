@@ -1,6 +1,6 @@
 import plotly_express as px
 
-def plot_top_percentiles(issues_group, perc_n):
+def plot_top_percentiles(issues_group, perc_n, show=True):
     """
     Plot top issues by percentile of clicks and URLs.
 
@@ -10,10 +10,13 @@ def plot_top_percentiles(issues_group, perc_n):
         DataFrame containing issues data
     perc_n : float
         Percentile value to filter issues by
+    show : bool, optional
+        Display the plots (set False when running headless)
 
     Returns
     -------
-    Plot of top issues by percentile
+    tuple
+        Plots of top issues by percentile of clicks and of URL count
     """
     issues_pct_n_clicks = issues_group[issues_group['pct_rank_clicks'] > perc_n]
     issues_pct_n_clicks = issues_pct_n_clicks[issues_pct_n_clicks['Clicks_gsc'] > perc_n]
@@ -35,7 +38,8 @@ def plot_top_percentiles(issues_group, perc_n):
     fig_clicks.update_layout(
         yaxis_title="Clicks",
     )
-    fig_clicks.show()
+    if show:
+        fig_clicks.show()
 
     fig_url_count = px.bar(issues_pct_n_urls.sort_values('Address', ascending=False),
                    x='Issue Name',
@@ -49,4 +53,7 @@ def plot_top_percentiles(issues_group, perc_n):
     fig_url_count.update_layout(
         yaxis_title="Count",
     )
-    fig_url_count.show()
+    if show:
+        fig_url_count.show()
+
+    return fig_clicks, fig_url_count
@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+# Bounds on what a chart sends to the browser, whatever the number of rows behind it
+DEFAULT_BINS = 50
+TOP_N = 25
+MAX_SCATTER_POINTS = 20_000
+OTHERS_LABEL = 'Others'
+
+
+def sample_positions(n_rows, max_points=MAX_SCATTER_POINTS, random_state=0):
+    """
+    Return the sorted positions of a uniform sample of at most ``max_points`` rows.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows to sample from
+    max_points : int, optional
+        Largest sample; every row is kept if None
+    random_state : int, optional
+        Seed of the sample, so reruns plot the same points
+
+    Returns
+    -------
+    numpy.ndarray
+        Row positions, in their original order
+    """
+    positions = np.arange(n_rows)
+    if max_points is None or n_rows <= max_points:
+        return positions
+    return np.sort(np.random.default_rng(random_state).choice(positions, max_points, replace=False))
+
+
+def bin_counts(df, x, color=None, bins=DEFAULT_BINS):
+    """
+    Count the rows of a numeric column per bin (and per color group), server-side.
+
+    All groups share the same equal-width bins, so their bars stack.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Rows to count
+    x : str
+        Numeric column to bin
+    color : str, optional
+        Column splitting the counts into groups
+    bins : int, optional
+        Number of bins
+
+    Returns
+    -------
+    counts : pandas.DataFrame
+        One row per non-empty bin (and group) with the bin center in ``x``,
+        ``color`` and 'count'
+    width : float
+        Width of the bins
+    """
+    values = df[x].to_numpy(dtype=np.float64, na_value=np.nan)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return pd.DataFrame(columns=[x, color, 'count'] if color else [x, 'count']), 1.0
+    edges = np.histogram_bin_edges(values[finite], bins=bins)
+    # The last bin is closed on the right, as in numpy.histogram
+    positions = np.clip(np.searchsorted(edges, values[finite], side='right') - 1, 0, len(edges) - 2)
+    centers = (edges[:-1] + edges[1:]) / 2
+    keys = {x: centers[positions]}
+    if color:
+        keys[color] = df[color].to_numpy()[finite]
+    counts = pd.DataFrame(keys).groupby(list(keys), observed=True, dropna=False).size()
+    return counts.rename('count').reset_index(), float(edges[1] - edges[0]) or 1.0
+
+
+def category_counts(df, x, color=None):
+    """
+    Count the rows of each value of a discrete column (and color group), server-side.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Rows to count
+    x : str
+        Discrete column, e.g. status codes
+    color : str, optional
+        Column splitting the counts into groups
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per value (and group) with ``x``, ``color`` and 'count', sorted by ``x``
+    """
+    keys = [x, color] if color else [x]
+    counts = df.groupby(keys, observed=True).size().rename('count').reset_index()
+    return counts.sort_values(keys, ignore_index=True)
+
+
+def histogram(df, x, color=None, bins=DEFAULT_BINS, discrete=False, **kwargs):
+    """
+    Histogram binned server-side: the browser receives bin counts, not rows.
+
+    A drop-in for ``plotly.express.histogram`` on large frames; the payload
+    grows with the number of bins (or distinct values) and groups only.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Rows to count
+    x : str
+        Column to count
+    color : str, optional
+        Column splitting the bars into stacked groups
+    bins : int, optional
+        Number of bins of a numeric column
+    discrete : bool, optional
+        Count each value of ``x`` (e.g. status codes) instead of binning it
+    **kwargs
+        Passed to ``plotly.express.bar`` (title, size, colors, ...)
+
+    Returns
+    -------
+    plotly.graph_objects.Figure
+        The histogram
+    """
+    if discrete:
+        counts = category_counts(df, x, color)
+        fig = px.bar(counts, x=x, y='count', color=color, **kwargs)
+    else:
+        counts, width = bin_counts(df, x, color, bins)
+        fig = px.bar(counts, x=x, y='count', color=color, **kwargs)
+        fig.update_traces(width=width)
+        fig.update_layout(bargap=0)
+    fig.update_layout(yaxis_title='count')
+    return fig
+
+
+def top_n(df, value, label, n=TOP_N, agg='sum', others_label=OTHERS_LABEL):
+    """
+    Keep the ``n`` rows with the largest ``value`` and fold the rest into one row.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        One row per bar
+    value : str
+        Column the rows are ranked and aggregated by
+    label : str
+        Column naming each bar; the folded row is labelled "Others (k)"
+    n : int, optional
+        Number of rows kept
+    agg : str, optional
+        How the folded rows' values are combined ('sum', 'mean', 'max', ...)
+    others_label : str, optional
+        Label of the folded row
+
+    Returns
+    -------
+    pandas.DataFrame
+        At most ``n + 1`` rows with ``label`` and ``value``, largest first and the
+        folded row last
+    """
+    ranked = df[[label, value]].sort_values(value, ascending=False, kind='stable')
+    top, rest = ranked.iloc[:n], ranked.iloc[n:]
+    if rest.empty:
+        return top.reset_index(drop=True)
+    others = pd.DataFrame({label: [f'{others_label} ({len(rest):,})'], value: [rest[value].agg(agg)]})
+    return pd.concat([top.astype({label: object}), others], ignore_index=True)
+
+
+def top_n_bar(df, value, label, n=TOP_N, agg='sum', orientation='h', **kwargs):
+    """
+    Bar chart of the top ``n`` rows by ``value``, with the others in one bar.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        One row per bar
+    value : str
+        Column drawn as the bar length
+    label : str
+        Column naming each bar
+    n : int, optional
+        Number of bars besides the "Others" bar
+    agg : str, optional
+        How the values of the folded rows are combined
+    orientation : str, optional
+        'h' for horizontal bars (largest on top) or 'v'
+    **kwargs
+        Passed to ``plotly.express.bar``
+
+    Returns
+    -------
+    plotly.graph_objects.Figure
+        The bar chart
+    """
+    bars = top_n(df, value, label, n=n, agg=agg)
+    if orientation == 'h':
+        # Horizontal bars are drawn bottom-up: the "Others" bar last, the largest on top
+        bars = bars.iloc[::-1]
+        return px.bar(bars, x=value, y=label, orientation='h', **kwargs)
+    return px.bar(bars, x=label, y=value, **kwargs)
+
+
+def scatter_gl(df, x, y, max_points=MAX_SCATTER_POINTS, random_state=0, **kwargs):
+    """
+    WebGL scatter plot (``scattergl``) of at most ``max_points`` rows.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Points to plot
+    x, y : str
+        Coordinate columns
+    max_points : int, optional
+        Larger frames are plotted from a uniform sample (see :func:`sample_positions`)
+    random_state : int, optional
+        Seed of the sample
+    **kwargs
+        Passed to ``plotly.express.scatter`` (color, hover_data, title, ...)
+
+    Returns
+    -------
+    plotly.graph_objects.Figure
+        The scatter plot
+    """
+    plotted = sample_positions(len(df), max_points, random_state)
+    if len(plotted) < len(df):
+        df = df.iloc[plotted]
+    return px.scatter(df, x=x, y=y, render_mode='webgl', **kwargs)
+
+
+def payload_bytes(fig):
+    """Return the size of the JSON a figure sends to the browser"""
+    return len(fig.to_json())
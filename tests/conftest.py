@@ -0,0 +1,29 @@
+import os
+import pytest
+from benchmarks.synthetic import generate_crawl
+from src.data import load_gsc, load_issues_dir, load_issues_overview
+
+
+def load_crawl(crawl_dir):
+    """Load a crawl folder as the app and the CLI do"""
+    issues_df, errors = load_issues_dir(os.path.join(crawl_dir, 'issues_reports'), max_workers=1)
+    assert errors == []
+    return {
+        'issues_report': load_issues_overview(os.path.join(crawl_dir, 'issues_overview_report.csv')),
+        'gsc_df': load_gsc(os.path.join(crawl_dir, 'search_console_all.csv')),
+        'issues_df': issues_df
+    }
+
+
+@pytest.fixture(scope='session')
+def crawl_dir(tmp_path_factory):
+    """A small synthetic Screaming Frog crawl folder"""
+    directory = str(tmp_path_factory.mktemp('crawl'))
+    generate_crawl(directory, 3_000, inlinks_per_url=1, seed=1)
+    return directory
+
+
+@pytest.fixture
+def crawl(crawl_dir):
+    """The loaded frames of the synthetic crawl, fresh for each test"""
+    return load_crawl(crawl_dir)
@@ -0,0 +1,27 @@
+import pandas as pd
+from src.data import apply_schema, build_gsc_index, merge_gsc_metrics
+from src.data.cleaning import aggregate_issues
+
+
+def make_gsc(rows):
+    return apply_schema(pd.DataFrame(rows, columns=['Address', 'Clicks', 'Impressions', 'CTR', 'Position']), 'gsc_df')
+
+
+def make_issues(pairs):
+    return apply_schema(pd.DataFrame(pairs, columns=['Address', 'issue']), 'issues_df')
+
+
+def test_merge_keeps_exported_decimals():
+    gsc_df = make_gsc([('https://example.com/a', 3, 110, 0.027272727, 48.02)])
+    merged = merge_gsc_metrics(make_issues([('https://example.com/a', 'x')]), build_gsc_index(gsc_df))
+    assert merged['Position_gsc'].tolist() == [48.02]
+    assert merged['CTR_gsc'].tolist() == [0.027272727]
+
+
+def test_aggregate_sums_past_float32_precision():
+    urls = [f'https://example.com/{i}' for i in range(3)]
+    gsc_df = make_gsc([(url, 2 ** 24 + 1, 2 ** 24 + 1, 1.0, 1.0) for url in urls])
+    merged = merge_gsc_metrics(make_issues([(url, 'x') for url in urls]), build_gsc_index(gsc_df))
+    issues_group = aggregate_issues(merged)
+    assert issues_group['Clicks_gsc'].tolist() == [3 * (2 ** 24 + 1)]
+    assert issues_group['Impressions_gsc'].tolist() == [3 * (2 ** 24 + 1)]
@@ -0,0 +1,37 @@
+import numpy as np
+from src.utils.embedding_cache import EmbeddingCache
+
+
+def test_cache_persists_across_instances(tmp_path):
+    vectors = np.arange(6, dtype=np.float32).reshape(3, 2)
+    EmbeddingCache('model-a', directory=str(tmp_path)).add(['Missing H1', 'Slow Page', 'Missing Alt Text'], vectors)
+
+    cache = EmbeddingCache('model-a', directory=str(tmp_path))
+    assert len(cache) == 3
+    found, missing = cache.lookup(['Slow Page', 'Not Cached', '  Missing   H1 '])
+    assert missing == [1]
+    np.testing.assert_array_equal(found[[0, 2]], vectors[[1, 0]])
+    np.testing.assert_array_equal(found[1], [0, 0])
+
+
+def test_cache_misses(tmp_path):
+    cache = EmbeddingCache('model-a', directory=str(tmp_path))
+    assert cache.lookup(['Missing H1']) == (None, [0])
+    cache.add(['Missing H1'], np.ones((1, 2)))
+    assert cache.lookup(['Slow Page']) == (None, [0])
+
+
+def test_cache_is_per_model(tmp_path):
+    EmbeddingCache('model-a', directory=str(tmp_path)).add(['Missing H1'], np.ones((1, 2)))
+    other = EmbeddingCache('model-b', directory=str(tmp_path))
+    assert len(other) == 0
+    assert other.lookup(['Missing H1']) == (None, [0])
+
+
+def test_add_keeps_existing_vectors(tmp_path):
+    cache = EmbeddingCache('model-a', directory=str(tmp_path))
+    cache.add(['Missing H1'], np.ones((1, 2)))
+    cache.add(['Missing H1', 'Slow Page'], np.full((2, 2), 5.0))
+    found, missing = EmbeddingCache('model-a', directory=str(tmp_path)).lookup(['Missing H1', 'Slow Page'])
+    assert missing == []
+    np.testing.assert_array_equal(found, [[1, 1], [5, 5]])
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.utils.embeddings import EMBEDDING_DIM, encode_texts, generate_embeddings
+from src.utils.kmeans import project_2d, search_k
+
+
+class RecordingModel:
+    """Stands in for a SentenceTransformer and records torch's thread count while encoding"""
+
+    def encode(self, texts, **kwargs):
+        import torch
+        self.threads = torch.get_num_threads()
+        return np.zeros((len(texts), 4))
+
+
+def test_encode_texts_restores_thread_count():
+    torch = pytest.importorskip('torch')
+    previous = torch.get_num_threads()
+    model = RecordingModel()
+    embeddings = encode_texts(['Missing H1', 'Slow Page'], model=model, num_threads=1)
+    assert model.threads == 1
+    assert torch.get_num_threads() == previous
+    assert embeddings.dtype == np.float32 and embeddings.shape == (2, 4)
+
+
+ISSUE_NAMES = ['Page Titles: Missing', 'Page Titles: Duplicate', 'Meta Description: Missing',
+               'Meta Description: Duplicate', 'H1: Missing', 'H1: Multiple', 'Images: Missing Alt Text',
+               'Security: Missing HSTS Header', 'Security: Missing X-Frame-Options Header', 'URL: Uppercase']
+
+
+def test_tfidf_fallback_stays_sparse():
+    embeddings = generate_embeddings(ISSUE_NAMES, backend='tfidf', sparse=True)
+    assert sparse.isspmatrix_csr(embeddings)
+    assert embeddings.dtype == np.float32
+    # One column per vocabulary term, not padded to the transformer's 384 dimensions
+    vocabulary = TfidfVectorizer().fit(ISSUE_NAMES).vocabulary_
+    assert embeddings.shape == (len(ISSUE_NAMES), len(vocabulary))
+
+    # The k search and the 2D projection take the sparse matrix as is
+    k_search = search_k(embeddings, k_values=range(2, 6))
+    assert k_search.k_values == [2, 3, 4, 5]
+    assert len(k_search.labels(k_search.suggested_k)) == len(ISSUE_NAMES)
+    assert project_2d(embeddings).shape == (len(ISSUE_NAMES), 2)
+
+
+def test_tfidf_fallback_dense_is_padded():
+    embeddings = generate_embeddings(ISSUE_NAMES, backend='tfidf')
+    assert isinstance(embeddings, np.ndarray)
+    assert embeddings.shape == (len(ISSUE_NAMES), EMBEDDING_DIM)
@@ -0,0 +1,71 @@
+import io
+import pandas as pd
+import pytest
+from src.utils.excel import MAX_SHEET_ROWS, XLSXWRITER_AVAILABLE, ExcelWorkbook
+
+ENGINES = ['openpyxl'] + (['xlsxwriter'] if XLSXWRITER_AVAILABLE else [])
+
+
+def read_sheets(buffer):
+    return pd.read_excel(io.BytesIO(buffer.getvalue()), sheet_name=None)
+
+
+def test_row_limit_matches_xlsxwriter():
+    xlsxwriter = pytest.importorskip('xlsxwriter')
+    worksheet = xlsxwriter.Workbook(io.BytesIO()).add_worksheet()
+    assert MAX_SHEET_ROWS == worksheet.xls_rowmax
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_oversized_sheet_is_split(engine):
+    df = pd.DataFrame({'Address': [f'https://example.com/{i}' for i in range(10)], 'n': range(10)})
+    buffer = io.BytesIO()
+    with ExcelWorkbook(buffer, engine=engine, max_rows=5) as workbook:
+        name = workbook.write_sheet(df, 'High_Priority')
+    assert name == 'High_Priority'
+    assert workbook.split_sheets == {'High_Priority': ['High_Priority', 'High_Priority (2)', 'High_Priority (3)']}
+    sheets = read_sheets(buffer)
+    assert list(sheets) == ['High_Priority', 'High_Priority (2)', 'High_Priority (3)']
+    assert pd.concat(sheets.values(), ignore_index=True)['n'].tolist() == list(range(10))
+
+
+def test_split_sheet_names_fit_excel_limit():
+    df = pd.DataFrame({'n': range(3)})
+    with ExcelWorkbook(io.BytesIO(), max_rows=2) as workbook:
+        workbook.write_sheet(df, 'x' * 40)
+    names = workbook.split_sheets['x' * 31]
+    assert len(names) == 3
+    assert all(len(name) <= 31 for name in names)
+    assert names[2].endswith(' (3)')
+
+
+def test_oversized_sheet_raises():
+    df = pd.DataFrame({'n': range(5)})
+    with ExcelWorkbook(io.BytesIO(), overflow='raise', max_rows=5) as workbook:
+        workbook.write_sheet(df.head(4), 'fits')
+        with pytest.raises(ValueError, match="at most 4 rows"):
+            workbook.write_sheet(df, 'too_big')
+
+
+def test_sheet_at_limit_is_not_split():
+    df = pd.DataFrame({'n': range(4)})
+    buffer = io.BytesIO()
+    with ExcelWorkbook(buffer, max_rows=5) as workbook:
+        workbook.write_sheet(df, 'exact')
+    assert workbook.split_sheets == {}
+    assert read_sheets(buffer)['exact']['n'].tolist() == [0, 1, 2, 3]
+
+
+def test_export_streamlit_data_outside_streamlit():
+    from src.utils.export import export_streamlit_data
+    issues_group = pd.DataFrame({'issue': ['missing_h1', 'slow_page'], 'Issue Name': ['Missing H1', 'Slow Page'],
+                                 'Impact_Score': [0.9, 0.1], 'Impact_Score_Quadrant': ['High', 'Low']})
+    issues_df = pd.DataFrame({'Address': ['https://example.com/a', 'https://example.com/b'],
+                              'issue': ['missing_h1', 'slow_page'], 'Clicks_gsc': [3.0, 1.0]})
+    excel_data, exported_count, split_sheets = export_streamlit_data(issues_group, issues_df, 0.5)
+    assert exported_count == 1 and split_sheets == {}
+    assert 'High_missing_h1' in pd.read_excel(io.BytesIO(excel_data), sheet_name=None)
+
+    # Failures reach the caller instead of being reported through Streamlit
+    with pytest.raises(KeyError):
+        export_streamlit_data(issues_group.drop(columns='Impact_Score'), issues_df, 0.5)
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from src.data import build_gsc_index
+from src.data.urls import canonicalize_url, canonicalize_urls
+
+
+def make_gsc():
+    return pd.DataFrame({
+        'Address': ['https://example.com/a', 'https://example.com/b/'],
+        'Clicks': [3, 5],
+        'Impressions': [30, 50],
+        'CTR': [0.1, 0.1],
+        'Position': [1.5, 2.5]
+    })
+
+
+def test_lookup_does_not_intern_unknown_urls():
+    gsc_index = build_gsc_index(make_gsc())
+    size = len(gsc_index.interner)
+    positions = gsc_index.positions(['https://example.com/x', 'https://example.com/a', None])
+    assert positions.tolist() == [-1, 0, -1]
+    assert len(gsc_index.interner) == size
+
+
+def test_lookup_matches_canonical_urls():
+    gsc_index = build_gsc_index(make_gsc())
+    metrics = gsc_index.lookup(['https://EXAMPLE.com/b?utm_source=x', 'https://example.com/missing'])
+    assert metrics['Clicks'][0] == 5
+    assert np.isnan(metrics['Clicks'][1])
+    assert 'https://example.com/b' in gsc_index
+
+
+def test_interner_is_frozen_after_build():
+    gsc_index = build_gsc_index(make_gsc())
+    interner = gsc_index.interner
+    assert interner.frozen
+    raw_seen = len(interner._raw)
+    gsc_index.positions(['https://example.com/a/', 'https://example.com/new'])
+    assert len(interner._raw) == raw_seen
+    with pytest.raises(RuntimeError):
+        interner.intern(['https://example.com/new'])
+
+
+def test_concurrent_lookups_agree():
+    gsc_index = build_gsc_index(make_gsc())
+    urls = [f'https://example.com/{name}' for name in ('a', 'b', 'c', 'a/', 'B')] * 200
+    expected = gsc_index.positions(urls).tolist()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: gsc_index.positions(urls).tolist(), range(32)))
+    assert all(result == expected for result in results)
+
+
+def test_canonicalize_url():
+    assert canonicalize_url(' HTTPS://Example.COM:443/Path/?utm_source=x&id=1#top') == 'https://example.com/Path?id=1'
+    assert canonicalize_url('http://example.com') == 'http://example.com/'
+    assert canonicalize_url('https://example.com/?gclid=1') == 'https://example.com/'
+    assert canonicalize_url('https://example.com:8443/a/') == 'https://example.com:8443/a'
+
+
+def test_vectorized_canonicalization_matches_scalar():
+    urls = ['https://example.com/a/', 'https://example.com/', 'HTTP://x.com/b?utm_medium=y', 'https://x.com//c/',
+            'https://x.com/d#f', None, 'relative/path/', 'https://x.com/e?a=1&&b=2']
+    expected = [canonicalize_url(url) for url in urls]
+    assert canonicalize_urls(urls).tolist() == expected
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+import numpy as np
+from src.utils.kmeans import KSearchResult, search_k
+
+
+def k_search(silhouettes, n_samples=None):
+    # Inertia falls steeply up to k=4, then flattens: the elbow is at k=4
+    inertias = {2: 100.0, 3: 60.0, 4: 20.0, 5: 18.0, 6: 16.0, 7: 14.0, 8: 12.0}
+    models = {k: SimpleNamespace(inertia_=inertia) for k, inertia in inertias.items()}
+    return KSearchResult(models, silhouettes, n_samples)
+
+
+def test_best_silhouette_inside_the_range():
+    result = k_search({2: 0.1, 3: 0.2, 4: 0.4, 5: 0.3, 6: 0.2, 7: 0.1, 8: 0.1})
+    assert not result.inconclusive
+    assert result.suggested_k == 4 and result.suggestion_method == 'silhouette'
+
+
+def test_best_silhouette_on_the_upper_bound_falls_back_to_the_elbow():
+    result = k_search({k: 0.1 * k for k in range(2, 9)}, n_samples=40)
+    assert result.silhouette_k == 8 and result.inconclusive
+    assert result.suggested_k == result.elbow_k() == 4
+    assert result.suggestion_method == 'elbow'
+
+
+def test_upper_bound_is_conclusive_when_no_larger_k_exists():
+    result = k_search({k: 0.1 * k for k in range(2, 9)}, n_samples=9)
+    assert not result.inconclusive
+    assert result.suggested_k == 8
+
+
+def test_search_k_records_the_number_of_samples():
+    points = np.random.default_rng(0).normal(size=(30, 5))
+    result = search_k(points, k_values=range(2, 6))
+    assert result.n_samples == 30
+    assert result.suggested_k in result.k_values
@@ -0,0 +1,31 @@
+import pandas as pd
+from src.data import build_gsc_index, label_status_groups, summarize_status_groups
+
+
+def test_status_groups_keep_export_columns():
+    all_inlinks = pd.DataFrame({
+        'Type': ['Hyperlink'] * 4,
+        'Source': ['https://example.com/'] * 4,
+        'Destination': ['https://example.com/a', 'https://example.com/a', 'https://example.com/b/', 'https://example.com/c'],
+        'Anchor': ['a', 'a', 'b', 'c'],
+        'Status Code': [404, 404, 301, 200]
+    })
+    gsc_df = pd.DataFrame({
+        'Address': ['https://example.com/b', 'https://example.com/c'],
+        'Clicks': [7, 9], 'Impressions': [70, 90], 'CTR': [0.1, 0.1], 'Position': [3.0, 1.0]
+    })
+    results = summarize_status_groups(label_status_groups(all_inlinks), build_gsc_index(gsc_df))
+    by_status = {result['status']: result for result in results}
+    assert list(by_status) == ['Client Error', 'Redirect']
+
+    data = by_status['Redirect']['data']
+    assert list(data.columns) == ['Type', 'Source', 'Destination', 'Anchor', 'Status Code_inlinks', 'status_group',
+                                  'Address', 'Clicks', 'Impressions', 'CTR', 'Position']
+    assert data['Address'].tolist() == ['https://example.com/b']
+    assert data['Clicks'].tolist() == [7]
+
+    client_errors = by_status['Client Error']
+    assert len(client_errors['data']) == 2
+    assert len(client_errors['unique_data']) == 1
+    assert client_errors['data']['Clicks'].tolist() == [0, 0]
+    assert (client_errors['with_traffic'], client_errors['without_traffic']) == (0, 1)
@@ -0,0 +1,115 @@
+import io
+import pandas as pd
+import pytest
+from src.data import (
+    CrawlIndex,
+    detect_encoding,
+    concat_frames,
+    issues_from_frames,
+    load_issue_reports,
+    load_issues_dir,
+    read_csv_streaming,
+    read_issues_dir
+)
+from src.data.loading import ENCODING_SAMPLE_SIZE
+
+
+def write_issue_files(directory):
+    """Write two issue exports whose headers differ beyond Address"""
+    pd.DataFrame({
+        'Address': ['https://example.com/a', 'https://example.com/b'],
+        'Title 1': ['A', 'B']
+    }).to_csv(directory / 'a_titles.csv', index=False)
+    pd.DataFrame({
+        'Address': ['https://example.com/b', 'https://example.com/c'],
+        'Meta Description 1': [None, None],
+        'Indexability': ['Indexable', 'Non-Indexable']
+    }).to_csv(directory / 'b_meta_missing.csv', index=False)
+
+
+def test_concat_frames_keeps_union_of_columns():
+    first = pd.DataFrame({'Address': pd.Categorical(['a']), 'x': [1]})
+    second = pd.DataFrame({'Address': pd.Categorical(['b']), 'y': ['z']})
+    df = concat_frames([first, second])
+    assert list(df.columns) == ['Address', 'x', 'y']
+    assert isinstance(df['Address'].dtype, pd.CategoricalDtype)
+    assert df['Address'].tolist() == ['a', 'b']
+    assert df['y'].isna().tolist() == [True, False]
+
+
+def test_concat_frames_shared_categorical_only_when_categorical_everywhere():
+    first = pd.DataFrame({'col': pd.Categorical(['a'])})
+    second = pd.DataFrame({'col': ['b']})
+    assert concat_frames([first, second])['col'].tolist() == ['a', 'b']
+
+
+def test_load_issue_reports_heterogeneous_files(tmp_path):
+    write_issue_files(tmp_path)
+    issues_df, errors = load_issues_dir(str(tmp_path), columns=None, max_workers=1)
+    assert errors == []
+    assert {'Address', 'Title 1', 'Meta Description 1', 'Indexability', 'issue'} <= set(issues_df.columns)
+    meta = issues_df[issues_df['issue'] == 'b_meta_missing']
+    assert meta['Indexability'].tolist() == ['Indexable', 'Non-Indexable']
+    assert issues_df.groupby('issue', observed=True).size().to_dict() == {'a_titles': 2, 'b_meta_missing': 2}
+
+
+def test_load_issue_reports_default_columns(tmp_path):
+    write_issue_files(tmp_path)
+    paths = [str(tmp_path / 'a_titles.csv'), str(tmp_path / 'b_meta_missing.csv')]
+    issues_df, errors = load_issue_reports(paths)
+    assert errors == []
+    assert list(issues_df.columns) == ['Address', 'issue']
+    assert len(issues_df) == 4
+    assert issues_df['Address'].nunique() == 3
+
+
+def test_crawl_index_keeps_each_issue_header(tmp_path):
+    write_issue_files(tmp_path)
+    index = CrawlIndex.from_dir(str(tmp_path), max_workers=1)
+    assert list(index.get('b_meta_missing').columns) == ['Meta Description 1', 'Indexability']
+    assert list(index.get('a_titles').columns) == ['Title 1']
+    rows = pd.DataFrame({'Address': ['https://example.com/c', 'https://example.com/x']})
+    enriched = index.enrich(rows, 'b_meta_missing')
+    assert enriched['Indexability'].tolist()[0] == 'Non-Indexable'
+    assert enriched['Indexability'].isna().tolist() == [False, True]
+
+
+def test_read_issue_reports_frames_keep_their_header(tmp_path):
+    write_issue_files(tmp_path)
+    issue_frames, errors = read_issues_dir(str(tmp_path), columns=None, max_workers=1)
+    assert errors == []
+    assert [(issue, list(frame.columns)) for issue, frame in issue_frames] == [
+        ('a_titles', ['Address', 'Title 1']),
+        ('b_meta_missing', ['Address', 'Meta Description 1', 'Indexability'])
+    ]
+    issues_df = issues_from_frames(issue_frames, columns=['Address'])
+    assert list(issues_df.columns) == ['Address', 'issue']
+    assert len(issues_df) == 4
+
+
+def write_latin1_export(path, n_rows):
+    """An export in latin-1 whose only non-ASCII byte comes after the encoding sample"""
+    rows = [f'https://example.com/{i},{i}' for i in range(n_rows)]
+    text = 'Address,Clicks\n' + '\n'.join(rows) + '\nhttps://example.com/café,7\n'
+    path.write_bytes(text.encode('latin-1'))
+    assert len(text) > ENCODING_SAMPLE_SIZE
+
+
+def test_latin1_past_the_encoding_sample(tmp_path):
+    path = tmp_path / 'search_console_all.csv'
+    write_latin1_export(path, 5_000)
+    assert detect_encoding(str(path)) == 'utf-8'
+
+    # Strictly decoded and re-read as latin-1, both from a path and from an upload buffer
+    for source in [str(path), io.BytesIO(path.read_bytes())]:
+        df = read_csv_streaming(source, chunksize=1_000)
+        assert len(df) == 5_001
+        assert df['Address'].iloc[-1] == 'https://example.com/café'
+        assert not df['Address'].str.contains('�').any()
+
+
+def test_explicit_encoding_is_strict(tmp_path):
+    path = tmp_path / 'search_console_all.csv'
+    write_latin1_export(path, 5_000)
+    with pytest.raises(UnicodeDecodeError):
+        read_csv_streaming(str(path), encoding='utf-8')
@@ -0,0 +1,44 @@
+import pytest
+from src.utils import models
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Replace the sentence-transformer loader and record the sources it is called with"""
+    calls = []
+
+    def load_encoder(source):
+        calls.append(source)
+        if source == 'offline-model':
+            raise OSError('no network')
+        return object()
+
+    monkeypatch.setattr(models, '_load_encoder', load_encoder)
+    monkeypatch.delenv(models.MODEL_PATH_ENV, raising=False)
+    models.reset_registry()
+    yield calls
+    models.reset_registry()
+
+
+def test_encoder_is_loaded_once(loads):
+    first = models.get_encoder('some-model')
+    assert models.get_encoder('some-model') is first
+    assert loads == ['some-model']
+
+
+def test_failed_load_is_not_retried(loads):
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="Could not load model 'offline-model'"):
+            models.get_encoder('offline-model')
+    assert loads == ['offline-model']
+
+    # Until the registry is reset, e.g. once the network is back
+    models.reset_registry()
+    with pytest.raises(RuntimeError):
+        models.get_encoder('offline-model')
+    assert loads == ['offline-model', 'offline-model']
+
+
+def test_local_path_overrides_model_name(loads):
+    models.get_encoder('some-model', local_path='/models/minilm')
+    assert loads == ['/models/minilm']
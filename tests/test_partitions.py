@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data import partition_issues
+
+
+@pytest.fixture
+def issues_df():
+    issues = ['h1_missing', 'slow_page', 'h1_missing', None, 'title_long', 'slow_page', 'h1_missing', 'slow_page']
+    return pd.DataFrame({
+        'Address': [f'https://example.com/{i}' for i in range(len(issues))],
+        # 'no_rows' is a category without any row
+        'issue': pd.Categorical(issues, categories=['h1_missing', 'no_rows', 'slow_page', 'title_long']),
+        'Clicks_gsc': [3.0, np.nan, 9.0, 1.0, 4.0, 2.0, 3.0, 7.0]
+    }, index=np.arange(100, 108))
+
+
+def test_slices_keep_original_order_without_sort(issues_df):
+    partitions = partition_issues(issues_df, sort_by=None)
+    for name in ['h1_missing', 'slow_page', 'title_long', 'no_rows']:
+        pd.testing.assert_frame_equal(partitions.get(name), issues_df[issues_df['issue'] == name])
+    assert partitions.size('title_long') == 1
+    assert partitions.get('no_rows').empty and 'no_rows' not in partitions
+    assert partitions.get('unknown').empty
+    assert len(partitions) == 3
+
+
+def test_slices_sorted_by_clicks(issues_df):
+    partitions = partition_issues(issues_df)
+    for name in ['h1_missing', 'slow_page', 'title_long']:
+        expected = issues_df[issues_df['issue'] == name].sort_values(
+            'Clicks_gsc', ascending=False, kind='stable', na_position='last')
+        pd.testing.assert_frame_equal(partitions.get(name), expected)
+    # Ties keep their original order; missing clicks sort last
+    assert partitions.get('h1_missing').index.tolist() == [102, 100, 106]
+    assert partitions.get('slow_page').index.tolist() == [107, 105, 101]
+    assert sum(partitions.size(name) for name in partitions) == issues_df['issue'].notna().sum()
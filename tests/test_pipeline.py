@@ -0,0 +1,33 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from src import pipeline
+
+
+def test_batch_report_with_non_json_values(tmp_path, monkeypatch):
+    def run_audit(crawl_dir, output_dir, **kwargs):
+        return {'crawl_dir': crawl_dir, 'issues': np.int64(3), 'finished': pd.Timestamp('2024-01-01')}
+
+    monkeypatch.setattr(pipeline, 'run_audit', run_audit)
+    reports = pipeline.run_batch([str(tmp_path / 'site-a')], str(tmp_path / 'out'), max_workers=1)
+    with open(tmp_path / 'out' / 'batch_report.json', encoding='utf-8') as f:
+        written = json.load(f)
+    assert written == [{'crawl_dir': str(tmp_path / 'site-a'), 'issues': '3', 'finished': '2024-01-01 00:00:00'}]
+    assert reports[0]['issues'] == 3
+
+
+def test_batch_run_with_snapshots(crawl_dir, tmp_path):
+    output_root, snapshot_root = str(tmp_path / 'out'), str(tmp_path / 'snapshots')
+    name = os.path.basename(crawl_dir)
+    for _ in range(2):
+        reports = pipeline.run_batch([crawl_dir], output_root, max_workers=1, snapshot_root=snapshot_root)
+        assert 'error' not in reports[0], reports[0].get('traceback')
+
+    output_dir = os.path.join(output_root, name)
+    for filename in ['issues_analysis_results.xlsx', 'internal_links_analysis.xlsx', 'timings.json']:
+        assert os.path.isfile(os.path.join(output_dir, filename))
+    # The second run is diffed against the first, which it matches
+    changes = pd.read_csv(os.path.join(output_dir, 'issue_changes.csv'))
+    assert set(changes['Status']) == {'unchanged'}
+    assert len(changes) == reports[0]['issues']
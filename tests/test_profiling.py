@@ -0,0 +1,26 @@
+import pandas as pd
+from src.utils.profiling import Profiler, profiled
+
+
+def recorded_rows(func, *args):
+    profiler = Profiler()
+    with profiler.activate():
+        func(*args)
+    return profiler.records[0]['rows']
+
+
+def test_profiled_counts_frame_rows():
+    frame = profiled()(lambda n: pd.DataFrame({'a': range(n)}))
+    assert recorded_rows(frame, 5) == 5
+
+
+def test_profiled_does_not_count_bytes_or_tuples():
+    workbook = profiled()(lambda: b'PK\x03\x04' * 100)
+    workbook_and_sheets = profiled()(lambda: (b'PK\x03\x04', {}))
+    assert recorded_rows(workbook) is None
+    assert recorded_rows(workbook_and_sheets) is None
+
+
+def test_profiled_explicit_rows():
+    export = profiled(rows=lambda result: result[1])(lambda: (b'PK\x03\x04', 42))
+    assert recorded_rows(export) == 42
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from src.visualization.render import (
+    MAX_SCATTER_POINTS,
+    bin_counts,
+    category_counts,
+    histogram,
+    payload_bytes,
+    sample_positions,
+    scatter_gl,
+    top_n,
+    top_n_bar
+)
+
+
+def scores(n_rows):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Impact_Score': rng.uniform(0, 100, n_rows),
+        'Quadrant': rng.choice(['High', 'Medium', 'Low', 'Backlog'], n_rows)
+    })
+
+
+def test_bin_counts_preserve_totals():
+    df = scores(100_000)
+    df.loc[:9, 'Impact_Score'] = np.nan
+    counts, width = bin_counts(df, 'Impact_Score', bins=20)
+    assert len(counts) <= 20
+    assert counts['count'].sum() == 100_000 - 10
+    expected = np.histogram(df['Impact_Score'].dropna(), bins=20)[0]
+    np.testing.assert_array_equal(counts['count'], expected[expected > 0])
+    assert width > 0
+
+    grouped, _ = bin_counts(df, 'Impact_Score', color='Quadrant', bins=20)
+    assert len(grouped) <= 20 * 4
+    assert grouped['count'].sum() == 100_000 - 10
+    assert grouped.groupby('Quadrant')['count'].sum().to_dict() == df.dropna()['Quadrant'].value_counts().to_dict()
+
+
+def test_histogram_payload_does_not_grow_with_rows():
+    small, large = histogram(scores(1_000), 'Impact_Score'), histogram(scores(200_000), 'Impact_Score')
+    assert payload_bytes(large) < 2 * payload_bytes(small)
+    assert sum(trace.y.sum() for trace in large.data) == 200_000
+
+
+def test_category_counts_preserve_totals():
+    df = pd.DataFrame({'Status Code': [404, 404, 500, 301, 404], 'group': list('aabab')})
+    counts = category_counts(df, 'Status Code', color='group')
+    assert counts['count'].sum() == len(df)
+    assert counts['Status Code'].is_monotonic_increasing
+
+
+def test_top_n_folds_the_rest():
+    df = pd.DataFrame({'Issue Name': [f'Issue {i}' for i in range(40)], 'Clicks_gsc': np.arange(40.0)})
+    bars = top_n(df, 'Clicks_gsc', 'Issue Name', n=10)
+    assert len(bars) == 11
+    assert bars['Clicks_gsc'].iloc[:10].tolist() == list(np.arange(39.0, 29.0, -1))
+    assert bars['Issue Name'].iloc[-1] == 'Others (30)'
+    assert bars['Clicks_gsc'].sum() == df['Clicks_gsc'].sum()
+
+    # No "Others" row when everything fits
+    assert len(top_n(df.head(5), 'Clicks_gsc', 'Issue Name', n=10)) == 5
+    assert len(top_n_bar(df, 'Clicks_gsc', 'Issue Name', n=10).data[0].y) == 11
+
+
+def test_scatter_is_sampled():
+    assert len(sample_positions(10, max_points=20)) == 10
+    positions = sample_positions(100_000, max_points=1_000)
+    assert len(positions) == 1_000 and (np.diff(positions) > 0).all()
+
+    df = pd.DataFrame({'x': np.arange(50_000.0), 'y': np.arange(50_000.0)})
+    fig = scatter_gl(df, 'x', 'y')
+    assert len(fig.data[0].x) == MAX_SCATTER_POINTS
+    assert fig.data[0].type == 'scattergl'
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data import clean_data, label_data
+from src.data.scoring import calculate_impact_score
+
+
+def baseline_clean_data(issues_df, gsc_df, issues_report):
+    """clean_data as first released: a plain merge on Address and a groupby"""
+    # The issue exports it read also had GSC columns, so the merge suffixed them '_gsc'
+    gsc_df = gsc_df.rename(columns=lambda column: column if column == 'Address' else f'{column}_gsc')
+    issues_df = issues_df.merge(gsc_df, how='left', on='Address')
+    issues_group = issues_df.groupby('issue').agg({
+        'Clicks_gsc': 'sum',
+        'Impressions_gsc': 'sum',
+        'CTR_gsc': 'mean',
+        'Position_gsc': 'mean',
+        'Address': 'count',
+    }).sort_values('Clicks_gsc', ascending=False)
+
+    issues_report['issue_normalized'] = (issues_report['Issue Name']
+                                         .str.lower()
+                                         .str.replace(r'[^\w\s]', '', regex=True)
+                                         .str.replace(r'\s+', '_', regex=True))
+    issues_group = issues_group.reset_index().merge(issues_report, how='left', left_on='issue',
+                                                    right_on='issue_normalized', suffixes=('_sum', '_overview'))
+    issues_group = issues_group[
+        ['Issue Name', 'Clicks_gsc', 'Impressions_gsc', 'CTR_gsc', 'Position_gsc', 'Issue Type', 'Issue Priority',
+         '% of Total', 'issue', 'Address']]
+    issues_group = issues_group.dropna(subset='Issue Name')
+    issues_group['pct_rank_clicks'] = issues_group['Clicks_gsc'].rank(pct=True)
+    issues_group['pct_rank_urls'] = issues_group['Address'].rank(pct=True)
+    return issues_group
+
+
+def baseline_label_data(issues_group):
+    """label_data as first released: one calculate_impact_score call per row"""
+    issues_group['Priority_Score'] = issues_group['Issue Priority'].map({'Low': 1, 'Medium': 3, 'High': 5})
+    issues_group['Type_Score'] = issues_group['Issue Type'].map({'Warning': 1, 'Opportunity': 3, 'Issue': 5})
+    issues_group['Impact_Score'] = issues_group.apply(lambda row: calculate_impact_score(row, issues_group), axis=1)
+    issues_group = issues_group.sort_values('Impact_Score', ascending=False)
+    issues_group['Impact_Score_Quadrant'] = (pd.qcut(issues_group['Impact_Score'], 4, labels=False).astype(int) + 1).map(
+        {1: 'Backlog', 2: 'Low', 3: 'Medium', 4: 'High'})
+    return issues_group
+
+
+def as_objects(df):
+    """Plain object and float64 columns, as the first release read them"""
+    return df.astype({column: object for column in df.select_dtypes('category').columns})
+
+
+def test_scores_match_baseline(crawl):
+    issues_group, _ = clean_data(crawl['issues_df'], crawl['gsc_df'], crawl['issues_report'].copy())
+    scored = label_data(issues_group.copy()).set_index('issue')
+
+    expected = baseline_label_data(baseline_clean_data(
+        as_objects(crawl['issues_df']), as_objects(crawl['gsc_df']), as_objects(crawl['issues_report']).copy()
+    )).set_index('issue')
+
+    scored.index = scored.index.astype(str)
+    assert set(scored.index) == set(expected.index)
+    scored = scored.loc[expected.index]
+    np.testing.assert_allclose(scored['Impact_Score'].to_numpy(), expected['Impact_Score'].to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(scored['Clicks_gsc'].to_numpy(), expected['Clicks_gsc'].to_numpy())
+    assert scored['Address'].tolist() == expected['Address'].tolist()
+    assert scored['Impact_Score_Quadrant'].tolist() == expected['Impact_Score_Quadrant'].tolist()
+
+
+def test_vectorized_scores_match_row_scores(crawl):
+    issues_group, _ = clean_data(crawl['issues_df'], crawl['gsc_df'], crawl['issues_report'])
+    scored = label_data(issues_group.copy())
+    row_scores = scored.apply(lambda row: calculate_impact_score(row, scored), axis=1)
+    assert scored['Impact_Score'].to_numpy() == pytest.approx(row_scores.to_numpy(), rel=1e-12)
@@ -0,0 +1,49 @@
+import pandas as pd
+from src.data import clean_data, incremental_audit, label_data, load_snapshot, save_snapshot
+
+
+def by_issue(issues_group):
+    issues_group = issues_group.astype({'issue': str})
+    return issues_group.sort_values('issue', ignore_index=True)
+
+
+def test_incremental_audit_matches_full_recompute(crawl, tmp_path):
+    issues_df, gsc_df, issues_report = crawl['issues_df'], crawl['gsc_df'], crawl['issues_report']
+    issues = issues_df['issue'].astype(str)
+    counts = issues.value_counts()
+    new_issue, resolved_issue, changed_issue = counts.index[:3]
+
+    # The baseline crawl lacks one issue; the new crawl resolves another and has new clicks on a third
+    baseline = incremental_audit(issues_df[issues != new_issue], gsc_df, issues_report.copy())
+    assert baseline['changes'] is None
+    save_snapshot(str(tmp_path), baseline)
+    snapshot = load_snapshot(str(tmp_path))
+
+    new_gsc_df = gsc_df.copy()
+    changed_rows = new_gsc_df['Address'].astype(str).isin(set(issues_df.loc[issues == changed_issue, 'Address']))
+    new_gsc_df.loc[changed_rows, 'Clicks'] += 7
+    changed_urls = set(new_gsc_df.loc[changed_rows, 'Address'].astype(str))
+    new_issues_df = issues_df[issues != resolved_issue]
+
+    incremental = incremental_audit(new_issues_df, new_gsc_df, issues_report.copy(), snapshot)
+    issues_group, _ = clean_data(new_issues_df, new_gsc_df, issues_report.copy())
+    pd.testing.assert_frame_equal(by_issue(incremental['issues_group']), by_issue(label_data(issues_group)))
+
+    status = incremental['changes'].set_index('issue')['Status']
+    assert status[new_issue] == 'new'
+    assert status[resolved_issue] == 'resolved'
+    # Exactly the baseline issues on the URLs with new clicks changed
+    touched = set(new_issues_df.loc[new_issues_df['Address'].astype(str).isin(changed_urls), 'issue'].astype(str))
+    touched.discard(new_issue)
+    assert changed_issue in touched
+    assert set(status[status == 'changed'].index) == touched
+    assert (status == 'unchanged').any()
+
+
+def test_unchanged_crawl_has_no_changes(crawl, tmp_path):
+    baseline = incremental_audit(crawl['issues_df'], crawl['gsc_df'], crawl['issues_report'].copy())
+    save_snapshot(str(tmp_path), baseline)
+    audit = incremental_audit(crawl['issues_df'], crawl['gsc_df'], crawl['issues_report'].copy(),
+                              load_snapshot(str(tmp_path)))
+    assert set(audit['changes']['Status']) == {'unchanged'}
+    assert (audit['changes']['Impact_Score_change'] == 0).all()
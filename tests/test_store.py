@@ -0,0 +1,46 @@
+import os
+import time
+from src.data.store import evict_crawl_stores, store_limits
+
+
+def make_store(root, name, size, age=0):
+    directory = os.path.join(root, name)
+    os.makedirs(directory)
+    with open(os.path.join(directory, 'issues_df.parquet'), 'wb') as f:
+        f.write(b'\0' * size)
+    last_used = time.time() - age
+    os.utime(directory, (last_used, last_used))
+    return directory
+
+
+def test_evict_least_recently_used_beyond_size(tmp_path):
+    root = str(tmp_path)
+    oldest = make_store(root, 'a', 100, age=30)
+    older = make_store(root, 'b', 100, age=20)
+    newest = make_store(root, 'c', 100, age=10)
+    removed = evict_crawl_stores(max_bytes=250, max_age=0, root=root)
+    assert removed == [oldest]
+    assert os.path.isdir(older) and os.path.isdir(newest)
+
+
+def test_evict_expired_stores(tmp_path):
+    root = str(tmp_path)
+    expired = make_store(root, 'a', 10, age=3600)
+    recent = make_store(root, 'b', 10, age=10)
+    assert evict_crawl_stores(max_bytes=0, max_age=60, root=root) == [expired]
+    assert os.path.isdir(recent)
+
+
+def test_evict_never_removes_kept_store(tmp_path):
+    root = str(tmp_path)
+    kept = make_store(root, 'a', 1000, age=3600)
+    other = make_store(root, 'b', 10)
+    removed = evict_crawl_stores(keep=kept, max_bytes=500, max_age=60, root=root)
+    assert removed == [other]
+    assert os.path.isdir(kept)
+
+
+def test_store_limits_from_environment(monkeypatch):
+    monkeypatch.setenv('SF_AUDIT_STORE_MB', '1')
+    monkeypatch.setenv('SF_AUDIT_STORE_DAYS', '0')
+    assert store_limits() == (1024 * 1024, None)
@@ -0,0 +1,67 @@
+import io
+import os
+import pandas as pd
+import pytest
+from src.data import BufferReader, load_gsc, open_upload
+from src.data.uploads import spill_threshold
+
+
+def gsc_upload(n_rows=2_000):
+    text = 'Address,Clicks,Impressions,CTR,Position\n' + ''.join(
+        f'https://example.com/{i},{i % 7},{i},{(i % 7) / max(i, 1):.4f},{1 + i % 50}.5\n' for i in range(n_rows))
+    upload = io.BytesIO(text.encode('utf-8'))
+    upload.name = 'search_console_all.csv'
+    return upload
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setenv('SF_AUDIT_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_small_upload_is_read_in_memory():
+    upload = gsc_upload()
+    with open_upload(upload, threshold=len(upload.getvalue())) as source:
+        assert not isinstance(source, str)
+        df = load_gsc(source)
+    assert len(df) == 2_000
+    # The upload itself is left untouched, so it can be parsed again
+    assert upload.tell() == 0 and len(upload.getvalue()) > 0
+
+
+def test_large_upload_is_spilled_and_removed(cache_root):
+    upload = gsc_upload()
+    with open_upload(upload, threshold=10 ** 9) as source:
+        expected = load_gsc(source)
+    with open_upload(upload, threshold=1024) as source:
+        assert isinstance(source, str) and os.path.isfile(source)
+        assert os.path.dirname(source) == os.path.join(str(cache_root), 'uploads')
+        assert source.endswith('-search_console_all.csv')
+        spilled = load_gsc(source)
+    assert not os.path.exists(source)
+    pd.testing.assert_frame_equal(spilled, expected)
+
+
+def test_spilled_file_is_removed_on_error():
+    with pytest.raises(RuntimeError):
+        with open_upload(gsc_upload(), threshold=0) as source:
+            raise RuntimeError('parse failed')
+    assert not os.path.exists(source)
+
+
+def test_buffer_reader_seeks_independently():
+    data = b'Address\nhttps://example.com/\n'
+    first, second = BufferReader(data), BufferReader(data)
+    assert first.read(7) == b'Address'
+    assert second.read() == data
+    first.seek(-5, io.SEEK_END)
+    assert first.read() == b'com/\n'
+    assert first.tell() == len(data)
+
+
+def test_spill_threshold_from_environment(monkeypatch):
+    monkeypatch.setenv('SF_AUDIT_SPILL_MB', '2')
+    assert spill_threshold() == 2 * 1024 * 1024
+    monkeypatch.setenv('SF_AUDIT_SPILL_MB', '0')
+    assert spill_threshold() is None
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.url_clustering import SimilarUrlIndex, build_url_features, cluster_urls, summarize_url_clusters
+
+SECTIONS = {
+    'blog': ['h1_missing', 'meta_description_missing'],
+    'products': ['images_missing_alt_text', 'page_titles_over_60_characters'],
+    'docs': ['canonicals_missing'],
+    'search': ['directives_noindex', 'url_parameters', 'h1_missing'],
+}
+
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(0)
+    rows = []
+    for section, issues in SECTIONS.items():
+        for i in range(25):
+            url = f'https://www.example.com/{section}/page-{i}/'
+            clicks = float(rng.integers(0, 500))
+            for issue in issues:
+                rows.append((url, issue, clicks, clicks * 20, 0.05, float(rng.uniform(1, 40))))
+    # A near-duplicate of a blog post: same issues, path pattern (digits are collapsed) and metrics
+    first = [row for row in rows if row[0] == 'https://www.example.com/blog/page-3/']
+    rows.extend(('https://www.example.com/blog/page-1003/',) + row[1:] for row in first)
+    issues_df = pd.DataFrame(rows, columns=['Address', 'issue', 'Clicks_gsc', 'Impressions_gsc', 'CTR_gsc',
+                                            'Position_gsc'])
+    return build_url_features(issues_df)
+
+
+def test_labels_cover_every_url(features):
+    model = cluster_urls(features, 4)
+    assert len(model.labels_) == len(features) == 101
+    assert set(model.labels_) <= set(range(4))
+    summary = summarize_url_clusters(features, model.labels_)
+    assert summary['URLs'].sum() == len(features)
+    # URLs of a section share their issue set and path, so they share a cluster
+    labels = pd.Series(model.labels_, index=features.urls)
+    sections = labels.groupby(features.urls.str.split('/').str[3]).nunique()
+    assert (sections == 1).all()
+
+
+def test_near_duplicate_is_nearest_neighbour(features):
+    index = SimilarUrlIndex(features, cluster_urls(features, 4))
+    similar = index.similar('https://www.example.com/blog/page-3/', n=5, n_probe=1)
+    assert similar['Address'].iloc[0] == 'https://www.example.com/blog/page-1003/'
+    assert similar['Similarity'].iloc[0] == pytest.approx(1.0, abs=1e-3)
+    assert similar['Similarity'].iloc[1] < similar['Similarity'].iloc[0]
+    assert 'https://www.example.com/blog/page-3/' not in set(similar['Address'])
+    assert similar['Similarity'].is_monotonic_decreasing
+
+
+def test_probing_every_cluster_is_exact(features):
+    index = SimilarUrlIndex(features, cluster_urls(features, 4))
+    url = 'https://www.example.com/docs/page-7/'
+    similar = index.similar(url, n=10, n_probe=4)
+
+    matrix = features.matrix
+    position = features.urls.get_loc(url)
+    scores = (matrix @ matrix[position].T).toarray().ravel()
+    scores[position] = -np.inf
+    np.testing.assert_allclose(similar['Similarity'], np.round(np.sort(scores)[::-1][:10], 4), atol=1e-4)
+    with pytest.raises(KeyError):
+        index.similar('https://www.example.com/unknown/')